@@ -0,0 +1,294 @@
+"""
+빗썸 API asyncio 클라이언트
+여러 마켓 시세 조회 / 주문을 동시에 실행 (service.py 와 같은 API)
+aiohttp 는 import 가 무거워서 (~170ms) 첫 세션을 만들 때 로드함
+"""
+import asyncio
+import json
+import time
+
+from client import API_URL, get_client
+from journal import get_journal
+from market_stream import get_price_cache, orderbook_from_stream
+from metrics import api_error_name, get_metrics
+from rate_limit import endpoint_group, get_limiter
+from service import (
+    API_KEY_MISSING,
+    CANDLE_INTERVALS,
+    MAX_CANDLES,
+    STREAM_MAX_AGE,
+    get_api_keys,
+    _market_order_body,
+    _limit_order_body,
+    _parse_markets,
+    _cached_tickers,
+    _chunk_markets,
+)
+from utils import get_signer
+
+
+class AsyncBithumbClient:
+    """
+    하나의 aiohttp 커넥션 풀을 공유하는 비동기 클라이언트
+
+    사용 예:
+        async with AsyncBithumbClient() as client:
+            prices = await asyncio.gather(*(client.get_current_price(m) for m in markets))
+    """
+
+    def __init__(self, base_url=API_URL, pool_size=16, concurrency=8, timeout=10, limiter=None):
+        """
+        Args:
+            base_url (str): API 서버 주소
+            pool_size (int): 커넥션 풀 최대 크기
+            concurrency (int): 동시에 전송할 최대 요청 수
+            timeout (float): 요청 타임아웃 (초)
+            limiter (RateLimiter): 속도 제한 / 재시도 (없으면 동기 클라이언트와 공유하는 기본값)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.pool_size = pool_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.limiter = limiter
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_session(self):
+        # 세션/세마포어는 실행 중인 이벤트 루프 안에서 생성해야 함
+        if self._session is None or self._session.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def close(self):
+        """커넥션 풀 종료"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(self, method, path, sign=None, **kwargs):
+        """
+        요청 전송 (속도 제한 + 429 / 5xx 재시도)
+
+        Args:
+            sign (tuple, optional): (access_key, secret_key, params) - 시도마다 새 JWT 로 서명
+        """
+        import aiohttp
+
+        session = self._get_session()
+        limiter = self.limiter or get_limiter()
+        retry = limiter.retry
+        group = endpoint_group(path)
+        url = self.base_url + path
+        attempt = 0
+
+        metrics = get_metrics()
+        while True:
+            await limiter.acquire_async(group)
+            if sign is not None:
+                access_key, secret_key, params = sign
+                signed = time.perf_counter() if metrics.enabled else 0.0
+                token = get_signer(access_key, secret_key).sign(params)
+                if metrics.enabled:
+                    metrics.record_sign(time.perf_counter() - signed)
+                kwargs['headers'] = {**kwargs.get('headers', {}), 'Authorization': token}
+
+            retry_after = None
+            started = 0.0
+            try:
+                async with self._semaphore:
+                    started = time.perf_counter() if metrics.enabled else 0.0
+                    async with session.request(method, url, **kwargs) as response:
+                        status = response.status
+                        if metrics.enabled:
+                            await self._record(metrics, path, response, kwargs, time.perf_counter() - started)
+                        if status not in retry.statuses or not retry.should_retry(method, attempt, status):
+                            return await response.json(content_type=None)
+                        retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if metrics.enabled:
+                    metrics.record_request(path, None, time.perf_counter() - started, error=type(e).__name__)
+                if not retry.should_retry(method, attempt):
+                    raise
+                status = None
+
+            limiter.record_retry(group, status)
+            await asyncio.sleep(retry.delay(attempt, retry_after))
+            attempt += 1
+
+    @staticmethod
+    async def _record(metrics, path, response, kwargs, seconds):
+        body = await response.read()
+        data = kwargs.get('data')
+        error = None
+        if response.status >= 400:
+            try:
+                error = api_error_name(json.loads(body), response.status)
+            except ValueError:
+                error = api_error_name(None, response.status)
+        metrics.record_request(path, response.status, seconds,
+                               bytes_out=len(data.encode() if isinstance(data, str) else data) if data else 0,
+                               bytes_in=len(body), error=error)
+
+    # ==================== 주문 API ====================
+
+    async def market_order(self, market, side, ord_type, price=None, volume=None):
+        """시장가 매수/매도 주문 (service.market_order 와 동일)"""
+        request_body = _market_order_body(market, side, ord_type, price, volume)
+        if request_body is None:
+            return {'error': f'잘못된 ord_type: {ord_type}'}
+        return await self._send_order(request_body)
+
+    async def limit_order(self, market, side, volume, price):
+        """지정가 주문 (service.limit_order 와 동일)"""
+        return await self._send_order(_limit_order_body(market, side, volume, price))
+
+    async def _send_order(self, request_body):
+        access_key, secret_key = get_api_keys()
+        if not access_key or not secret_key:
+            return {'error': API_KEY_MISSING}
+
+        headers = {'Content-Type': 'application/json'}
+
+        started = time.perf_counter()
+        try:
+            result = await self._request('POST', '/v1/orders', sign=(access_key, secret_key, request_body),
+                                         data=json.dumps(request_body), headers=headers)
+        except Exception as e:
+            result = {'error': str(e)}
+
+        journal = get_journal()
+        if journal.enabled:
+            journal.record_order('order', request_body, result, time.perf_counter() - started)
+        return result
+
+    async def cancel_order(self, uuid):
+        """주문 취소 (service.cancel_order 와 동일)"""
+        access_key, secret_key = get_api_keys()
+        if not access_key or not secret_key:
+            return {'error': API_KEY_MISSING}
+
+        params = {'uuid': uuid}
+
+        started = time.perf_counter()
+        try:
+            result = await self._request('DELETE', '/v1/order', sign=(access_key, secret_key, params),
+                                         params=params)
+        except Exception as e:
+            result = {'error': str(e)}
+
+        journal = get_journal()
+        if journal.enabled:
+            journal.record_order('cancel', params, result, time.perf_counter() - started)
+        return result
+
+    # ==================== 조회 API ====================
+
+    async def get_my_balance(self):
+        """내 계좌 잔고 조회 (service.get_my_balance 와 동일)"""
+        access_key, secret_key = get_api_keys()
+        if not access_key or not secret_key:
+            return [{'error': API_KEY_MISSING}]
+
+        headers = {'Content-Type': 'application/json'}
+
+        try:
+            return await self._request('GET', '/v1/accounts', sign=(access_key, secret_key, {}),
+                                       headers=headers)
+        except Exception as e:
+            return {'error': str(e)}
+
+    async def get_current_price(self, market):
+        """현재가 조회 (실패 시 None)"""
+        ticker = (await self.get_current_prices([market])).get(market)
+        return ticker['trade_price'] if ticker else None
+
+    async def get_current_prices(self, markets):
+        """
+        여러 마켓 현재가 일괄 조회 ({마켓코드: 티커 정보}, 분할 요청은 동시 전송)
+        service.get_current_prices 와 같이 WebSocket 시세 캐시에 최신 값이 있으면 그대로 사용
+        """
+        tickers, missing = _cached_tickers(markets)
+
+        async def fetch(chunk):
+            try:
+                items = await self._request('GET', '/v1/ticker',
+                                            headers={"accept": "application/json"},
+                                            params={'markets': ','.join(chunk)})
+                return items if isinstance(items, list) else []
+            except Exception as e:
+                return []
+
+        results = await asyncio.gather(*(fetch(chunk) for chunk in _chunk_markets(missing)))
+        for items in results:
+            for item in items:
+                tickers[item['market']] = item
+        return tickers
+
+    async def get_orderbook(self, market):
+        """호가 정보 조회 (service.get_orderbook 과 같이 WebSocket 호가 캐시가 최신이면 그대로 사용)"""
+        cached = get_price_cache().get('orderbook', market, max_age=STREAM_MAX_AGE)
+        if cached is not None:
+            return [orderbook_from_stream(cached)]
+        try:
+            return await self._request('GET', '/v1/orderbook',
+                                       headers={"accept": "application/json"},
+                                       params={'markets': market})
+        except Exception as e:
+            return {'error': str(e)}
+
+    async def get_candles(self, market, interval='1m', to=None, count=MAX_CANDLES):
+        """캔들 조회 (service.get_candles 와 동일)"""
+        if interval not in CANDLE_INTERVALS:
+            return {'error': f'잘못된 캔들 간격: {interval}'}
+
+        params = {'market': market, 'count': count}
+        if to:
+            params['to'] = to
+
+        try:
+            return await self._request('GET', CANDLE_INTERVALS[interval][0],
+                                       headers={"accept": "application/json"}, params=params)
+        except Exception as e:
+            return {'error': str(e)}
+
+    async def get_markets(self, quote=None):
+        """전체 마켓 코드 조회 ({한글명: 마켓코드}, quote 로 기준 통화 필터 - service.get_markets 와 동일)"""
+        try:
+            items = await self._request('GET', '/v1/market/all',
+                                        headers={"accept": "application/json"})
+            return _parse_markets(items, quote)
+        except Exception as e:
+            return {}
+
+
+def run_with_client(fn, base_url=None, **kwargs):
+    """
+    동기 코드(워커 스레드 / CLI)에서 새 AsyncBithumbClient 로 코루틴 실행
+
+    Args:
+        fn (callable): fn(client) → 코루틴
+        base_url (str, optional): API 서버 주소 (없으면 기본 동기 클라이언트와 같은 서버)
+        **kwargs: AsyncBithumbClient 인자 (pool_size, concurrency 등)
+
+    Returns:
+        코루틴 결과
+    """
+    base_url = base_url or get_client().base_url
+
+    async def run():
+        async with AsyncBithumbClient(base_url, **kwargs) as client:
+            return await fn(client)
+
+    return asyncio.run(run())
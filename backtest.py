@@ -0,0 +1,284 @@
+"""
+저장된 캔들 (candles.py) 로 왕복 거래 / 그리드 전략 비용 추정
+전략 하나는 캔들 배열 전체를 NumPy 벡터 연산으로 한 번에 계산하고,
+파라미터 조합 스윕은 마켓별로 프로세스 풀에 나눠서 실행함
+
+체결 모델:
+    - 매수 호가 = 종가를 호가 단위로 내림, 매도 호가 = 매수 호가 + spread_ticks 호가 단위
+    - 시장가 매수는 매도 호가에, 시장가 매도는 매수 호가에 체결
+    - 지정가는 캔들 종가가 주문 가격에 닿으면 주문 가격에 체결 (꼬리는 무시 - 체결을 적게 잡음)
+    - 수수료는 체결 금액 x fee_rate (매수 / 매도 각각)
+
+실행: python backtest.py round_trip KRW-BTC KRW-XRP -p amount=5000,10000,100000 -p spread_ticks=1,2
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from candles import CANDLE_DIR, CandleStore
+from ladder import VOLUME_DECIMALS, ladder_prices, size_volumes, snap_prices, tick_size
+
+# 기본 거래 수수료율 (빗썸 쿠폰 적용 기준)
+DEFAULT_FEE_RATE = 0.0004
+
+# 일별 손익 분포 백분위
+PNL_PERCENTILES = (5, 25, 50, 75, 95)
+
+# 일별 손익 집계 기준 (KST 자정)
+_DAY_OFFSET = 9 * 3600
+
+
+def _report(ts, volume, fees, pnl, unrealized=0.0):
+    """
+    체결 단위 배열 → 결과 요약
+
+    Args:
+        ts (np.ndarray): 체결 시각 (epoch 초)
+        volume / fees / pnl (np.ndarray): 체결별 거래대금 / 수수료 / 실현 손익 (수수료 포함)
+        unrealized (float): 기간 끝에 남은 보유분 평가 손익
+    """
+    total_volume = float(volume.sum())
+    total_pnl = float(pnl.sum()) + unrealized
+    if len(ts):
+        days = (ts + _DAY_OFFSET) // 86400
+        daily = np.bincount(days - days.min(), weights=pnl)
+        daily_pnl = dict(zip(PNL_PERCENTILES, np.percentile(daily, PNL_PERCENTILES).tolist()))
+        equity = np.concatenate([[0.0], np.cumsum(pnl)])
+        drawdown = float((np.maximum.accumulate(equity) - equity).max())
+    else:
+        daily_pnl = dict.fromkeys(PNL_PERCENTILES, 0.0)
+        drawdown = 0.0
+    return {
+        'trades': int(len(ts)),
+        'volume': total_volume,
+        'fees': float(fees.sum()),
+        'pnl': total_pnl,
+        'unrealized': float(unrealized),
+        'cost_rate': -total_pnl / total_volume if total_volume else 0.0,
+        'daily_pnl': daily_pnl,
+        'max_drawdown': drawdown,
+    }
+
+
+def prepare(candles):
+    """
+    캔들 → 전략 입력 (종가 기준 매수 호가 / 호가 단위를 미리 계산해서 조합마다 재사용)
+
+    Returns:
+        dict: {'ts', 'close', 'bid', 'tick'} (메모리 배열)
+    """
+    close = np.asarray(candles['close'], dtype=np.float64)
+    bid = snap_prices(close, 'bid')
+    return {'ts': np.asarray(candles['ts']), 'close': close, 'bid': bid, 'tick': tick_size(bid)}
+
+
+def round_trip(candles, amount, fee_rate=DEFAULT_FEE_RATE, spread_ticks=1, hold=0, every=1,
+               target_volume=None):
+    """
+    시장가 왕복 거래 (volume_engine.VolumeEngine 과 같은 사이클)
+
+    Args:
+        candles (dict): prepare 결과 (CandleStore.read 결과도 가능)
+        amount (float): 사이클당 매수 금액 (KRW)
+        fee_rate (float): 수수료율
+        spread_ticks (int): 매수 / 매도 호가 간격 (호가 단위 개수)
+        hold (int): 매수 후 매도까지 캔들 수 (0이면 같은 캔들에서 매도)
+        every (int): 사이클 간격 (캔들 수)
+        target_volume (float, optional): 이 거래대금에 도달하면 중지
+
+    Returns:
+        dict: 결과 요약 (_report) + 'cycles'
+    """
+    if 'bid' not in candles:
+        candles = prepare(candles)
+    ts = candles['ts']
+    index = np.arange(0, max(len(ts) - hold, 0), every)
+
+    ask = candles['bid'][index] + candles['tick'][index] * spread_ticks
+    bid = candles['bid'][index + hold]
+    scale = 10 ** VOLUME_DECIMALS
+    volume = np.floor(amount / ask * scale) / scale
+    bought = volume * ask
+    sold = volume * bid
+
+    traded = bought + sold
+    fees = traded * fee_rate
+    pnl = sold - bought - fees
+    if target_volume is not None:
+        n = int(np.searchsorted(np.cumsum(traded), target_volume, side='left')) + 1
+        index, traded, fees, pnl = index[:n], traded[:n], fees[:n], pnl[:n]
+
+    report = _report(ts[index + hold], traded, fees, pnl)
+    report['cycles'] = int(len(index))
+    return report
+
+
+def grid(candles, width, levels, amount, center=None, fee_rate=DEFAULT_FEE_RATE, spacing='linear'):
+    """
+    지정가 그리드 - 구간을 levels 쌍으로 나눠 인접한 두 가격 (매수 p[k], 매도 p[k+1]) 마다
+    매수 체결 → 매도 주문 → 매도 체결 → 매수 주문 을 반복 (쌍마다 독립, 모든 쌍이 매수 대기로 시작)
+
+    Args:
+        candles (dict): prepare 결과 (CandleStore.read 결과도 가능)
+        width (float): 기준 가격 대비 위아래 폭 (비율, 예: 0.05 = ±5%)
+        levels (int): 쌍 개수
+        amount (float): 쌍별 주문 금액 (KRW)
+        center (float, optional): 기준 가격 (없으면 첫 캔들 종가)
+        fee_rate (float): 수수료율
+        spacing (str): 'linear' / 'geometric'
+
+    Returns:
+        dict: 결과 요약 (_report) + 'round_trips', 'holding' (기간 끝에 매도 대기 중인 쌍 수)
+    """
+    ts = np.asarray(candles['ts'])
+    close = np.asarray(candles['close'], dtype=np.float64)
+    center = close[0] if center is None else center
+    prices = ladder_prices(center * (1 - width), center * (1 + width), levels + 1, spacing)
+    buys = snap_prices(prices[:-1], 'bid')
+    sells = np.maximum(snap_prices(prices[1:], 'ask'), buys + tick_size(buys))
+    volumes = size_volumes(buys, amount)
+
+    # 쌍 x 캔들: +1 매수 가격 도달, -1 매도 가격 도달 (buys < sells 이므로 동시에는 불가)
+    events = ((close <= buys[:, None]).astype(np.int8)
+              - (close >= sells[:, None]).astype(np.int8))
+    # 직전 이벤트 (앞으로 채우기) - 매수 다음 매도, 매도 다음 매수만 체결
+    position = np.where(events != 0, np.arange(close.size, dtype=np.int32), 0)
+    np.maximum.accumulate(position, axis=1, out=position)
+    previous = np.take_along_axis(events, position, axis=1)
+    previous = np.concatenate([np.zeros((levels, 1), np.int8), previous[:, :-1]], axis=1)
+    buy_level, buy_at = np.nonzero((events == 1) & (previous != 1))
+    sell_level, sell_at = np.nonzero((events == -1) & (previous == 1))
+
+    funds = np.concatenate([volumes[buy_level] * buys[buy_level], volumes[sell_level] * sells[sell_level]])
+    fees = funds * fee_rate
+    # 매수 원금은 매도 때 돌려받으므로 실현 손익은 매도 시점의 (매도가 - 매수가) 차익
+    gains = np.concatenate([np.zeros(len(buy_at)), volumes[sell_level] * (sells - buys)[sell_level]])
+    at = np.concatenate([buy_at, sell_at])
+    order = np.argsort(at, kind='stable')
+
+    holding = np.bincount(buy_level, minlength=levels) > np.bincount(sell_level, minlength=levels)
+    unrealized = float((volumes * (close[-1] - buys))[holding].sum())
+
+    report = _report(ts[at[order]], funds[order], fees[order], (gains - fees)[order], unrealized)
+    report['round_trips'] = int(len(sell_at))
+    report['holding'] = int(holding.sum())
+    return report
+
+
+STRATEGIES = {
+    'round_trip': round_trip,
+    'grid': grid,
+}
+
+
+def parameter_grid(params):
+    """{이름: [값, ...]} → 모든 조합 리스트 [{이름: 값}, ...]"""
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*(params[n] for n in names))]
+
+
+def run_market(root, market, interval, strategy, combos, start=None, end=None):
+    """
+    한 마켓에서 파라미터 조합 전체 실행 (프로세스 풀 작업 단위)
+
+    Returns:
+        list: [{'market', 'params', **결과 요약}, ...]
+    """
+    candles = CandleStore(root).read(market, interval, start, end, columns=['ts', 'close'])
+    if not len(candles['ts']):
+        return []
+    # memmap 을 한 번만 읽어서 조합마다 재사용
+    candles = prepare(candles)
+    run = STRATEGIES[strategy]
+    return [{'market': market, 'params': params, **run(candles, **params)} for params in combos]
+
+
+def sweep(markets, strategy, params, interval='1m', start=None, end=None, store=None, processes=None,
+          key='cost_rate'):
+    """
+    마켓 x 파라미터 조합 스윕 (마켓별로 프로세스 풀에 나눠 실행)
+
+    Windows 에서는 프로세스 풀이 모듈을 다시 import 하므로 `if __name__ == "__main__":` 안에서 호출해야 함
+
+    Args:
+        markets (list): 마켓 ID 리스트
+        strategy (str): 'round_trip' / 'grid'
+        params (dict): {파라미터 이름: [값, ...]} (전략 함수 인자)
+        interval (str): 캔들 간격
+        start / end: 기간 (CandleStore.read 와 동일)
+        store (CandleStore, optional): 저장소 (없으면 CANDLE_DIR)
+        processes (int, optional): 프로세스 수 (없으면 CPU 수, 1이면 현재 프로세스에서 실행)
+        key (str): 정렬 기준 (오름차순 - 기본값은 거래대금 대비 비용)
+
+    Returns:
+        list: 결과 요약 리스트 (key 오름차순)
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"알 수 없는 전략: {strategy}")
+    root = store.root if store else CANDLE_DIR
+    combos = parameter_grid(params)
+    processes = min(processes or os.cpu_count() or 1, len(markets))
+
+    if processes <= 1:
+        chunks = [run_market(root, m, interval, strategy, combos, start, end) for m in markets]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            chunks = list(pool.map(run_market, *zip(*(
+                (root, m, interval, strategy, combos, start, end) for m in markets
+            ))))
+    return sorted((r for chunk in chunks for r in chunk), key=lambda r: r[key])
+
+
+def format_results(results, top=10):
+    """스윕 결과 상위 top 개 요약 문자열"""
+    lines = [f"{'마켓':10}{'파라미터':36}{'거래대금':>16}{'수수료':>12}{'손익':>12}{'비용률':>9}{'일 손익 p5':>12}"]
+    for r in results[:top]:
+        params = ', '.join(f'{k}={v}' for k, v in r['params'].items())
+        lines.append(f"{r['market']:10}{params:36}{r['volume']:16,.0f}{r['fees']:12,.0f}"
+                     f"{r['pnl']:+12,.0f}{r['cost_rate'] * 100:8.3f}%{r['daily_pnl'][5]:+12,.0f}")
+    return '\n'.join(lines)
+
+
+def _parse_value(text):
+    """'5000' → int, '0.05' / '1e-3' → float, 그 외 (spacing=geometric 등) 는 문자열 그대로"""
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _parse_param(text):
+    name, _, values = text.partition('=')
+    return name, [_parse_value(v) for v in values.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 캔들로 전략 비용 추정 (파라미터 스윕)")
+    parser.add_argument('strategy', choices=list(STRATEGIES))
+    parser.add_argument('markets', nargs='+', help="마켓 ID (예: KRW-BTC)")
+    parser.add_argument('-p', '--param', action='append', default=[], type=_parse_param,
+                        help="파라미터 값 목록 (예: amount=5000,10000)")
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--start', help="시작 날짜 (UTC)")
+    parser.add_argument('--end', help="끝 날짜 (UTC)")
+    parser.add_argument('--dir', default=CANDLE_DIR, help="캔들 저장 디렉터리")
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    params = dict(args.param)
+    started = time.perf_counter()
+    results = sweep(args.markets, args.strategy, params, args.interval, args.start, args.end,
+                    CandleStore(args.dir), args.processes)
+    print(format_results(results, args.top))
+    print(f"⏱️ {len(results):,}개 조합, {time.perf_counter() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
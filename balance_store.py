@@ -0,0 +1,191 @@
+"""
+잔고 캐시
+/v1/accounts 결과를 통화별로 보관 (수량은 Decimal 로 정확하게 유지)
+신선한 동안은 네트워크 요청 없이 바로 읽고, 주문이 체결되면 로컬에서 갱신하거나 무효화함
+"""
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+
+from service import get_my_balance
+
+# 이 시간(초)이 지나면 다음 조회 때 /v1/accounts 를 다시 호출
+BALANCE_MAX_AGE = 5.0
+
+ZERO = Decimal('0')
+
+
+def _decimal(value):
+    try:
+        return Decimal(str(value)) if value not in (None, '') else ZERO
+    except InvalidOperation:
+        return ZERO
+
+
+def parse_balances(items):
+    """
+    /v1/accounts 응답 → {통화: 잔고 정보}
+
+    Returns:
+        dict: {'KRW': {'currency': 'KRW', 'balance': Decimal, 'locked': Decimal,
+                       'avg_buy_price': Decimal, 'unit_currency': 'KRW'}, ...}
+              오류 응답이면 None
+    """
+    if not isinstance(items, list) or any('error' in item for item in items):
+        return None
+    return {
+        item['currency']: {
+            'currency': item['currency'],
+            'balance': _decimal(item.get('balance')),
+            'locked': _decimal(item.get('locked')),
+            'avg_buy_price': _decimal(item.get('avg_buy_price')),
+            'unit_currency': item.get('unit_currency', 'KRW'),
+        }
+        for item in items
+    }
+
+
+class BalanceStore:
+    """
+    통화별 잔고 저장소 (스레드 안전)
+
+    사용 예:
+        store = get_balance_store()
+        volume = store.available('BTC')        # 신선하면 네트워크 요청 없음
+        store.apply_fill('KRW-BTC', 'ask', volume, funds, fee)
+    """
+
+    def __init__(self, fetch=get_my_balance, max_age=BALANCE_MAX_AGE):
+        """
+        Args:
+            fetch (callable): /v1/accounts 조회 함수 (기본값 service.get_my_balance)
+            max_age (float): 캐시 유효 시간 (초)
+        """
+        self.fetch = fetch
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._balances = {}
+        self._updated = None
+        self._stale = set()
+
+    def is_fresh(self, currency=None, max_age=None):
+        """캐시를 네트워크 요청 없이 믿을 수 있는지 (currency 를 주면 그 통화만 확인)"""
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            if self._updated is None or time.monotonic() - self._updated > max_age:
+                return False
+            if currency is None:
+                return not self._stale
+            return currency not in self._stale
+
+    def refresh(self):
+        """
+        /v1/accounts 를 조회해서 캐시 교체
+
+        Returns:
+            bool: 성공 여부 (실패하면 기존 캐시 유지)
+        """
+        balances = parse_balances(self.fetch())
+        if balances is None:
+            return False
+        with self._lock:
+            self._balances = balances
+            self._updated = time.monotonic()
+            self._stale.clear()
+        return True
+
+    def invalidate(self, *currencies):
+        """다음 조회 때 다시 불러오도록 표시 (통화를 주지 않으면 전체)"""
+        with self._lock:
+            if currencies:
+                self._stale.update(currencies)
+            else:
+                self._updated = None
+
+    def _ensure(self, currency=None, max_age=None):
+        if not self.is_fresh(currency, max_age):
+            self.refresh()
+
+    def get(self, currency, max_age=None):
+        """
+        통화 잔고 정보 (오래되었으면 먼저 갱신)
+
+        Returns:
+            dict: 잔고 정보 복사본 (보유하지 않은 통화면 None)
+        """
+        self._ensure(currency, max_age)
+        with self._lock:
+            balance = self._balances.get(currency)
+            return dict(balance) if balance else None
+
+    def available(self, currency, max_age=None):
+        """주문 가능 수량 (Decimal, 없으면 0)"""
+        balance = self.get(currency, max_age)
+        return balance['balance'] if balance else ZERO
+
+    def locked(self, currency, max_age=None):
+        """주문 중 묶인 수량 (Decimal, 없으면 0)"""
+        balance = self.get(currency, max_age)
+        return balance['locked'] if balance else ZERO
+
+    def all(self, max_age=None):
+        """
+        전체 잔고 (오래되었으면 먼저 갱신)
+
+        Returns:
+            dict: {통화: 잔고 정보}
+        """
+        self._ensure(None, max_age)
+        with self._lock:
+            return {currency: dict(balance) for currency, balance in self._balances.items()}
+
+    def apply_fill(self, market, side, volume, funds, fee=0):
+        """
+        체결 결과를 로컬 잔고에 반영 (/v1/accounts 재조회 없이 신선한 상태 유지)
+
+        Args:
+            market (str): 마켓 ID (예: 'KRW-BTC')
+            side (str): 'bid' / 'ask'
+            volume: 체결 수량
+            funds: 체결 금액 (기준 통화)
+            fee: 수수료 (기준 통화)
+        """
+        quote, base = market.split('-')
+        volume, funds, fee = _decimal(volume), _decimal(funds), _decimal(fee)
+        if side == 'bid':
+            deltas = ((quote, -(funds + fee)), (base, volume))
+        else:
+            deltas = ((base, -volume), (quote, funds - fee))
+
+        with self._lock:
+            if self._updated is None:
+                return
+            for currency, delta in deltas:
+                balance = self._balances.setdefault(currency, {
+                    'currency': currency, 'balance': ZERO, 'locked': ZERO,
+                    'avg_buy_price': ZERO, 'unit_currency': quote,
+                })
+                balance['balance'] = max(balance['balance'] + delta, ZERO)
+
+    def on_order_event(self, event):
+        """
+        OrderTracker 이벤트 수신용 - 체결된 마켓의 두 통화를 무효화함
+        (일괄 조회 결과에는 체결 금액이 없으므로 로컬 계산 대신 다음 조회 때 다시 불러옴)
+        """
+        if event['type'] in ('fill', 'done', 'cancel') and event.get('market'):
+            quote, base = event['market'].split('-')
+            self.invalidate(quote, base)
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_balance_store():
+    """기본 BalanceStore (지연 생성)"""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = BalanceStore()
+    return _default_store
@@ -0,0 +1,68 @@
+"""
+동기(service.py) vs 비동기(AsyncBithumbClient) 처리량 비교
+로컬 대역 서버에 요청마다 지연을 넣어 실제 네트워크 왕복을 흉내냄
+
+실행: python benchmarks/bench_async.py [요청수] [지연(ms)]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_server import MockBithumbServer, MockExchange
+from client import BithumbClient, set_client
+from async_client import AsyncBithumbClient
+import service
+
+os.environ.setdefault('ACCESS_KEY', 'bench-access-key')
+os.environ.setdefault('SECRET_KEY', 'bench-secret-key-0123456789abcdef')
+
+
+def run_sync(markets):
+    start = time.perf_counter()
+    for market in markets:
+        service.get_current_price(market)
+    quotes = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for market in markets:
+        service.market_order(market, 'bid', 'price', price=5000)
+    orders = time.perf_counter() - start
+    return quotes, orders
+
+
+async def run_async(url, markets, concurrency):
+    async with AsyncBithumbClient(url, pool_size=concurrency, concurrency=concurrency) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client.get_current_price(m) for m in markets))
+        quotes = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client.market_order(m, 'bid', 'price', price=5000) for m in markets))
+        orders = time.perf_counter() - start
+    return quotes, orders
+
+
+def main(count=100, latency_ms=20, concurrency=16):
+    exchange = MockExchange(krw_balance=10 ** 12)
+    codes = [code for code in exchange.prices if code.startswith('KRW-')]
+    markets = [codes[i % len(codes)] for i in range(count)]
+
+    with MockBithumbServer(exchange=exchange, latency=latency_ms / 1000) as server:
+        set_client(BithumbClient(server.url))
+        sync_quotes, sync_orders = run_sync(markets)
+        async_quotes, async_orders = asyncio.run(run_async(server.url, markets, concurrency))
+
+    print("=" * 60)
+    print(f"처리량 비교: 요청 {count}건, 왕복 지연 {latency_ms}ms, 동시성 {concurrency}")
+    print("=" * 60)
+    print(f"{'':12}{'sync (req/s)':>16}{'async (req/s)':>16}{'배율':>8}")
+    for name, s, a in (('시세 조회', sync_quotes, async_quotes), ('시장가 주문', sync_orders, async_orders)):
+        print(f"{name:12}{count / s:16.1f}{count / a:16.1f}{s / a:7.1f}x")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
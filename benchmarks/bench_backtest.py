@@ -0,0 +1,60 @@
+"""
+backtest.py 파라미터 스윕 처리량 측정
+임시 디렉터리에 무작위 1분봉을 만들어 저장한 뒤 왕복 거래 / 그리드 스윕 시간을 출력함
+
+실행: python benchmarks/bench_backtest.py [마켓 수] [일수] [프로세스 수]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import format_results, parameter_grid, sweep
+from candles import CandleStore
+
+PRICES = (100000000, 5000000, 250000, 3000, 300, 45, 1.2, 0.05)
+
+
+def make_candles(price, days, seed):
+    """무작위 보행 1분봉 (종가만 의미 있음)"""
+    n = days * 1440
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.0008, n)))
+    return {
+        'ts': 1_700_000_000 // 60 * 60 + np.arange(n, dtype=np.int64) * 60,
+        'open': close, 'high': close, 'low': close, 'close': close,
+        'volume': np.ones(n), 'value': close,
+    }
+
+
+def main(markets=8, days=30, processes=None):
+    with tempfile.TemporaryDirectory() as root:
+        store = CandleStore(root)
+        names = [f'KRW-C{i}' for i in range(markets)]
+        for i, market in enumerate(names):
+            store.append(market, '1m', make_candles(PRICES[i % len(PRICES)], days, i))
+
+        cases = (
+            ('round_trip', {'amount': [5000, 10000, 20000, 50000, 100000, 200000, 500000, 1000000],
+                            'spread_ticks': [1, 2, 3], 'hold': [0, 1, 5], 'every': [1, 2, 5, 10, 30]}),
+            ('grid', {'width': [0.02, 0.05, 0.1], 'levels': [5, 10, 20], 'amount': [10000, 50000]}),
+        )
+        print("=" * 60)
+        print(f"스윕: {markets}개 마켓 x {days}일 1분봉 ({days * 1440:,}개)")
+        print("=" * 60)
+        for strategy, params in cases:
+            combos = len(parameter_grid(params)) * markets
+            started = time.perf_counter()
+            results = sweep(names, strategy, params, store=store, processes=processes)
+            elapsed = time.perf_counter() - started
+            print(f"\n{strategy}: {combos:,}개 조합 {elapsed:.2f}초 ({combos / elapsed:,.0f}개/초)")
+            print(format_results(results, 3))
+
+
+if __name__ == "__main__":
+    casts = (int, int, int)
+    main(*(cast(a) for cast, a in zip(casts, sys.argv[1:4])))
@@ -0,0 +1,45 @@
+"""
+API 키 로딩 마이크로벤치마크
+매 호출 load_dotenv(override=True) vs CredentialProvider 캐시
+
+실행: python benchmarks/bench_credentials.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from credentials import CredentialProvider
+
+
+def legacy_get_api_keys(path):
+    """기존 service.get_api_keys 동작 (매번 .env 파싱)"""
+    load_dotenv(path, override=True)
+    return os.getenv("ACCESS_KEY"), os.getenv("SECRET_KEY")
+
+
+def main(number=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, '.env')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("# 빗썸 API 설정\nACCESS_KEY=bench-access-key\nSECRET_KEY=bench-secret-key\n")
+
+        provider = CredentialProvider(path)
+        assert provider.get() == legacy_get_api_keys(path)
+
+        legacy = timeit.timeit(lambda: legacy_get_api_keys(path), number=number)
+        cached = timeit.timeit(provider.get, number=number)
+
+    print("=" * 60)
+    print(f"API 키 로딩 벤치마크 ({number:,}회)")
+    print("=" * 60)
+    print(f"load_dotenv (기존)      : {legacy / number * 1e6:8.2f} us/call")
+    print(f"CredentialProvider (캐시): {cached / number * 1e6:8.2f} us/call")
+    print(f"속도 향상: {legacy / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+JWT 서명 벤치마크
+utils.get_param_jwt vs utils.JWTSigner (초당 토큰 생성 수)
+
+실행: python benchmarks/bench_jwt.py
+"""
+import hashlib
+import os
+import sys
+import timeit
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+from utils import JWTSigner, get_param_jwt
+
+ACCESS_KEY = 'bench-access-key-0123456789'
+SECRET_KEY = 'bench-secret-key-0123456789abcdef0123456789abcdef'
+ORDER_PARAMS = {'market': 'KRW-BTC', 'side': 'bid', 'price': '10000', 'ord_type': 'price'}
+
+
+def reference_token(params, nonce, timestamp):
+    """get_param_jwt 와 같은 방식으로 nonce / timestamp 를 고정해 생성"""
+    payload = {
+        'access_key': ACCESS_KEY,
+        'nonce': nonce,
+        'timestamp': timestamp,
+        'query_hash': hashlib.sha512(urlencode(params).encode()).hexdigest(),
+        'query_hash_alg': 'SHA512',
+    }
+    return f"Bearer {jwt.encode(payload, SECRET_KEY, algorithm='HS256')}"
+
+
+def main(number=20000):
+    signer = JWTSigner(ACCESS_KEY, SECRET_KEY)
+
+    # 같은 nonce / timestamp 면 바이트 단위로 같은 토큰
+    for params in ({}, ORDER_PARAMS):
+        nonce, timestamp = 'f3b1c2d4-0000-4000-8000-000000000000', 1760745600000
+        assert signer.sign(params, nonce, timestamp) == reference_token(params, nonce, timestamp)
+
+    print("=" * 60)
+    print(f"JWT 서명 벤치마크 ({number:,}회)")
+    print("=" * 60)
+    print(f"{'':16}{'get_param_jwt':>16}{'JWTSigner':>14}{'배율':>8}")
+    for name, params in (('잔고 (빈 파라미터)', {}), ('주문 파라미터', ORDER_PARAMS)):
+        legacy = timeit.timeit(lambda: get_param_jwt(ACCESS_KEY, SECRET_KEY, params), number=number)
+        fast = timeit.timeit(lambda: signer.sign(params), number=number)
+        print(f"{name:16}{number / legacy:13,.0f}/s{number / fast:11,.0f}/s{legacy / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
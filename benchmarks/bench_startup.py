@@ -0,0 +1,84 @@
+"""
+CLI / GUI 콜드 스타트 측정
+로컬 대역 서버를 띄우고 `main.py --profile-startup` / `main_gui.py --profile-startup` 을 새 프로세스로 여러 번 실행해서
+프로세스 시작부터 종료까지의 시간과 첫 화면 / 첫 시세 시점을 출력함 (GUI 는 디스플레이가 있을 때만)
+
+실행: python benchmarks/bench_startup.py [실행 횟수] [지연(ms)]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_server import MockBithumbServer
+
+# 시작할 때 한꺼번에 import 하던 무거운 패키지 (지연 import 전과 비교용)
+EAGER_IMPORTS = 'import requests, jwt, aiohttp, numpy'
+
+MARK = re.compile(r'^(first paint|api keys|markets|first quote)\s+([\d.]+)$', re.M)
+
+
+def run(command, env):
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, encoding='utf-8',
+                            stdin=subprocess.DEVNULL, timeout=60)
+    wall = (time.perf_counter() - started) * 1000
+    marks = {name: float(ms) for name, ms in MARK.findall(result.stdout)}
+    return wall, marks, result
+
+
+def measure(name, command, env, runs):
+    walls, quotes, paints = [], [], []
+    for _ in range(runs):
+        wall, marks, result = run(command, env)
+        if 'first quote' not in marks:
+            print(f"{name}: 실행 실패\n{result.stdout[-500:]}{result.stderr[-500:]}")
+            return
+        walls.append(wall)
+        quotes.append(marks['first quote'])
+        paints.append(marks['first paint'])
+    print(f"{name:6}{statistics.median(walls):12.0f}{statistics.median(paints):14.0f}"
+          f"{statistics.median(quotes):14.0f}")
+
+
+def has_display():
+    if sys.platform == 'win32' or os.environ.get('DISPLAY'):
+        try:
+            import tkinter
+            tkinter.Tk().destroy()
+            return True
+        except Exception:
+            return False
+    return False
+
+
+def main(runs=5, latency_ms=20):
+    with MockBithumbServer(latency=latency_ms / 1000) as server:
+        env = dict(os.environ, BITHUMB_API_URL=server.url, PYTHONIOENCODING='utf-8')
+        env.setdefault('ACCESS_KEY', 'bench-access-key')
+        env.setdefault('SECRET_KEY', 'bench-secret-key-0123456789abcdef')
+
+        print("=" * 60)
+        print(f"콜드 스타트: {runs}회 중앙값, 왕복 지연 {latency_ms}ms (단위 ms, 첫 화면 / 첫 시세는 main 시작 기준)")
+        print("=" * 60)
+        print(f"{'':6}{'프로세스 전체':>12}{'첫 화면':>14}{'첫 시세':>14}")
+        measure('CLI', [sys.executable, 'main.py', '--profile-startup'], env, runs)
+        if has_display():
+            measure('GUI', [sys.executable, 'main_gui.py', '--profile-startup'], env, runs)
+        else:
+            print("GUI   디스플레이 없음 - 건너뜀")
+
+        eager = [run([sys.executable, '-c', EAGER_IMPORTS], env)[0] for _ in range(runs)]
+        bare = [run([sys.executable, '-c', 'pass'], env)[0] for _ in range(runs)]
+        print(f"\n참고: 지연 import 한 패키지를 시작할 때 모두 import 하면 +{statistics.median(eager) - statistics.median(bare):.0f}ms"
+              f" ({EAGER_IMPORTS[7:]})")
+
+
+if __name__ == "__main__":
+    casts = (int, int)
+    main(*(cast(a) for cast, a in zip(casts, sys.argv[1:3])))
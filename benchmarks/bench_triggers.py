@@ -0,0 +1,90 @@
+"""
+triggers.py 시세 처리량 측정
+무작위 보행 시세를 재생하면서 조건 수에 따른 시세 1건 처리 시간을 출력함 (주문은 보내지 않음)
+비교용으로 모든 조건을 매번 훑는 방식도 같은 시세로 측정함
+
+실행: python benchmarks/bench_triggers.py [조건 수] [마켓 수] [시세 수]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from triggers import ABOVE, TriggerEngine, dry_run_order, replay, sell_order
+
+
+def make_ticks(markets, count, seed=0):
+    """마켓별 무작위 보행 시세 (시작가 1000)"""
+    rng = random.Random(seed)
+    prices = dict.fromkeys(markets, 1000.0)
+    ticks = []
+    for _ in range(count):
+        market = rng.choice(markets)
+        prices[market] *= 1 + rng.gauss(0, 0.001)
+        ticks.append((market, prices[market]))
+    return ticks
+
+
+def add_triggers(engine, markets, count, seed=1):
+    """현재가 ±5~30% 에 OCO 쌍 (조건 2개씩)"""
+    rng = random.Random(seed)
+    for _ in range(count // 2):
+        market = rng.choice(markets)
+        engine.oco(market, 1000 * (1 - rng.uniform(0.05, 0.3)), 1000 * (1 + rng.uniform(0.05, 0.3)), 1)
+
+
+def linear_scan(triggers, ticks):
+    """비교용: 시세마다 그 마켓의 모든 조건을 확인"""
+    by_market = {}
+    for t in triggers:
+        by_market.setdefault(t['market'], []).append(t)
+    fired = 0
+    for market, price in ticks:
+        active = by_market.get(market, [])
+        hit = {t['group'] for t in active
+               if (price >= t['price'] if t['condition'] == ABOVE else price <= t['price'])}
+        if hit:
+            fired += len(hit)
+            by_market[market] = [t for t in active if t['group'] not in hit]
+    return fired
+
+
+def main(triggers=10000, markets=50, ticks=200000):
+    names = [f'KRW-C{i}' for i in range(markets)]
+    stream = make_ticks(names, ticks)
+
+    engine = TriggerEngine(send=dry_run_order, background=False, max_finished=triggers)
+    orders = []
+    engine.add_listener(lambda event: event['type'] == 'order' and orders.append(event))
+
+    started = time.perf_counter()
+    add_triggers(engine, names, triggers)
+    added = time.perf_counter() - started
+    snapshot = engine.triggers()
+
+    print("=" * 60)
+    print(f"조건 {len(engine):,}개 / {markets}개 마켓 / 시세 {ticks:,}건")
+    print("=" * 60)
+    print(f"등록: {added * 1000:.1f}ms ({added / len(snapshot) * 1e6:.2f}µs/개)")
+
+    started = time.perf_counter()
+    fired = replay(engine, stream)
+    elapsed = time.perf_counter() - started
+    print(f"힙:       {elapsed:.2f}초 ({ticks / elapsed:,.0f}건/초, {elapsed / ticks * 1e6:.2f}µs/건) "
+          f"- 발동 {len(fired):,}개, 남은 조건 {len(engine):,}개")
+
+    started = time.perf_counter()
+    scanned = linear_scan(snapshot, stream)
+    elapsed = time.perf_counter() - started
+    print(f"전체 확인: {elapsed:.2f}초 ({ticks / elapsed:,.0f}건/초, {elapsed / ticks * 1e6:.2f}µs/건) "
+          f"- 발동 {scanned:,}개")
+
+    if scanned != len(fired) or len(orders) != len(fired):
+        print(f"❌ 결과 불일치: 힙 {len(fired):,} / 전체 확인 {scanned:,} / 주문 {len(orders):,}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:4]))
@@ -0,0 +1,38 @@
+"""
+자동 왕복 거래 (volume_engine.py) 를 로컬 대역 서버에서 끝까지 실행
+사이클 속도 / 거래대금 / 수수료 / 손익과 경로별 요청 수를 출력함
+
+실행: python benchmarks/bench_volume.py [목표 거래대금] [사이클 금액] [지연(ms)] [변동성]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_server import MockBithumbServer, MockExchange
+from client import BithumbClient, set_client
+from volume_engine import VolumeEngine, format_report
+
+os.environ.setdefault('ACCESS_KEY', 'bench-access-key')
+os.environ.setdefault('SECRET_KEY', 'bench-secret-key-0123456789abcdef')
+
+
+def main(target=10_000_000, cycle_amount=100_000, latency_ms=20, volatility=0.0, market='KRW-XRP'):
+    exchange = MockExchange(krw_balance=cycle_amount * 2, volatility=volatility)
+
+    with MockBithumbServer(exchange=exchange, latency=latency_ms / 1000) as server:
+        set_client(BithumbClient(server.url))
+        engine = VolumeEngine(market, target, cycle_amount, max_loss=cycle_amount * 0.5)
+        report = engine.run()
+
+    print("=" * 60)
+    print(f"왕복 거래: {market}, 목표 {target:,.0f}원, 사이클 {cycle_amount:,.0f}원, 왕복 지연 {latency_ms}ms")
+    print("=" * 60)
+    print(format_report(report))
+    print(f"남은 KRW: {exchange.balances['KRW']:,.0f}원")
+    print("요청 수: " + ', '.join(f"{path} {n}" for path, n in sorted(server.requests.items())))
+
+
+if __name__ == "__main__":
+    casts = (int, int, int, float)
+    main(*(cast(a) for cast, a in zip(casts, sys.argv[1:5])))
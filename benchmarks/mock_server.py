@@ -0,0 +1,530 @@
+"""
+로컬 빗썸 API 대역 서버 (벤치마크 / 오프라인 테스트용)
+
+실제 거래소에 접속하지 않고 service.py / async_client.py 를 실행할 수 있도록
+/v1/orders, /v1/order (조회 / 취소), /v1/accounts, /v1/ticker, /v1/orderbook, /v1/market/all,
+/v1/candles/minutes/{unit}, /v1/candles/days 를 흉내냄
+지연 / 5xx 오류 / 429 응답을 설정한 비율로 주입할 수 있음
+
+실행: python benchmarks/mock_server.py [port] [--latency ms] [--error-rate 0.05] [--throttle-rate 0.05]
+"""
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_MARKETS = [
+    ('KRW-BTC', '비트코인', 'Bitcoin', 100000000),
+    ('KRW-ETH', '이더리움', 'Ethereum', 5000000),
+    ('KRW-XRP', '리플', 'XRP', 3000),
+    ('KRW-SOL', '솔라나', 'Solana', 250000),
+    ('KRW-DOGE', '도지코인', 'Dogecoin', 300),
+    ('BTC-ETH', '이더리움', 'Ethereum', 0.05),
+    ('USDT-BTC', '비트코인', 'Bitcoin', 70000),
+]
+
+
+class MockExchange:
+    """대역 서버의 상태 (시세 / 잔고 / 주문)"""
+
+    # 캔들을 돌려주는 기간 (초, 그 이전은 상장 전으로 취급)
+    CANDLE_HISTORY = 400 * 86400
+
+    def __init__(self, markets=None, krw_balance=1000000, fee_rate=0.0004, volatility=0.0):
+        """
+        Args:
+            markets (list): (마켓코드, 한글명, 영문명, 시작가) 리스트
+            krw_balance (float): 시작 KRW 잔고
+            fee_rate (float): 거래 수수료율 (체결 금액 기준)
+            volatility (float): 체결마다 현재가를 움직이는 표준편차 (비율, 0이면 고정)
+        """
+        self.lock = threading.Lock()
+        self.markets = list(markets or DEFAULT_MARKETS)
+        self.prices = {code: float(price) for code, _, _, price in self.markets}
+        self.balances = {'KRW': float(krw_balance)}
+        self.orders = {}
+        self.fee_rate = fee_rate
+        self.volatility = volatility
+
+    @staticmethod
+    def _tick(price):
+        return max(price * 0.0005, 1e-8)
+
+    def market_list(self):
+        return [
+            {'market': code, 'korean_name': ko, 'english_name': en, 'market_warning': 'NONE'}
+            for code, ko, en, _ in self.markets
+        ]
+
+    def ticker(self, code):
+        price = self.prices[code]
+        return {
+            'market': code,
+            'trade_price': price,
+            'opening_price': price,
+            'high_price': price,
+            'low_price': price,
+            'prev_closing_price': price,
+            'change': 'EVEN',
+            'acc_trade_price_24h': 0.0,
+            'acc_trade_volume_24h': 0.0,
+            'timestamp': int(time.time() * 1000),
+        }
+
+    def candles(self, code, step, to=None, count=200):
+        """
+        캔들 (최신부터) - 가격은 시각으로 정해지는 가짜 값이라 여러 번 받아도 같음
+        분봉은 일부 캔들을 거래 없음으로 건너뜀
+        """
+        now = time.time()
+        end = min(to, now) if to is not None else now
+        offset = -9 * 3600 if step >= 86400 else 0
+        ts = (int(end) - 1 - offset) // step * step + offset
+        first = now - self.CANDLE_HISTORY
+        base = self.prices[code]
+
+        items = []
+        while len(items) < min(count, 200) and ts >= first:
+            if step >= 86400 or (ts // step) % 13 != 5:
+                price = base * (1 + 0.05 * math.sin(ts / 86400))
+                moment = datetime.fromtimestamp(ts, timezone.utc)
+                items.append({
+                    'market': code,
+                    'candle_date_time_utc': moment.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'candle_date_time_kst': datetime.fromtimestamp(ts + 9 * 3600, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S'),
+                    'opening_price': price,
+                    'high_price': price * 1.001,
+                    'low_price': price * 0.999,
+                    'trade_price': price,
+                    'timestamp': (ts + step) * 1000 - 1,
+                    'candle_acc_trade_price': price * 10,
+                    'candle_acc_trade_volume': 10.0,
+                    'unit': step // 60,
+                })
+            ts -= step
+        return items
+
+    def orderbook(self, code, levels=15):
+        price = self.prices[code]
+        tick = self._tick(price)
+        units = [
+            {
+                'ask_price': price + tick * (i + 1),
+                'bid_price': price - tick * i,
+                'ask_size': 1.0 + i,
+                'bid_size': 1.0 + i,
+            }
+            for i in range(levels)
+        ]
+        return {
+            'market': code,
+            'timestamp': int(time.time() * 1000),
+            'total_ask_size': sum(u['ask_size'] for u in units),
+            'total_bid_size': sum(u['bid_size'] for u in units),
+            'orderbook_units': units,
+        }
+
+    def accounts(self):
+        with self.lock:
+            return [
+                {'currency': cur, 'balance': f'{bal:.8f}', 'locked': '0',
+                 'avg_buy_price': '0', 'avg_buy_price_modified': False, 'unit_currency': 'KRW'}
+                for cur, bal in self.balances.items()
+            ]
+
+    def place_order(self, body):
+        market = body.get('market')
+        if market not in self.prices:
+            return 404, {'error': {'name': 'not_found_market', 'message': '마켓을 찾을 수 없습니다.'}}
+
+        quote, base = market.split('-')
+        ord_type = body.get('ord_type')
+        order = {
+            'uuid': str(uuid.uuid4()),
+            'side': body.get('side'),
+            'ord_type': ord_type,
+            'price': body.get('price'),
+            'volume': body.get('volume'),
+            'market': market,
+            'state': 'wait',
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S+09:00'),
+            'remaining_volume': body.get('volume'),
+            'executed_volume': '0',
+            'paid_fee': '0',
+            'trades_count': 0,
+            'trades': [],
+        }
+
+        with self.lock:
+            price = self.prices[market]
+            # 시장가 주문은 최우선 호가 (매수: 현재가 + 1틱, 매도: 현재가) 로 즉시 전량 체결
+            if ord_type == 'price':
+                funds = float(body['price'])
+                fee = funds * self.fee_rate
+                if self.balances.get(quote, 0) < funds + fee:
+                    return 400, {'error': {'name': 'insufficient_funds_bid', 'message': '잔고가 부족합니다.'}}
+                fill_price = price + self._tick(price)
+                volume = round(funds / fill_price, 8)  # 체결 수량은 소수점 8자리
+                self.balances[quote] -= funds + fee
+                self.balances[base] = self.balances.get(base, 0) + volume
+                self._fill(order, fill_price, volume, funds, fee)
+            elif ord_type == 'market':
+                volume = float(body['volume'])
+                if self.balances.get(base, 0) + 1e-12 < volume:
+                    return 400, {'error': {'name': 'insufficient_funds_ask', 'message': '잔고가 부족합니다.'}}
+                funds = volume * price
+                fee = funds * self.fee_rate
+                self.balances[base] -= volume
+                self.balances[quote] = self.balances.get(quote, 0) + funds - fee
+                self._fill(order, price, volume, funds, fee)
+                order['remaining_volume'] = '0'
+            elif ord_type == 'limit' and self._crosses(order):
+                # 반대편 호가에 닿는 지정가 주문은 바로 체결
+                self._fill_limit(order)
+            self.orders[order['uuid']] = order
+
+            if self.volatility and ord_type in ('price', 'market'):
+                self.prices[market] = price * (1 + random.gauss(0, self.volatility))
+
+        # 주문 생성 응답에는 체결 내역이 없음 (GET /v1/order 로 조회)
+        return 201, {k: v for k, v in order.items() if k != 'trades'}
+
+    def _fill(self, order, price, volume, funds, fee):
+        """체결 기록 (부분 체결이면 여러 번 호출됨)"""
+        executed = float(order['executed_volume']) + volume
+        order.update(executed_volume=f'{executed:.8f}',
+                     paid_fee=f'{float(order["paid_fee"]) + fee:.8f}',
+                     trades_count=order['trades_count'] + 1)
+        order['trades'].append({
+            'market': order['market'], 'uuid': str(uuid.uuid4()), 'side': order['side'],
+            'price': f'{price:.8f}', 'volume': f'{volume:.8f}', 'funds': f'{funds:.8f}',
+            'created_at': order['created_at'],
+        })
+        if order['ord_type'] == 'limit':
+            remaining = float(order['volume']) - executed
+            order['remaining_volume'] = f'{max(remaining, 0):.8f}'
+            if remaining <= 1e-12:
+                order['state'] = 'done'
+        else:
+            order['state'] = 'done'
+
+    def _fill_limit(self, order, volume=None):
+        """지정가 주문 체결 (잔고 반영, 수량을 지정하지 않으면 남은 수량 전부)"""
+        quote, base = order['market'].split('-')
+        price = float(order['price'])
+        volume = min(float(order['remaining_volume']), volume or float('inf'))
+        funds = price * volume
+        fee = funds * self.fee_rate
+        if order['side'] == 'bid':
+            self.balances[quote] = self.balances.get(quote, 0) - funds - fee
+            self.balances[base] = self.balances.get(base, 0) + volume
+        else:
+            self.balances[base] = self.balances.get(base, 0) - volume
+            self.balances[quote] = self.balances.get(quote, 0) + funds - fee
+        self._fill(order, price, volume, funds, fee)
+
+    def _crosses(self, order):
+        price = self.prices[order['market']]
+        if order['side'] == 'bid':
+            return float(order['price']) >= price + self._tick(price)
+        return float(order['price']) <= price
+
+    def set_price(self, market, price):
+        """
+        현재가 변경 후 가격이 닿은 지정가 주문 체결
+
+        Returns:
+            list: 체결된 주문 UUID 리스트
+        """
+        filled = []
+        with self.lock:
+            self.prices[market] = float(price)
+            for order in self.orders.values():
+                if (order['market'] == market and order['ord_type'] == 'limit'
+                        and order['state'] == 'wait' and self._crosses(order)):
+                    self._fill_limit(order)
+                    filled.append(order['uuid'])
+        return filled
+
+    def fill_order(self, order_uuid, volume=None):
+        """지정가 주문 강제 체결 (volume 을 주면 부분 체결)"""
+        with self.lock:
+            order = self.orders[order_uuid]
+            if order['state'] == 'wait':
+                self._fill_limit(order, volume)
+            return dict(order)
+
+    def cancel_order(self, order_uuid):
+        with self.lock:
+            order = self.orders.get(order_uuid)
+            if order is None:
+                return 404, {'error': {'name': 'order_not_found', 'message': '주문을 찾을 수 없습니다.'}}
+            if order['state'] != 'wait':
+                return 400, {'error': {'name': 'order_not_cancelable', 'message': '취소할 수 없는 주문입니다.'}}
+            order['state'] = 'cancel'
+            return 200, {k: v for k, v in order.items() if k != 'trades'}
+
+    def get_order(self, order_uuid):
+        with self.lock:
+            order = self.orders.get(order_uuid)
+            if order is None:
+                return 404, {'error': {'name': 'order_not_found', 'message': '주문을 찾을 수 없습니다.'}}
+            return 200, dict(order, trades=list(order['trades']))
+
+    def list_orders(self, uuids=None, market=None, state=None, page=1, limit=100):
+        """여러 주문 조회 (uuid 목록 또는 마켓 / 상태 조건, 체결 내역 제외)"""
+        with self.lock:
+            if uuids:
+                found = [self.orders[u] for u in uuids if u in self.orders]
+            else:
+                found = [o for o in self.orders.values()
+                         if (market is None or o['market'] == market) and (state is None or o['state'] == state)]
+                found = found[(page - 1) * limit:page * limit]
+            return [{k: v for k, v in o.items() if k != 'trades'} for o in found]
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-Alive 지원
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def exchange(self):
+        return self.server.exchange
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _unauthorized(self):
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self._send_json(401, {'error': {'name': 'invalid_access_key', 'message': '인증 실패'}})
+            return True
+        return False
+
+    def _markets_param(self, query):
+        codes = ','.join(query.get('markets', [])).split(',')
+        return [c for c in codes if c in self.exchange.prices]
+
+    def _send_candles(self, path, query):
+        kind = path[len('/v1/candles/'):]
+        if kind == 'days':
+            step = 86400
+        elif kind.startswith('minutes/') and kind[len('minutes/'):].isdigit():
+            step = int(kind[len('minutes/'):]) * 60
+        else:
+            self._send_json(404, {'error': {'name': 'not_found', 'message': path}})
+            return
+        code = query.get('market', [''])[0]
+        if code not in self.exchange.prices:
+            self._send_json(404, {'error': {'name': 'Code not found', 'message': 'Code not found'}})
+            return
+        to = query.get('to', [None])[0]
+        if to:
+            to = datetime.fromisoformat(to.replace('Z', '+00:00')).timestamp()
+        count = int(query.get('count', ['1'])[0])
+        self._send_json(200, self.exchange.candles(code, step, to, count))
+
+    def _inject(self, path):
+        """
+        지연 / 장애 주입
+
+        Returns:
+            bool: 주입한 오류 응답을 이미 보냈으면 True
+        """
+        server = self.server
+        with server.stats_lock:
+            server.requests[path] += 1
+
+        # 네트워크 왕복 지연 흉내
+        delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        roll = random.random()
+        if roll < server.throttle_rate:
+            status = 429
+            self._send_json(429, {'error': {'name': 'too_many_requests', 'message': '요청 수 제한을 초과했습니다.'}})
+        elif roll < server.throttle_rate + server.error_rate:
+            status = 500
+            self._send_json(500, {'error': {'name': 'server_error', 'message': '일시적인 서버 오류'}})
+        else:
+            return False
+
+        with server.stats_lock:
+            server.injected[status] += 1
+        return True
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if self._inject(url.path):
+            return
+
+        if url.path == '/v1/market/all':
+            self._send_json(200, self.exchange.market_list())
+        elif url.path == '/v1/ticker':
+            self._send_json(200, [self.exchange.ticker(c) for c in self._markets_param(query)])
+        elif url.path == '/v1/orderbook':
+            self._send_json(200, [self.exchange.orderbook(c) for c in self._markets_param(query)])
+        elif url.path.startswith('/v1/candles/'):
+            self._send_candles(url.path, query)
+        elif url.path == '/v1/accounts':
+            if not self._unauthorized():
+                self._send_json(200, self.exchange.accounts())
+        elif url.path == '/v1/order':
+            if not self._unauthorized():
+                self._send_json(*self.exchange.get_order(query.get('uuid', [''])[0]))
+        elif url.path == '/v1/orders':
+            if not self._unauthorized():
+                self._send_json(200, self.exchange.list_orders(
+                    query.get('uuids[]'),
+                    market=query.get('market', [None])[0],
+                    state=query.get('state', [None])[0],
+                    page=int(query.get('page', ['1'])[0]),
+                    limit=int(query.get('limit', ['100'])[0]),
+                ))
+        else:
+            self._send_json(404, {'error': {'name': 'not_found', 'message': url.path}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        url = urlparse(self.path)
+        if self._inject(url.path):
+            return
+
+        if url.path != '/v1/orders':
+            self._send_json(404, {'error': {'name': 'not_found', 'message': url.path}})
+            return
+        if self._unauthorized():
+            return
+
+        status, payload = self.exchange.place_order(json.loads(raw or b'{}'))
+        self._send_json(status, payload)
+
+    def do_DELETE(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if self._inject(url.path):
+            return
+
+        if url.path != '/v1/order':
+            self._send_json(404, {'error': {'name': 'not_found', 'message': url.path}})
+            return
+        if self._unauthorized():
+            return
+
+        self._send_json(*self.exchange.cancel_order(query.get('uuid', [''])[0]))
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # 동시 접속 시 SYN 재전송 방지
+
+
+class MockBithumbServer:
+    """
+    백그라운드 스레드에서 실행되는 대역 서버
+
+    사용 예:
+        with MockBithumbServer() as server:
+            set_client(BithumbClient(server.url))
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, exchange=None, latency=0.0, jitter=0.0,
+                 error_rate=0.0, throttle_rate=0.0):
+        """
+        Args:
+            host (str): 바인딩 주소
+            port (int): 포트 (0이면 임의 포트)
+            exchange (MockExchange): 서버 상태 (없으면 기본값 생성)
+            latency (float): 요청마다 추가할 지연 (초)
+            jitter (float): 지연에 더할 0 ~ jitter 사이 무작위 값 (초)
+            error_rate (float): 500 응답 비율 (0 ~ 1)
+            throttle_rate (float): 429 응답 비율 (0 ~ 1)
+        """
+        self.exchange = exchange or MockExchange()
+        self._httpd = _HTTPServer((host, port), MockHandler)
+        self._httpd.exchange = self.exchange
+        self._httpd.latency = latency
+        self._httpd.jitter = jitter
+        self._httpd.error_rate = error_rate
+        self._httpd.throttle_rate = throttle_rate
+        self._httpd.stats_lock = threading.Lock()
+        self._httpd.requests = Counter()
+        self._httpd.injected = Counter()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self):
+        """경로별 요청 수"""
+        return self._httpd.requests
+
+    @property
+    def injected(self):
+        """주입한 오류 응답 수 ({429: n, 500: n})"""
+        return self._httpd.injected
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """현재 스레드에서 실행 (Ctrl+C 까지)"""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="로컬 빗썸 API 대역 서버")
+    parser.add_argument('port', type=int, nargs='?', default=8800)
+    parser.add_argument('--latency', type=float, default=0.0, help="요청 지연 (ms)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="추가 무작위 지연 (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="429 응답 비율 (0~1)")
+    args = parser.parse_args()
+
+    server = MockBithumbServer(port=args.port, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                               error_rate=args.error_rate, throttle_rate=args.throttle_rate)
+    print(f"Mock Bithumb API: {server.url} (Ctrl+C 종료)")
+    server.serve_forever()
@@ -0,0 +1,243 @@
+"""
+로컬 빗썸 WebSocket 대역 서버
+녹화된 시세 메시지(JSONL)를 구독한 마켓/채널에 맞춰 재생함
+
+실행: python benchmarks/mock_ws_server.py [port] [replay.jsonl]
+"""
+import base64
+import hashlib
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+DEFAULT_REPLAY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ws_replay.jsonl')
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+def load_replay(path=DEFAULT_REPLAY):
+    """녹화 파일 읽기 (한 줄에 메시지 하나)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _recv_exact(sock, n):
+    data = b''
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError('connection closed')
+        data += chunk
+    return data
+
+
+def _read_frame(sock):
+    head = _recv_exact(sock, 2)
+    opcode = head[0] & 0x0F
+    length = head[1] & 0x7F
+    masked = head[1] & 0x80
+    if length == 126:
+        length = struct.unpack('!H', _recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', _recv_exact(sock, 8))[0]
+    mask = _recv_exact(sock, 4) if masked else None
+    payload = _recv_exact(sock, length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def _frame(opcode, payload):
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+class _Connection:
+    def __init__(self, server, sock):
+        self.server = server
+        self.sock = sock
+        self.send_lock = threading.Lock()
+        self.subscribed = threading.Event()
+        self.codes = {}
+        self.closed = False
+
+    def send(self, opcode, payload):
+        with self.send_lock:
+            self.sock.sendall(_frame(opcode, payload))
+
+    def handshake(self):
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError('handshake failed')
+            request += chunk
+
+        key = ''
+        for line in request.decode('latin-1').split('\r\n'):
+            if line.lower().startswith('sec-websocket-key:'):
+                key = line.split(':', 1)[1].strip()
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        self.sock.sendall(
+            'HTTP/1.1 101 Switching Protocols\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Accept: {accept}\r\n\r\n'.encode()
+        )
+
+    def read_loop(self):
+        try:
+            while True:
+                opcode, payload = _read_frame(self.sock)
+                if opcode in (OP_TEXT, OP_BINARY):
+                    self._on_request(json.loads(payload))
+                elif opcode == OP_PING:
+                    self.send(OP_PONG, payload)
+                elif opcode == OP_CLOSE:
+                    self.send(OP_CLOSE, payload[:2])
+                    break
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.close()
+
+    def _on_request(self, request):
+        # [{'ticket': ...}, {'type': 'ticker', 'codes': [...]}, {'format': 'DEFAULT'}]
+        for item in request:
+            if 'type' in item:
+                self.codes[item['type']] = set(item.get('codes', []))
+        self.server.subscriptions.append(request)
+        self.subscribed.set()
+
+    def replay(self):
+        if not self.subscribed.wait(5):
+            return
+        sent = 0
+        for message in self.server.messages:
+            if self.closed:
+                return
+            try:
+                if isinstance(message, str):
+                    # 문자열은 그대로 전송 (깨진 프레임 테스트용)
+                    self.send(OP_TEXT, message.encode())
+                elif message.get('code') not in self.codes.get(message.get('type'), ()):
+                    continue
+                else:
+                    # 빗썸은 바이너리 프레임으로 JSON 을 전송함
+                    self.send(OP_BINARY, json.dumps(message).encode())
+            except OSError:
+                return
+            sent += 1
+            if self.server.drop_after and sent >= self.server.drop_after:
+                self.close()  # 연결 끊김 흉내 (재연결 테스트)
+                return
+            if self.server.interval:
+                time.sleep(self.server.interval)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
+
+
+class MockWebSocketServer:
+    """
+    녹화 메시지 재생 WebSocket 서버
+
+    사용 예:
+        with MockWebSocketServer() as server:
+            MarketStream(['KRW-BTC'], url=server.url).start()
+    """
+
+    def __init__(self, messages=None, host='127.0.0.1', port=0, interval=0.0, drop_after=0):
+        """
+        Args:
+            messages (list): 재생할 메시지 (없으면 data/ws_replay.jsonl, 문자열은 구독과 관계없이 그대로 전송)
+            host (str): 바인딩 주소
+            port (int): 포트 (0이면 임의 포트)
+            interval (float): 메시지 간 간격 (초)
+            drop_after (int): 연결마다 이 개수만큼 보낸 뒤 끊음 (0이면 끊지 않음)
+        """
+        self.messages = messages if messages is not None else load_replay()
+        self.interval = interval
+        self.drop_after = drop_after
+        self.connections = 0
+        self.subscriptions = []
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(16)
+        self._stopped = threading.Event()
+        self._open = []
+
+    @property
+    def url(self):
+        host, port = self._sock.getsockname()[:2]
+        return f'ws://{host}:{port}/websocket/v1'
+
+    def start(self):
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def _accept_loop(self):
+        while not self._stopped.is_set():
+            try:
+                sock, _ = self._sock.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        conn = _Connection(self, sock)
+        try:
+            conn.handshake()
+        except (OSError, ConnectionError):
+            conn.close()
+            return
+        self.connections += 1
+        self._open.append(conn)
+        threading.Thread(target=conn.read_loop, daemon=True).start()
+        conn.replay()
+
+    def stop(self):
+        self._stopped.set()
+        self._sock.close()
+        for conn in self._open:
+            conn.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8801
+    messages = load_replay(sys.argv[2]) if len(sys.argv) > 2 else None
+    server = MockWebSocketServer(messages, port=port, interval=0.2).start()
+    print(f"Mock Bithumb WebSocket: {server.url} (Ctrl+C 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,234 @@
+"""
+service.py 벤치마크 스위트 (로컬 대역 서버 사용)
+
+각 함수의 p50 / p95 / p99 지연과 처리량을 측정하고 결과를 JSON 으로 저장함
+일괄 조회(get_current_prices), 커넥션 풀 유무, asyncio 클라이언트 변형도 함께 측정
+
+실행:
+    python benchmarks/run_benchmarks.py                    # 기본 설정
+    python benchmarks/run_benchmarks.py --latency 20 --throttle-rate 0.05
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/이전결과.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_server import DEFAULT_MARKETS, MockBithumbServer, MockExchange
+from client import BithumbClient, set_client
+from credentials import CredentialProvider, set_provider
+from market_catalog import CatalogCache, fetch_catalog, set_catalog_cache
+from rate_limit import RateLimiter, set_limiter
+from async_client import AsyncBithumbClient
+import service
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def percentile(sorted_values, pct):
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def summarize(latencies, elapsed, errors):
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        'count': count,
+        'errors': errors,
+        'p50_ms': percentile(values, 50) * 1000,
+        'p95_ms': percentile(values, 95) * 1000,
+        'p99_ms': percentile(values, 99) * 1000,
+        'mean_ms': sum(values) / count * 1000 if count else 0.0,
+        'throughput_rps': count / elapsed if elapsed else 0.0,
+    }
+
+
+def is_error(result):
+    if result is None:
+        return True
+    if isinstance(result, dict):
+        return 'error' in result
+    if isinstance(result, list):
+        return bool(result) and isinstance(result[0], dict) and 'error' in result[0]
+    return False
+
+
+def measure(fn, count):
+    """fn 을 count 번 순차 호출"""
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - t0)
+        errors += is_error(result)
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def measure_async(make_coro, count):
+    """make_coro() 를 count 개 동시에 실행"""
+    latencies = []
+    errors = 0
+
+    async def timed():
+        nonlocal errors
+        t0 = time.perf_counter()
+        result = await make_coro()
+        latencies.append(time.perf_counter() - t0)
+        errors += is_error(result)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(count)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def build_exchange(extra_markets):
+    markets = list(DEFAULT_MARKETS)
+    markets += [(f'KRW-C{i:03d}', f'테스트코인{i:03d}', f'Test Coin {i:03d}', 1000 + i)
+                for i in range(extra_markets)]
+    return MockExchange(markets, krw_balance=10 ** 15)
+
+
+def run(args):
+    exchange = build_exchange(args.batch)
+    krw_markets = [code for code in exchange.prices if code.startswith('KRW-')]
+    batch = krw_markets[:args.batch]
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            MockBithumbServer(exchange=exchange, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                              error_rate=args.error_rate, throttle_rate=args.throttle_rate) as server:
+        # 실제 .env / 마켓 캐시 파일을 건드리지 않도록 임시 경로 사용
+        env_path = os.path.join(tmp, '.env')
+        with open(env_path, 'w', encoding='utf-8') as f:
+            f.write("ACCESS_KEY=bench-access-key\nSECRET_KEY=bench-secret-key-0123456789abcdef\n")
+        set_provider(CredentialProvider(env_path))
+        set_catalog_cache(CatalogCache(os.path.join(tmp, 'markets.json')))
+        if not args.respect_limits:
+            set_limiter(RateLimiter(public_rate=10 ** 9, private_rate=10 ** 9))
+
+        n = args.count
+        pooled = BithumbClient(server.url)
+        unpooled = BithumbClient(server.url, keep_alive=False)
+
+        set_client(pooled)
+        pooled.warm_up()
+        cases = [
+            ('get_current_price', lambda: service.get_current_price('KRW-BTC')),
+            (f'get_current_price x{len(batch)} (sequential)',
+             lambda: [service.get_current_price(m) for m in batch]),
+            (f'get_current_prices x{len(batch)} (batched)', lambda: service.get_current_prices(batch)),
+            ('get_orderbook', lambda: service.get_orderbook('KRW-BTC')),
+            ('get_markets (cached)', service.get_markets),
+            ('get_markets (download)', fetch_catalog),
+            ('get_my_balance', service.get_my_balance),
+            ('market_order', lambda: service.market_order('KRW-BTC', 'bid', 'price', price=5000)),
+            ('limit_order', lambda: service.limit_order('KRW-BTC', 'bid', 0.001, 90000000)),
+        ]
+        for name, fn in cases:
+            count = max(1, n // len(batch)) if 'sequential' in name or 'batched' in name else n
+            results[f'sync/{name}'] = measure(fn, count)
+
+        set_client(unpooled)
+        results['unpooled/get_current_price'] = measure(lambda: service.get_current_price('KRW-BTC'), n)
+        results['unpooled/market_order'] = measure(
+            lambda: service.market_order('KRW-BTC', 'bid', 'price', price=5000), n)
+        set_client(pooled)
+
+        async def async_cases():
+            out = {}
+            async with AsyncBithumbClient(server.url, pool_size=args.concurrency,
+                                          concurrency=args.concurrency) as client:
+                await client.get_current_price('KRW-BTC')  # 커넥션 생성
+                out['async/get_current_price'] = await measure_async(
+                    lambda: client.get_current_price('KRW-BTC'), n)
+                out['async/get_orderbook'] = await measure_async(lambda: client.get_orderbook('KRW-BTC'), n)
+                out['async/get_my_balance'] = await measure_async(client.get_my_balance, n)
+                out['async/market_order'] = await measure_async(
+                    lambda: client.market_order('KRW-BTC', 'bid', 'price', price=5000), n)
+            return out
+
+        results.update(asyncio.run(async_cases()))
+        injected = {str(k): v for k, v in server.injected.items()}
+        unpooled.close()
+        pooled.close()
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'count': args.count,
+            'batch': len(batch),
+            'concurrency': args.concurrency,
+            'latency_ms': args.latency,
+            'jitter_ms': args.jitter,
+            'error_rate': args.error_rate,
+            'throttle_rate': args.throttle_rate,
+            'respect_limits': args.respect_limits,
+            'injected': injected,
+        },
+        'results': results,
+    }
+
+
+def print_report(report, baseline=None):
+    base = (baseline or {}).get('results', {})
+    print("=" * 96)
+    meta = report['meta']
+    print(f"service.py 벤치마크 - 지연 {meta['latency_ms']}ms, 오류 {meta['error_rate']:.0%}, "
+          f"429 {meta['throttle_rate']:.0%}, 동시성 {meta['concurrency']}")
+    print("=" * 96)
+    print(f"{'case':44}{'n':>6}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}"
+          + (f"{'Δp50':>8}" if base else ''))
+    for name, r in report['results'].items():
+        line = (f"{name:44}{r['count']:6d}{r['errors']:5d}{r['p50_ms']:9.2f}{r['p95_ms']:9.2f}"
+                f"{r['p99_ms']:9.2f}{r['throughput_rps']:10.1f}")
+        if name in base and base[name]['p50_ms']:
+            line += f"{(r['p50_ms'] / base[name]['p50_ms'] - 1) * 100:+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="service.py 벤치마크 (로컬 대역 서버)")
+    parser.add_argument('--count', type=int, default=200, help="케이스별 호출 수")
+    parser.add_argument('--batch', type=int, default=50, help="일괄 조회 마켓 수")
+    parser.add_argument('--concurrency', type=int, default=16, help="비동기 동시 요청 수")
+    parser.add_argument('--latency', type=float, default=5.0, help="서버 지연 (ms)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="추가 무작위 지연 (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument('--respect-limits', action='store_true', help="빗썸 요청 수 제한 적용")
+    parser.add_argument('--output', help="결과 JSON 경로 (기본: benchmarks/results/bench-<시각>.json)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    report = run(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('bench-%Y%m%d-%H%M%S.json'))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ echo ========================================
 echo.
 
 echo Installing dependencies...
-pip install PyJWT python-dotenv requests pyinstaller
+pip install PyJWT python-dotenv requests aiohttp numpy pyinstaller
 
 echo.
 echo Building...
@@ -27,6 +27,8 @@ def build_exe():
         "--icon=NONE",                  # 아이콘 (필요시 .ico 파일 경로)
         "--hidden-import=jwt",          # JWT 모듈 명시적 포함
         "--hidden-import=dotenv",       # dotenv 모듈 명시적 포함
+        "--hidden-import=aiohttp",      # 사다리 / 일괄 취소 메뉴 (async_client 가 함수 안에서 import)
+        "--exclude-module=tkinter",     # CLI 는 GUI 를 쓰지 않음 (압축 해제 시간 단축)
         "--clean",                      # 이전 빌드 정리
         "main.py"                       # 메인 파일
     ]
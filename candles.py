@@ -0,0 +1,314 @@
+"""
+과거 캔들 수집 / 저장
+마켓 · 간격별로 컬럼마다 하나의 바이너리 파일 (ts.i8, open.f8, ...) 에 시간순으로 이어 붙이고,
+읽을 때는 np.memmap 으로 열어 시간 구간만 잘라서 돌려줌 (복사 / 파이썬 객체 생성 없음)
+
+수집은 [시작, 끝) 구간을 요청 하나 (최대 200개) 씩의 창으로 나눠 동시에 받고,
+오래된 창부터 묶음 단위로 저장하므로 중간에 멈춰도 마지막으로 저장된 시각부터 이어서 받음
+
+실행: python candles.py KRW-BTC KRW-ETH [--interval 1m] [--since 2024-01-01] [--dir candle_data]
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+
+from async_client import run_with_client
+from service import CANDLE_INTERVALS, MAX_CANDLES
+
+# 기본 저장 위치
+CANDLE_DIR = 'candle_data'
+
+# 저장할 컬럼: (이름, dtype) - ts 는 캔들 시작 시각 (UTC, epoch 초)
+COLUMNS = (
+    ('ts', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),  # 누적 거래량
+    ('value', '<f8'),   # 누적 거래대금
+)
+
+# API 응답 필드 → 컬럼
+_FIELDS = (
+    ('open', 'opening_price'),
+    ('high', 'high_price'),
+    ('low', 'low_price'),
+    ('close', 'trade_price'),
+    ('volume', 'candle_acc_trade_volume'),
+    ('value', 'candle_acc_trade_price'),
+)
+
+# 저장된 캔들이 없을 때 since 를 주지 않으면 받을 기간 (초)
+DEFAULT_HISTORY = 7 * 86400
+
+# 일봉은 KST 자정 (UTC 15:00) 에 시작
+_KST_OFFSET = -9 * 3600
+
+
+def interval_seconds(interval):
+    """캔들 간격 문자열 → 초"""
+    if interval not in CANDLE_INTERVALS:
+        raise ValueError(f"잘못된 캔들 간격: {interval}")
+    return CANDLE_INTERVALS[interval][1]
+
+
+def candle_start(ts, interval):
+    """ts 가 속한 캔들의 시작 시각 (epoch 초)"""
+    step = interval_seconds(interval)
+    offset = _KST_OFFSET if step >= 86400 else 0
+    return (int(ts) - offset) // step * step + offset
+
+
+def to_timestamp(value):
+    """datetime / 'yyyy-mm-dd[Thh:mm:ss]' (UTC) / epoch 초 → epoch 초"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float, np.integer)):
+        return int(value)
+    if hasattr(value, 'timestamp'):
+        return int(value.timestamp())
+    return int(np.datetime64(str(value).rstrip('Z'), 's').astype(np.int64))
+
+
+def _format_to(ts):
+    return f"{np.datetime64(int(ts), 's')}Z"
+
+
+def parse_candles(items):
+    """
+    캔들 API 응답 → 컬럼 배열 (시각 오름차순, 중복 제거)
+
+    Returns:
+        dict: {'ts': np.ndarray, 'open': ..., ...}
+    """
+    if not items:
+        return {name: np.empty(0, dtype) for name, dtype in COLUMNS}
+    ts = np.array([item['candle_date_time_utc'] for item in items], dtype='datetime64[s]').astype(np.int64)
+    ts, index = np.unique(ts, return_index=True)
+    columns = {'ts': ts}
+    for name, field in _FIELDS:
+        columns[name] = np.array([float(items[i][field]) for i in index.tolist()], dtype=np.float64)
+    return columns
+
+
+class CandleStore:
+    """
+    마켓 · 간격별 컬럼 파일 저장소
+
+    사용 예:
+        store = CandleStore()
+        closes = store.read('KRW-BTC', '1m', start='2024-03-01', end='2024-04-01')['close']
+    """
+
+    def __init__(self, root=CANDLE_DIR):
+        """
+        Args:
+            root (str): 저장 디렉터리 ({root}/{마켓}/{간격}/{컬럼}.bin)
+        """
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, market, interval, name):
+        return os.path.join(self.root, market, interval, f'{name}.bin')
+
+    def count(self, market, interval):
+        """저장된 캔들 수 (컬럼 중 가장 짧은 길이 - 쓰다가 멈춘 꼬리는 무시)"""
+        counts = []
+        for name, dtype in COLUMNS:
+            path = self._path(market, interval, name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            counts.append(size // np.dtype(dtype).itemsize)
+        return min(counts)
+
+    def last_timestamp(self, market, interval):
+        """마지막으로 저장된 캔들 시작 시각 (없으면 None)"""
+        n = self.count(market, interval)
+        if n == 0:
+            return None
+        return int(self._column(market, interval, 'ts', n)[-1])
+
+    def markets(self, interval):
+        """간격별 저장된 마켓 리스트"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(m for m in os.listdir(self.root) if self.count(m, interval) > 0)
+
+    def append(self, market, interval, columns):
+        """
+        캔들 이어 붙이기 (마지막 저장 시각 이후 캔들만 저장)
+
+        Args:
+            columns (dict): parse_candles 형식 컬럼 배열 (ts 오름차순)
+
+        Returns:
+            int: 저장한 캔들 수
+        """
+        with self._lock:
+            n = self.count(market, interval)
+            ts = np.asarray(columns['ts'], dtype=np.int64)
+            if n:
+                last = self._column(market, interval, 'ts', n)[-1]
+                keep = ts > last
+            else:
+                keep = np.ones(len(ts), dtype=bool)
+            if not keep.any():
+                return 0
+
+            os.makedirs(os.path.dirname(self._path(market, interval, 'ts')), exist_ok=True)
+            for name, dtype in COLUMNS:
+                path = self._path(market, interval, name)
+                data = np.ascontiguousarray(np.asarray(columns[name])[keep], dtype=dtype)
+                with open(path, 'ab') as f:
+                    # 이전에 쓰다가 멈춘 꼬리가 있으면 잘라내고 이어 씀
+                    f.truncate(n * data.itemsize)
+                    f.write(data.tobytes())
+            return int(keep.sum())
+
+    def _column(self, market, interval, name, n):
+        dtype = dict(COLUMNS)[name]
+        if n == 0:
+            return np.empty(0, dtype)
+        return np.memmap(self._path(market, interval, name), dtype=dtype, mode='r', shape=(n,))
+
+    def read(self, market, interval, start=None, end=None, columns=None):
+        """
+        시간 구간 [start, end) 캔들 (memmap 슬라이스, 복사 없음)
+
+        Args:
+            start / end: datetime / 'yyyy-mm-dd[Thh:mm:ss]' (UTC) / epoch 초 (없으면 처음 / 끝까지)
+            columns (list, optional): 읽을 컬럼 이름 (없으면 전체)
+
+        Returns:
+            dict: {컬럼 이름: 읽기 전용 배열}
+        """
+        n = self.count(market, interval)
+        ts = self._column(market, interval, 'ts', n)
+        lo = 0 if start is None else int(np.searchsorted(ts, to_timestamp(start), side='left'))
+        hi = n if end is None else int(np.searchsorted(ts, to_timestamp(end), side='left'))
+        names = columns or [name for name, _ in COLUMNS]
+        return {name: (ts if name == 'ts' else self._column(market, interval, name, n))[lo:hi]
+                for name in names}
+
+
+def _windows(start, end, step, count=MAX_CANDLES):
+    """[start, end) 를 요청 하나씩의 창 [lo, hi) 로 나눔 (오래된 창부터)"""
+    span = step * count
+    return [(lo, min(lo + span, end)) for lo in range(start, end, span)]
+
+
+async def _fetch_window(client, market, interval, lo, hi):
+    items = await client.get_candles(market, interval, to=_format_to(hi))
+    if not isinstance(items, list):
+        error = items.get('error') if isinstance(items, dict) else items
+        if isinstance(error, dict):
+            error = error.get('message') or error.get('name')
+        raise RuntimeError(error)
+    columns = parse_candles(items)
+    # 거래가 없던 구간이 있으면 창보다 이전 캔들까지 내려오므로 창 안쪽만 사용
+    keep = (columns['ts'] >= lo) & (columns['ts'] < hi)
+    return {name: values[keep] for name, values in columns.items()}
+
+
+async def download_market(client, store, market, interval='1m', since=None, until=None, batch=8,
+                          on_progress=None):
+    """
+    한 마켓 캔들 수집 (저장된 마지막 시각부터 이어서)
+
+    Args:
+        client (AsyncBithumbClient): 비동기 클라이언트
+        store (CandleStore): 저장소
+        since: 저장된 캔들이 없을 때 시작 시각 (없으면 DEFAULT_HISTORY 전부터)
+        until: 끝 시각 (없으면 현재 - 진행 중인 캔들은 제외)
+        batch (int): 동시에 받을 창 수 (받은 묶음마다 저장)
+        on_progress (callable, optional): 묶음 저장마다 on_progress(market, added, last_ts)
+
+    Returns:
+        dict: {'market', 'added', 'last', 'error'}
+    """
+    step = interval_seconds(interval)
+    end = candle_start(to_timestamp(until) or time.time(), interval)
+    last = store.last_timestamp(market, interval)
+    if last is not None:
+        start = last + step
+    else:
+        start = candle_start(to_timestamp(since) or end - DEFAULT_HISTORY, interval)
+
+    outcome = {'market': market, 'added': 0, 'last': last, 'error': None}
+    windows = _windows(start, end, step)
+    for i in range(0, len(windows), batch):
+        pages = await asyncio.gather(*(_fetch_window(client, market, interval, lo, hi)
+                                       for lo, hi in windows[i:i + batch]), return_exceptions=True)
+        failed = [page for page in pages if isinstance(page, Exception)]
+        if failed:
+            outcome['error'] = str(failed[0])
+            break
+        merged = {name: np.concatenate([page[name] for page in pages]) for name, _ in COLUMNS}
+        outcome['added'] += store.append(market, interval, merged)
+        outcome['last'] = store.last_timestamp(market, interval)
+        if on_progress:
+            on_progress(market, outcome['added'], outcome['last'])
+    return outcome
+
+
+async def download_async(client, markets, interval='1m', since=None, until=None, store=None, batch=8,
+                         on_progress=None):
+    """여러 마켓 동시 수집 (마켓마다 download_market 결과 리스트)"""
+    store = store or CandleStore()
+    return await asyncio.gather(*(
+        download_market(client, store, market, interval, since, until, batch, on_progress)
+        for market in markets
+    ))
+
+
+def download(markets, interval='1m', since=None, until=None, store=None, batch=8, base_url=None,
+             on_progress=None):
+    """
+    여러 마켓 캔들 수집 (동기 호출용)
+
+    Args:
+        markets (list): 마켓 ID 리스트
+        interval (str): 캔들 간격 ('1m', ..., '240m', '1d')
+        since / until: 시작 / 끝 시각 (datetime / 'yyyy-mm-dd' (UTC) / epoch 초)
+        store (CandleStore, optional): 저장소 (없으면 CANDLE_DIR)
+
+    Returns:
+        list: 마켓별 {'market', 'added', 'last', 'error'}
+    """
+    interval_seconds(interval)
+    return run_with_client(
+        lambda client: download_async(client, markets, interval, since, until, store, batch, on_progress),
+        base_url, pool_size=16, concurrency=16,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="빗썸 과거 캔들 수집")
+    parser.add_argument('markets', nargs='+', help="마켓 ID (예: KRW-BTC)")
+    parser.add_argument('--interval', default='1m', choices=list(CANDLE_INTERVALS))
+    parser.add_argument('--since', help="처음 받을 때 시작 날짜 (UTC, 예: 2024-01-01)")
+    parser.add_argument('--until', help="끝 날짜 (UTC, 없으면 현재)")
+    parser.add_argument('--dir', default=CANDLE_DIR, help="저장 디렉터리")
+    args = parser.parse_args()
+
+    def on_progress(market, added, last):
+        print(f"⏳ {market}: {added:,}개 저장 (~ {np.datetime64(last, 's')})", flush=True)
+
+    started = time.perf_counter()
+    results = download(args.markets, args.interval, args.since, args.until, CandleStore(args.dir),
+                       on_progress=on_progress)
+    for r in results:
+        last = np.datetime64(r['last'], 's') if r['last'] is not None else '-'
+        if r['error']:
+            print(f"❌ {r['market']}: {r['added']:,}개 저장 후 중단 ({r['error']})")
+        else:
+            print(f"✅ {r['market']}: {r['added']:,}개 추가, 마지막 캔들 {last}")
+    print(f"⏱️ {time.perf_counter() - started:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""
+스크립트용 명령줄 인터페이스 (대화형 입력 없이 한 번 실행하고 JSON 출력)
+
+    python main.py quote BTC ETH
+    python main.py balance
+    python main.py buy KRW-XRP 10000            # 시장가 매수 (KRW 금액)
+    python main.py sell XRP                     # 시장가 매도 (수량 생략 시 전량)
+    python main.py limit XRP bid 20 650         # 지정가 (마켓 매수/매도 수량 가격)
+    python main.py batch orders.txt             # 파일 (또는 - / 생략 시 stdin) 의 주문을 한 번에 실행
+
+batch 는 한 줄에 하나씩 위 명령 (quote/balance/buy/sell/limit) 이나 JSON 객체
+({"cmd": "limit", "market": "KRW-XRP", "side": "bid", "volume": 20, "price": 650}) 를 읽어서
+하나의 프로세스 / 미리 열어둔 커넥션 풀로 동시에 보내고, 끝나는 순서대로 결과를 한 줄씩 출력함
+빈 줄과 # 주석은 건너뜀
+
+batch 의 줄들은 순서 없이 동시에 실행됨 - 같은 마켓이라도 앞 줄의 주문이 끝나기 전에 다음 줄이 실행될 수 있음
+(buy XRP 다음 줄의 sell XRP 가 매수 체결 전의 잔고를 읽을 수 있음)
+앞 줄의 결과에 의존하는 명령이 있으면 --sequential 로 입력 순서대로 하나씩 실행
+(--sequential 에서는 buy / sell 이 체결될 때까지 기다린 뒤 다음 줄을 실행 - limit 는 접수까지만 기다림)
+
+종료 코드: 0 모두 성공, 1 실패한 명령이 있음, 2 명령 형식 오류
+"""
+import json
+import shlex
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+
+from client import get_client
+from service import (
+    get_current_prices,
+    get_my_balance,
+    limit_order,
+    market_order,
+    MIN_ORDER_AMOUNT,
+)
+from balance_store import parse_balances, ZERO
+from journal import get_journal
+
+COMMANDS = ('quote', 'balance', 'buy', 'sell', 'limit')
+
+# JSON 한 줄 입력의 필드 → 명령 인자 순서
+COMMAND_FIELDS = {
+    'quote': ('markets',),
+    'balance': ('currency',),
+    'buy': ('market', 'amount'),
+    'sell': ('market', 'volume'),
+    'limit': ('market', 'side', 'volume', 'price'),
+}
+
+SIDES = {'bid': 'bid', 'buy': 'bid', 'ask': 'ask', 'sell': 'ask'}
+
+# batch 동시 실행 수 (기본 클라이언트 pool_maxsize 이하)
+BATCH_CONCURRENCY = 8
+
+# --sequential 에서 시장가 주문 체결을 기다리는 최대 시간 (초)
+FILL_TIMEOUT = 10.0
+
+
+class CommandError(ValueError):
+    """명령 형식 오류"""
+
+
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser():
+    """명령 파서 (처음 쓸 때 생성 후 재사용 - argparse import 도 이때 함)"""
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = _build_parser()
+    return _parser
+
+
+def _build_parser():
+    import argparse
+
+    class Parser(argparse.ArgumentParser):
+        # 배치 한 줄이 틀렸다고 프로세스가 종료되면 안 되므로 예외로 돌려줌
+        def error(self, message):
+            raise CommandError(message)
+
+    parser = Parser(prog='main.py', description="빗썸 거래 명령 (결과는 JSON 으로 출력)")
+    commands = parser.add_subparsers(dest='cmd', metavar='명령', parser_class=Parser)
+    commands.required = True
+
+    quote = commands.add_parser('quote', help="현재가 조회")
+    quote.add_argument('markets', nargs='+', type=parse_market, help="마켓 (KRW-BTC 또는 BTC)")
+
+    balance = commands.add_parser('balance', help="잔고 조회")
+    balance.add_argument('currency', nargs='?', help="통화 (생략 시 전체)")
+
+    buy = commands.add_parser('buy', help="시장가 매수")
+    buy.add_argument('market', type=parse_market)
+    buy.add_argument('amount', type=parse_amount, help="매수 금액 (KRW)")
+
+    sell = commands.add_parser('sell', help="시장가 매도")
+    sell.add_argument('market', type=parse_market)
+    sell.add_argument('volume', nargs='?', type=parse_amount, help="매도 수량 (생략 시 보유 전량)")
+
+    limit = commands.add_parser('limit', help="지정가 주문")
+    limit.add_argument('market', type=parse_market)
+    limit.add_argument('side', type=parse_side, help="bid/buy 또는 ask/sell")
+    limit.add_argument('volume', type=parse_amount, help="주문 수량")
+    limit.add_argument('price', type=parse_amount, help="주문 가격")
+
+    batch = commands.add_parser('batch', help="여러 명령을 한 번에 실행 (한 줄에 하나)")
+    batch.add_argument('file', nargs='?', default='-', help="명령 파일 (- 또는 생략 시 stdin)")
+    batch.add_argument('-c', '--concurrency', type=int, default=BATCH_CONCURRENCY,
+                       help=f"동시 실행 수 (기본 {BATCH_CONCURRENCY}, 줄 사이 순서는 보장하지 않음)")
+    batch.add_argument('--sequential', action='store_true',
+                       help="입력 순서대로 하나씩 실행, buy/sell 은 체결 후 다음 줄로 "
+                            "(매수 후 전량 매도처럼 앞 줄에 의존할 때)")
+    return parser
+
+
+def parse_market(text):
+    """'btc' → 'KRW-BTC', 'btc-eth' → 'BTC-ETH'"""
+    text = str(text).strip().upper()
+    return text if '-' in text else f'KRW-{text}'
+
+
+def parse_amount(text):
+    """양수 금액 / 수량 → Decimal"""
+    import argparse
+
+    try:
+        value = Decimal(str(text))
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f"숫자가 아닙니다: {text}")
+    if not value.is_finite() or value <= 0:
+        raise argparse.ArgumentTypeError(f"0보다 커야 합니다: {text}")
+    return value
+
+
+def parse_side(text):
+    import argparse
+
+    side = SIDES.get(str(text).lower())
+    if side is None:
+        raise argparse.ArgumentTypeError(f"bid/ask (buy/sell) 중 하나여야 합니다: {text}")
+    return side
+
+
+def parse_command(argv):
+    """
+    명령 인자 리스트 → argparse Namespace
+
+    Raises:
+        CommandError: 형식 오류
+    """
+    return get_parser().parse_args(argv)
+
+
+def parse_line(line):
+    """
+    batch 입력 한 줄 → Namespace (빈 줄 / 주석이면 None)
+
+    Raises:
+        CommandError: 형식 오류 또는 batch 안의 batch
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+
+    if line.startswith('{'):
+        argv = _json_argv(line)
+    else:
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+    if argv and argv[0] not in COMMANDS:
+        raise CommandError(f"알 수 없는 명령: {argv[0]} (사용 가능: {', '.join(COMMANDS)})")
+    # 도움말은 stdout 에 출력하고 프로세스를 종료하므로 batch 안에서는 막음
+    if '-h' in argv or '--help' in argv:
+        raise CommandError("batch 안에서는 도움말을 쓸 수 없습니다")
+    return parse_command(argv)
+
+
+def _json_argv(line):
+    try:
+        item = json.loads(line)
+    except ValueError as e:
+        raise CommandError(f"JSON 형식 오류: {e}")
+    if not isinstance(item, dict):
+        raise CommandError("JSON 입력은 객체여야 합니다")
+
+    cmd = item.get('cmd')
+    if cmd not in COMMAND_FIELDS:
+        raise CommandError(f"알 수 없는 명령: {cmd} (사용 가능: {', '.join(COMMANDS)})")
+    unknown = set(item) - set(COMMAND_FIELDS[cmd]) - {'cmd'}
+    if unknown:
+        raise CommandError(f"{cmd}: 알 수 없는 필드 {', '.join(sorted(unknown))}")
+
+    argv = [cmd]
+    for field in COMMAND_FIELDS[cmd]:
+        value = item.get(field)
+        if value is None:
+            continue
+        if isinstance(value, list):
+            argv.extend(str(v) for v in value)
+        else:
+            argv.append(str(value))
+    return argv
+
+
+# ==================== 실행 ====================
+
+def _error_text(result):
+    error = result.get('error')
+    if isinstance(error, dict):
+        return error.get('message') or error.get('name')
+    return str(error)
+
+
+def _envelope(cmd, result):
+    """API 응답 → {'cmd', 'ok', 'result' 또는 'error'}"""
+    if isinstance(result, dict) and 'error' in result:
+        return {'cmd': cmd, 'ok': False, 'error': _error_text(result), 'result': result}
+    return {'cmd': cmd, 'ok': True, 'result': result}
+
+
+def _failure(cmd, message):
+    return {'cmd': cmd, 'ok': False, 'error': message}
+
+
+def _quote(args):
+    tickers = get_current_prices(args.markets)
+    missing = [market for market in args.markets if market not in tickers]
+    result = {
+        market: {
+            'price': ticker.get('trade_price'),
+            'change_rate': ticker.get('signed_change_rate'),
+            'volume_24h': ticker.get('acc_trade_volume_24h'),
+            'timestamp': ticker.get('timestamp'),
+        }
+        for market, ticker in tickers.items()
+    }
+    if missing:
+        return {'cmd': 'quote', 'ok': False, 'error': f"조회 실패: {', '.join(missing)}", 'result': result}
+    return _envelope('quote', result)
+
+
+def _fetch_balances():
+    """
+    /v1/accounts 조회 (한 번 실행하고 끝나는 명령이므로 잔고 캐시를 거치지 않음)
+
+    Returns:
+        tuple: ({통화: 잔고 정보}, None) 또는 (None, 오류 응답)
+    """
+    items = get_my_balance()
+    balances = parse_balances(items)
+    if balances is not None:
+        return balances, None
+    if isinstance(items, list) and items:
+        return None, items[0]
+    return None, items if isinstance(items, dict) else {'error': str(items)}
+
+
+def _balance(args):
+    balances, error = _fetch_balances()
+    if error is not None:
+        return _envelope('balance', error)
+
+    if args.currency:
+        currency = args.currency.upper()
+        balance = balances.get(currency)
+        if balance is None:
+            return _failure('balance', f"보유하지 않은 통화: {currency}")
+        return _envelope('balance', balance)
+    return _envelope('balance', list(balances.values()))
+
+
+def _buy(args):
+    if args.amount < MIN_ORDER_AMOUNT:
+        return _failure('buy', f"최소 주문 금액은 {MIN_ORDER_AMOUNT:,}원입니다")
+    result = market_order(args.market, 'bid', 'price', price=args.amount)
+    return _envelope('buy', result)
+
+
+def _sell(args):
+    volume = args.volume
+    if volume is None:
+        balances, error = _fetch_balances()
+        if error is not None:
+            return _envelope('sell', error)
+        base = args.market.split('-')[1]
+        volume = balances.get(base, {}).get('balance', ZERO)
+        if volume <= 0:
+            return _failure('sell', f"매도할 {base} 잔고가 없습니다")
+    result = market_order(args.market, 'ask', 'market', volume=volume)
+    return _envelope('sell', result)
+
+
+def _limit(args):
+    result = limit_order(args.market, args.side, args.volume, args.price)
+    return _envelope('limit', result)
+
+
+HANDLERS = {
+    'quote': _quote,
+    'balance': _balance,
+    'buy': _buy,
+    'sell': _sell,
+    'limit': _limit,
+}
+
+
+def execute(args):
+    """
+    명령 실행 (예외는 실패 결과로 변환)
+
+    Returns:
+        dict: {'cmd', 'ok', 'result'} 또는 {'cmd', 'ok': False, 'error', ...}
+    """
+    try:
+        return HANDLERS[args.cmd](args)
+    except Exception as e:
+        return _failure(args.cmd, str(e))
+
+
+def _wait_fill(record):
+    """
+    시장가 주문 결과가 체결될 때까지 대기 (--sequential 용)
+    체결 확인에 실패하면 주문 응답은 그대로 두고 실패로 표시함
+
+    Returns:
+        dict: 체결 수량이 추가된 결과 ({'filled': 체결 수량})
+    """
+    from volume_engine import OrderFailed, wait_for_fill
+
+    try:
+        order = wait_for_fill(record['result']['uuid'], timeout=FILL_TIMEOUT)
+    except OrderFailed as e:
+        return {**record, 'ok': False, 'error': f"체결 확인 실패: {e}"}
+    return {**record, 'filled': order.get('executed_volume')}
+
+
+def to_json(value):
+    """결과 → JSON 한 줄 (Decimal 은 문자열)"""
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def run_batch(lines, out=None, concurrency=BATCH_CONCURRENCY, wait_fills=False):
+    """
+    여러 명령을 동시에 실행하고 끝나는 순서대로 결과를 한 줄씩 출력
+    줄 사이의 실행 순서는 보장하지 않음 (concurrency=1 이면 입력 순서대로 하나씩)
+
+    입력을 다 읽기 전에도 읽은 줄부터 바로 실행하므로 파이프로 계속 들어오는 명령도 처리할 수 있음
+    (실행 중 + 대기 중인 명령이 concurrency x 4 를 넘으면 입력 읽기를 잠시 멈춤)
+
+    Args:
+        lines (iterable): 명령 줄 (파일 객체, stdin, 문자열 리스트)
+        out (file): 결과 출력 대상 (기본 stdout)
+        concurrency (int): 동시 실행 수 (기본 클라이언트 pool_maxsize 까지)
+        wait_fills (bool): buy / sell 이 체결될 때까지 기다린 뒤 결과 출력 (concurrency=1 과 함께 쓰면
+            다음 줄은 앞 줄의 체결이 반영된 잔고를 읽음)
+
+    Returns:
+        dict: {'lines', 'ok', 'failed', 'seconds'}
+    """
+    out = out or sys.stdout
+    # 풀보다 많이 동시에 보내면 남는 커넥션은 재사용되지 않고 매번 새로 열림
+    concurrency = max(1, min(concurrency, get_client().pool_maxsize))
+    write_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(concurrency * 4)
+    counts = {'lines': 0, 'ok': 0, 'failed': 0}
+    started = time.perf_counter()
+
+    def emit(record):
+        with write_lock:
+            counts['lines'] += 1
+            counts['ok' if record['ok'] else 'failed'] += 1
+            out.write(to_json(record) + '\n')
+            out.flush()
+
+    def run(number, args):
+        try:
+            t0 = time.perf_counter()
+            record = execute(args)
+            if wait_fills and record['ok'] and args.cmd in ('buy', 'sell'):
+                record = _wait_fill(record)
+            record = {'line': number, **record, 'ms': round((time.perf_counter() - t0) * 1000, 1)}
+            emit(record)
+        finally:
+            slots.release()
+
+    # 첫 명령이 핸드셰이크를 기다리지 않도록 입력을 읽는 동안 커넥션을 미리 열어둠
+    warm = threading.Thread(target=lambda: get_client().warm_up(min(concurrency, 4)),
+                            name='batch-prewarm', daemon=True)
+    warm.start()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='batch') as executor:
+        for number, line in enumerate(lines, 1):
+            try:
+                args = parse_line(line)
+            except CommandError as e:
+                emit({'line': number, **_failure(None, str(e)), 'input': line.strip()})
+                continue
+            if args is None:
+                continue
+            slots.acquire()
+            executor.submit(run, number, args)
+
+    counts['seconds'] = round(time.perf_counter() - started, 3)
+    return counts
+
+
+def main(argv=None):
+    """
+    명령줄 진입점 (main.py 에 인자가 있으면 호출됨)
+
+    Returns:
+        int: 종료 코드
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        args = parse_command(argv)
+    except CommandError as e:
+        print(to_json(_failure(argv[0] if argv else None, str(e))))
+        print(f"❌ {e}\n", file=sys.stderr)
+        get_parser().print_usage(sys.stderr)
+        return 2
+
+    journal = get_journal()
+    journal.enable()
+    try:
+        if args.cmd == 'batch':
+            if args.sequential:
+                options = {'concurrency': 1, 'wait_fills': True}
+            else:
+                options = {'concurrency': args.concurrency}
+            if args.file == '-':
+                summary = run_batch(sys.stdin, **options)
+            else:
+                with open(args.file, encoding='utf-8') as f:
+                    summary = run_batch(f, **options)
+            print(f"✅ {summary['ok']}건 성공 / ❌ {summary['failed']}건 실패 "
+                  f"({summary['seconds']:.2f}초)", file=sys.stderr)
+            return 1 if summary['failed'] else 0
+
+        record = execute(args)
+        print(to_json(record))
+        return 0 if record['ok'] else 1
+    finally:
+        journal.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
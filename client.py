@@ -0,0 +1,236 @@
+"""
+빗썸 API HTTP 클라이언트
+커넥션 풀 + Keep-Alive 세션으로 매 요청마다 TCP/TLS 핸드셰이크를 반복하지 않음
+requests 는 import 가 무거워서 (~90ms) 첫 세션을 만들 때 로드함
+"""
+import os
+import threading
+import time
+
+from metrics import api_error_name, get_metrics
+from rate_limit import endpoint_group, get_limiter
+
+# 환경 변수 BITHUMB_API_URL 로 다른 서버 (로컬 대역 서버 등) 지정 가능
+API_URL = os.getenv('BITHUMB_API_URL', "https://api.bithumb.com")
+
+
+class BithumbClient:
+    """
+    공유 커넥션 풀을 사용하는 빗썸 HTTP 클라이언트
+
+    urllib3 커넥션 풀은 스레드 안전하므로 여러 워커 스레드에서
+    하나의 클라이언트를 동시에 사용할 수 있음
+    """
+
+    def __init__(self, base_url=API_URL, pool_connections=4, pool_maxsize=16,
+                 keep_alive=True, pool_block=False, timeout=10, warm=0, limiter=None):
+        """
+        Args:
+            base_url (str): API 서버 주소
+            pool_connections (int): 호스트별 풀 개수
+            pool_maxsize (int): 풀당 최대 유지 커넥션 수
+            keep_alive (bool): False면 매 요청 후 커넥션을 닫음
+            pool_block (bool): True면 풀이 가득 찼을 때 새 커넥션 대신 대기
+            timeout (float): 요청 타임아웃 (초)
+            warm (int): 생성 직후 미리 열어둘 커넥션 수
+            limiter (RateLimiter): 속도 제한 / 재시도 (없으면 공용 기본값)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.pool_block = pool_block
+        self.timeout = timeout
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        self._session = None
+
+        if warm:
+            self.warm_up(warm)
+
+    @property
+    def session(self):
+        """지연 생성되는 공유 requests.Session"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def request(self, method, path, **kwargs):
+        """
+        API 요청 전송
+        요청 그룹별 속도 제한을 지키고, 429 / 5xx 는 RetryPolicy 에 따라 재시도함
+        
+        Args:
+            method (str): HTTP 메서드 ('GET', 'POST', ...)
+            path (str): API 경로 (예: '/v1/ticker')
+            **kwargs: requests.Session.request 인자
+                (재시도마다 새로 서명하려면 headers 대신 auth=utils.JWTAuth(...) 사용)
+
+        Returns:
+            requests.Response: 응답 객체 (재시도 후에도 실패하면 마지막 응답)
+        """
+        import requests
+
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = self.limiter or get_limiter()
+        retry = limiter.retry
+        group = endpoint_group(path)
+        url = self.base_url + path
+        attempt = 0
+
+        metrics = get_metrics()
+        while True:
+            limiter.acquire(group)
+            retry_after = None
+            started = time.perf_counter() if metrics.enabled else 0.0
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if metrics.enabled:
+                    metrics.record_request(path, None, time.perf_counter() - started, error=type(e).__name__)
+                if not retry.should_retry(method, attempt):
+                    raise
+                status = None
+            else:
+                status = response.status_code
+                if metrics.enabled:
+                    _record_response(metrics, path, response, time.perf_counter() - started)
+                if status not in retry.statuses or not retry.should_retry(method, attempt, status):
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+
+            limiter.record_retry(group, status)
+            time.sleep(retry.delay(attempt, retry_after))
+            attempt += 1
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def warm_up(self, connections=1):
+        """
+        커넥션 미리 열기 (시작 시 첫 주문의 핸드셰이크 지연 제거)
+
+        Args:
+            connections (int): 동시에 열어둘 커넥션 수 (pool_maxsize 이하)
+
+        Returns:
+            int: 성공한 연결 수
+        """
+        import requests
+        from concurrent.futures import ThreadPoolExecutor
+
+        connections = max(1, min(connections, self.pool_maxsize))
+
+        def _touch(_):
+            try:
+                self.session.head(self.base_url + '/', timeout=self.timeout)
+                return True
+            except requests.RequestException:
+                return False
+
+        if connections == 1:
+            return int(_touch(0))
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(_touch, range(connections)))
+
+    def close(self):
+        """세션 및 풀의 모든 커넥션 종료"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _record_response(metrics, path, response, seconds):
+    body = response.request.body if response.request is not None else None
+    error = None
+    if response.status_code >= 400:
+        error = api_error_name(_safe_json(response), response.status_code)
+    metrics.record_request(path, response.status_code, seconds,
+                           bytes_out=len(body.encode() if isinstance(body, str) else body) if body else 0,
+                           bytes_in=len(response.content or b''),
+                           error=error)
+
+
+def _safe_json(response):
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """
+    service.py 함수들이 공유하는 기본 클라이언트 반환 (지연 생성)
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = BithumbClient()
+    return _default_client
+
+
+def prewarm():
+    """
+    백그라운드 스레드에서 requests 로드 + 기본 클라이언트 커넥션 미리 열기
+    시작 직후 호출하면 첫 화면 / API 키 확인과 겹쳐서 진행되므로 첫 시세 조회가 빨라짐
+
+    Returns:
+        threading.Thread: 실행 중인 스레드
+    """
+    thread = threading.Thread(target=lambda: get_client().warm_up(1), name='client-prewarm', daemon=True)
+    thread.start()
+    return thread
+
+
+def set_client(client):
+    """
+    기본 클라이언트 교체 (풀 크기 변경, 테스트 서버 연결 등)
+
+    Args:
+        client (BithumbClient): 새 기본 클라이언트
+
+    Returns:
+        BithumbClient: 이전 기본 클라이언트 (없으면 None)
+    """
+    global _default_client
+    with _default_lock:
+        previous, _default_client = _default_client, client
+    return previous
@@ -0,0 +1,154 @@
+"""
+코인 검색 인덱스
+한글명 / 초성 (예: 'ㅂㅌ' → 비트코인) / 티커 / 영문명 검색 + 결과 순위
+"""
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_JUNGSUNG_JONGSUNG = 21 * 28
+
+# 순위 (작을수록 위)
+RANK_EXACT = 0
+RANK_NAME_PREFIX = 1
+RANK_TICKER_PREFIX = 2
+RANK_CHOSUNG_PREFIX = 3
+RANK_NAME_CONTAINS = 4
+RANK_OTHER_CONTAINS = 5
+
+
+def to_chosung(text):
+    """
+    한글 음절을 초성으로 변환 (한글이 아닌 문자는 그대로)
+
+    Example:
+        to_chosung('비트코인') → 'ㅂㅌㅋㅇ'
+    """
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            result.append(CHOSUNG[(code - _HANGUL_BASE) // _JUNGSUNG_JONGSUNG])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+def _has_chosung(text):
+    return any(ch in CHOSUNG for ch in text)
+
+
+def _mixed_find(query, name, chosung):
+    """
+    완성형 + 초성이 섞인 검색어 위치 (예: '비ㅌ' → '비트코인' 0)
+    초성 글자는 초성끼리, 나머지는 글자 그대로 비교
+    """
+    if all(ch in CHOSUNG for ch in query):
+        return chosung.find(query)
+
+    n = len(query)
+    for start in range(len(name) - n + 1):
+        for i, ch in enumerate(query):
+            target = chosung[start + i] if ch in CHOSUNG else name[start + i]
+            if ch != target:
+                break
+        else:
+            return start
+    return -1
+
+
+class CoinSearchIndex:
+    """
+    미리 계산된 검색 키로 코인 목록을 검색
+
+    직전 검색어를 이어서 입력하는 경우(예: 'ㅂ' → 'ㅂㅌ')는
+    직전 결과 안에서만 다시 검색함
+    """
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries (list): (표시 이름, 마켓코드, 영문명) 튜플 리스트
+        """
+        self.names = []
+        self._keys = []
+        for name, market, english in entries:
+            ticker = market.split('-')[-1] if market else ''
+            self.names.append(name)
+            self._keys.append((name.lower(), to_chosung(name), ticker.lower(), (english or '').lower()))
+
+        self.sorted_names = sorted(self.names)
+        self._last_query = ''
+        self._last_matches = None
+
+    @classmethod
+    def from_markets(cls, markets, catalog=None):
+        """
+        get_markets() 결과로 인덱스 생성
+
+        Args:
+            markets (dict): {한글명: 마켓코드}
+            catalog (MarketCatalog, optional): 영문명 조회용 카탈로그
+        """
+        entries = []
+        for name, code in markets.items():
+            item = catalog.get(code) if catalog is not None else None
+            entries.append((name, code, item.get('english_name', '') if item else ''))
+        return cls(entries)
+
+    def _rank(self, i, query, mixed):
+        name, chosung, ticker, english = self._keys[i]
+
+        if query == name or query == ticker or query == english:
+            return RANK_EXACT
+        if mixed:
+            pos = _mixed_find(query, name, chosung)
+            if pos == 0:
+                return RANK_CHOSUNG_PREFIX
+            return RANK_OTHER_CONTAINS if pos > 0 else None
+
+        if name.startswith(query):
+            return RANK_NAME_PREFIX
+        if ticker.startswith(query) or english.startswith(query):
+            return RANK_TICKER_PREFIX
+        if query in name:
+            return RANK_NAME_CONTAINS
+        if query in ticker or query in english:
+            return RANK_OTHER_CONTAINS
+        return None
+
+    def search(self, query, limit=None):
+        """
+        검색
+
+        Args:
+            query (str): 검색어
+            limit (int, optional): 최대 결과 수
+
+        Returns:
+            list: 순위순으로 정렬된 표시 이름 리스트
+        """
+        query = query.strip().lower()
+        if not query:
+            self._last_query, self._last_matches = '', None
+            return self.sorted_names[:limit] if limit else list(self.sorted_names)
+
+        # 이어서 입력한 검색어면 직전 결과만 다시 확인
+        if self._last_matches is not None and self._last_query and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self.names))
+
+        mixed = _has_chosung(query)
+        ranked = []
+        for i in candidates:
+            rank = self._rank(i, query, mixed)
+            if rank is not None:
+                ranked.append((rank, self.names[i], i))
+
+        ranked.sort()
+        self._last_query = query
+        self._last_matches = [i for _, _, i in ranked]
+
+        names = [name for _, name, _ in ranked]
+        return names[:limit] if limit else names
@@ -0,0 +1,86 @@
+"""
+API 키 캐시
+.env 파일을 매 요청마다 파싱하지 않고, 파일이 변경되었을 때만 다시 읽음
+dotenv 는 .env 를 처음 읽을 때 로드함 (import service 시점에는 불러오지 않음)
+"""
+import os
+import threading
+
+ENV_PATH = '.env'
+
+
+class CredentialProvider:
+    """
+    메모리에 API 키를 보관하고 .env 파일의 mtime/size가 바뀔 때만 재로드
+
+    .env 파일이 없거나 키가 비어 있으면 기존 환경 변수 값을 사용함
+    """
+
+    def __init__(self, path=ENV_PATH):
+        """
+        Args:
+            path (str): .env 파일 경로
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._keys = (None, None)
+        self._loaded = False
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self):
+        """
+        API 키 반환 (필요할 때만 재로드)
+
+        Returns:
+            tuple: (access_key, secret_key)
+        """
+        signature = self._stat_signature()
+        if self._loaded and signature == self._signature:
+            return self._keys
+        return self._load(signature)
+
+    def reload(self):
+        """
+        파일 변경 여부와 관계없이 즉시 다시 읽기
+
+        Returns:
+            tuple: (access_key, secret_key)
+        """
+        return self._load(self._stat_signature())
+
+    def _load(self, signature):
+        with self._lock:
+            values = {}
+            if signature is not None:
+                from dotenv import dotenv_values
+                values = dotenv_values(self.path)
+            for name in ('ACCESS_KEY', 'SECRET_KEY'):
+                if values.get(name):
+                    os.environ[name] = values[name]
+
+            self._keys = (os.getenv('ACCESS_KEY'), os.getenv('SECRET_KEY'))
+            self._signature = signature
+            self._loaded = True
+            return self._keys
+
+
+_default_provider = CredentialProvider()
+
+
+def get_provider():
+    """service.py 가 사용하는 기본 CredentialProvider 반환"""
+    return _default_provider
+
+
+def set_provider(provider):
+    """기본 CredentialProvider 교체 (이전 값 반환)"""
+    global _default_provider
+    previous, _default_provider = _default_provider, provider
+    return previous
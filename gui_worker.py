@@ -0,0 +1,106 @@
+"""
+GUI 백그라운드 작업 실행기
+네트워크 호출은 워커 스레드에서 실행하고, 결과는 큐를 통해 Tk 메인 스레드로 전달
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundWorker:
+    """
+    워커 스레드 풀 + 결과 큐
+
+    콜백(on_done / on_error)은 항상 메인 스레드(root.after 폴링)에서 호출되므로
+    위젯을 직접 수정해도 안전함
+    """
+
+    def __init__(self, root, max_workers=4, poll_interval=50, on_busy_changed=None):
+        """
+        Args:
+            root: Tk 루트 (after 메서드만 사용)
+            max_workers (int): 워커 스레드 수
+            poll_interval (int): 결과 큐 확인 주기 (ms)
+            on_busy_changed (callable): 진행 중 작업 수가 바뀔 때 호출 (count)
+        """
+        self.root = root
+        self.poll_interval = poll_interval
+        self.on_busy_changed = on_busy_changed
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gui-worker')
+        self._results = queue.Queue()
+        self._in_flight = set()
+        self._pending = 0
+        self._polling = False
+
+    @property
+    def pending(self):
+        """진행 중인 작업 수"""
+        return self._pending
+
+    def is_running(self, key):
+        return key in self._in_flight
+
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None):
+        """
+        작업 제출
+
+        Args:
+            fn (callable): 워커 스레드에서 실행할 함수
+            *args: fn 인자
+            on_done (callable): 성공 시 메인 스레드에서 호출 (result)
+            on_error (callable): 예외 시 메인 스레드에서 호출 (exception)
+            key (hashable): 같은 key의 작업이 진행 중이면 새로 제출하지 않음 (중복 클릭 방지)
+
+        Returns:
+            bool: 제출 여부 (중복이면 False)
+        """
+        if key is not None:
+            if key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+
+        self._pending += 1
+        self._notify()
+        self._executor.submit(self._run, fn, args, on_done, on_error, key)
+        self._schedule_poll()
+        return True
+
+    def _run(self, fn, args, on_done, on_error, key):
+        try:
+            self._results.put((on_done, fn(*args), key))
+        except Exception as e:
+            self._results.put((on_error, e, key))
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        finished = []
+        while True:
+            try:
+                finished.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+
+        for _, _, key in finished:
+            self._in_flight.discard(key)
+        self._pending -= len(finished)
+        if self._pending:
+            self._schedule_poll()
+        if finished:
+            self._notify()
+
+        # 콜백에서 예외가 나도 폴링은 이미 예약되어 있음
+        for callback, value, _ in finished:
+            if callback is not None:
+                callback(value)
+
+    def _notify(self):
+        if self.on_busy_changed is not None:
+            self.on_busy_changed(self._pending)
+
+    def shutdown(self):
+        """대기 중인 작업 취소 후 종료 (진행 중인 요청은 기다리지 않음)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,424 @@
+"""
+거래 기록 (SQLite WAL)
+주문 / 취소 요청 · 응답 · 지연 시간과 체결 내역을 trade_journal.db 에 남김
+
+기록 함수는 큐에 넣기만 하고 바로 반환함 - 디스크 쓰기는 백그라운드 스레드가 큐에 쌓인 만큼 한 트랜잭션으로 묶어서 처리
+체결 금액을 알 수 없는 시장가 주문의 재조회 (네트워크) 는 별도 조회 스레드에서 하므로 쓰기가 밀리지 않음
+꺼져 있으면 (기본값) 호출부에서 enabled 플래그만 확인하므로 오버헤드가 거의 없음
+
+켜기: journal.get_journal().enable()  또는  환경 변수 BITHUMB_JOURNAL=1
+리포트: python journal.py [--start 2026-10-01] [--end 2026-10-31] [--db trade_journal.db]
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+JOURNAL_PATH = 'trade_journal.db'
+
+# 한 트랜잭션에 묶는 최대 기록 수
+BATCH_SIZE = 500
+
+# 마켓 / 날짜 / 주문 UUID 조회용 인덱스
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    uuid TEXT,
+    market TEXT,
+    side TEXT,
+    ord_type TEXT,
+    price TEXT,
+    volume TEXT,
+    latency REAL,
+    error TEXT,
+    request TEXT,
+    response TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_uuid ON orders (uuid);
+CREATE INDEX IF NOT EXISTS orders_market_day ON orders (market, day);
+CREATE INDEX IF NOT EXISTS orders_day ON orders (day);
+
+CREATE TABLE IF NOT EXISTS fills (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    uuid TEXT,
+    market TEXT NOT NULL,
+    side TEXT NOT NULL,
+    volume REAL NOT NULL,
+    funds REAL NOT NULL,
+    fee REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fills_uuid ON fills (uuid);
+CREATE INDEX IF NOT EXISTS fills_market_day ON fills (market, day);
+CREATE INDEX IF NOT EXISTS fills_day ON fills (day);
+"""
+
+_STOP = object()
+
+
+def journal_day(ts):
+    """기록 시각 → 날짜 문자열 (KST, 'YYYY-MM-DD')"""
+    return time.strftime('%Y-%m-%d', time.gmtime(ts + 9 * 3600))
+
+
+def _error_text(response):
+    if not isinstance(response, dict) or 'error' not in response:
+        return None
+    error = response['error']
+    if isinstance(error, dict):
+        return error.get('message') or error.get('name')
+    return str(error)
+
+
+def order_funds(order):
+    """
+    주문 정보 → 체결 금액 (계산할 수 없으면 None)
+    체결 내역 (trades) 이 있으면 합계, 지정가는 체결 수량 x 주문 가격
+    """
+    trades = order.get('trades')
+    if trades:
+        return sum(float(t['funds']) for t in trades)
+    if order.get('ord_type') == 'limit' and order.get('price'):
+        return float(order.get('executed_volume') or 0) * float(order['price'])
+    return None
+
+
+class Journal:
+    """
+    거래 기록 저장소
+
+    사용 예:
+        journal = get_journal()
+        journal.enable()
+        get_tracker().add_listener(journal.on_order_event)
+        print(format_report(journal.report()))
+    """
+
+    def __init__(self, path=JOURNAL_PATH, enabled=False, fetch_order=None, batch_size=BATCH_SIZE):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            enabled (bool): 기록 여부
+            fetch_order (callable, optional): 체결 금액을 알 수 없는 주문 (시장가) 조회 함수
+                                             (기본값 service.get_order - 조회 스레드에서 호출)
+            batch_size (int): 한 트랜잭션에 묶는 최대 기록 수
+        """
+        self.path = path
+        self.enabled = enabled
+        self.fetch_order = fetch_order
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._lookups = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._lookup_thread = None
+        self._atexit_registered = False
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    # ==================== 기록 (큐에 넣고 바로 반환) ====================
+
+    def _start(self, attr, target, name):
+        thread = getattr(self, attr)
+        if thread is None or not thread.is_alive():
+            with self._lock:
+                thread = getattr(self, attr)
+                if thread is None or not thread.is_alive():
+                    thread = threading.Thread(target=target, name=name, daemon=True)
+                    setattr(self, attr, thread)
+                    thread.start()
+                    # close() 후 다시 기록해서 스레드를 새로 띄워도 종료 처리는 한 번만 등록
+                    if not self._atexit_registered:
+                        atexit.register(self.close)
+                        self._atexit_registered = True
+
+    def _put(self, item):
+        self._start('_thread', self._run, 'journal-writer')
+        self._queue.put(item)
+
+    def record_order(self, kind, request, response, latency=None):
+        """
+        주문 / 취소 요청 기록
+
+        Args:
+            kind (str): 'order' / 'cancel'
+            request (dict): 요청 바디 / 파라미터
+            response (dict): API 응답 (오류 응답 포함)
+            latency (float, optional): 요청 지연 시간 (초)
+        """
+        self._put(('order', time.time(), kind, dict(request),
+                   dict(response) if isinstance(response, dict) else response, latency))
+
+    def record_fill(self, uuid, market, side, volume, funds, fee=0.0, ts=None):
+        """체결 기록 (주문 하나의 체결 합계 또는 부분 체결)"""
+        self._put(('fill', ts or time.time(), uuid, market, side, float(volume), float(funds), float(fee or 0)))
+
+    def on_order_event(self, event):
+        """
+        OrderTracker 이벤트 수신용 - 체결이 끝난 주문 (done / 체결 후 cancel) 을 주문 단위로 기록
+        체결 금액을 알 수 없는 시장가 주문은 조회 스레드에서 주문을 다시 조회한 뒤 기록함
+        (이벤트를 보내는 스레드도, 쓰기 스레드도 네트워크 요청을 기다리지 않음)
+        """
+        if event['type'] not in ('done', 'cancel') or float(event.get('executed_volume') or 0) <= 0:
+            return
+        ts = time.time()
+        order = dict(event['order'])
+        fill = self._order_fill(ts, order)
+        if fill is not None:
+            self._put(fill)
+            return
+        self._start('_lookup_thread', self._run_lookups, 'journal-lookup')
+        self._lookups.put((ts, order))
+
+    # ==================== 조회 스레드 ====================
+
+    def _run_lookups(self):
+        while True:
+            item = self._lookups.get()
+            try:
+                if item is _STOP:
+                    break
+                fill = self._fetch_fill(*item)
+                if fill is not None:
+                    self._put(fill)
+            except Exception as e:
+                print(f"⚠️ 체결 내역 조회 실패: {e}")
+            finally:
+                self._lookups.task_done()
+
+    @staticmethod
+    def _order_fill(ts, order):
+        """주문 정보 → 체결 기록 ('fill', ...) - 체결 금액을 알 수 없으면 None"""
+        funds = order_funds(order)
+        if funds is None:
+            return None
+        return ('fill', ts, order['uuid'], order['market'], order['side'],
+                float(order.get('executed_volume') or 0), funds, float(order.get('paid_fee') or 0))
+
+    def _fetch_fill(self, ts, order):
+        fetch = self.fetch_order
+        if fetch is None:
+            from service import get_order as fetch
+        detail = fetch(order['uuid'])
+        if 'error' in detail:
+            return None
+        return self._order_fill(ts, detail)
+
+    # ==================== 쓰기 스레드 ====================
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    self._write(conn, [item for item in batch if item is not _STOP])
+                except Exception as e:
+                    print(f"⚠️ 거래 기록 저장 실패: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if any(item is _STOP for item in batch):
+                    break
+        finally:
+            conn.close()
+
+    def _write(self, conn, batch):
+        orders = []
+        fills = []
+        for item in batch:
+            if item[0] == 'order':
+                _, ts, kind, request, response, latency = item
+                body = response if isinstance(response, dict) else {}
+                orders.append((
+                    ts, journal_day(ts), kind,
+                    body.get('uuid') or request.get('uuid'),
+                    request.get('market') or body.get('market'),
+                    request.get('side') or body.get('side'),
+                    request.get('ord_type') or body.get('ord_type'),
+                    request.get('price'), request.get('volume'),
+                    latency, _error_text(response),
+                    json.dumps(request, ensure_ascii=False), json.dumps(response, ensure_ascii=False),
+                ))
+            else:
+                _, ts, uuid, market, side, volume, funds, fee = item
+                fills.append((ts, journal_day(ts), uuid, market, side, volume, funds, fee))
+
+        with conn:
+            if orders:
+                conn.executemany(
+                    'INSERT INTO orders (ts, day, kind, uuid, market, side, ord_type, price, volume, '
+                    'latency, error, request, response) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', orders)
+            if fills:
+                conn.executemany(
+                    'INSERT INTO fills (ts, day, uuid, market, side, volume, funds, fee) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', fills)
+
+    def flush(self):
+        """큐에 쌓인 기록을 모두 저장할 때까지 대기 (조회 중인 주문 포함)"""
+        if self._lookup_thread is not None and self._lookup_thread.is_alive():
+            self._lookups.join()
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """남은 조회 / 기록을 마치고 조회 · 쓰기 스레드 종료"""
+        for thread, pending in ((self._lookup_thread, self._lookups), (self._thread, self._queue)):
+            if thread is not None and thread.is_alive():
+                pending.put(_STOP)
+                thread.join()
+
+    # ==================== 조회 ====================
+
+    def _query(self, sql, args=()):
+        if not os.path.exists(self.path):
+            return []
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(sql, args)]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _where(market=None, day=None, uuid=None):
+        conditions, args = [], []
+        for column, value in (('market', market), ('day', day), ('uuid', uuid)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                args.append(value)
+        return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), args
+
+    def orders(self, market=None, day=None, uuid=None, limit=None):
+        """
+        주문 / 취소 기록 조회 (최신순)
+
+        Args:
+            market (str, optional): 마켓 ID
+            day (str, optional): 날짜 (KST, 'YYYY-MM-DD')
+            uuid (str, optional): 주문 UUID
+            limit (int, optional): 최대 개수
+        """
+        where, args = self._where(market, day, uuid)
+        sql = f'SELECT * FROM orders{where} ORDER BY ts DESC, id DESC'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return self._query(sql, args)
+
+    def fills(self, market=None, day=None, uuid=None):
+        """체결 기록 조회 (시간순)"""
+        where, args = self._where(market, day, uuid)
+        return self._query(f'SELECT * FROM fills{where} ORDER BY ts, id', args)
+
+    def report(self, start=None, end=None):
+        """
+        마켓별 거래대금 / 수수료 / 실현 손익 (이동평균 단가 기준)
+
+        기간 이전 체결도 평균 단가 계산에는 사용하고, 합계에는 기간 안 체결만 더함
+        큐에 남은 기록을 먼저 저장하므로 (flush) 방금 체결된 주문도 포함됨
+
+        Args:
+            start / end (str, optional): 날짜 범위 (KST, 'YYYY-MM-DD', 양끝 포함)
+
+        Returns:
+            dict: {마켓: {'buys', 'sells', 'volume', 'fees', 'realized', 'position', 'avg_price'}}
+        """
+        self.flush()
+        sql = 'SELECT day, market, side, volume, funds, fee FROM fills'
+        args = []
+        if end:
+            sql += ' WHERE day <= ?'
+            args.append(end)
+        rows = self._query(sql + ' ORDER BY market, ts, id', args)
+
+        report = {}
+        books = {}
+        for row in rows:
+            market = row['market']
+            position, cost = books.get(market, (0.0, 0.0))
+            volume, funds, fee = row['volume'], row['funds'], row['fee']
+            if row['side'] == 'bid':
+                position, cost, realized = position + volume, cost + funds + fee, 0.0
+            else:
+                matched = min(volume, position)
+                basis = cost / position * matched if position > 0 else 0.0
+                # 보유 기록이 없는 수량 (기록 이전에 산 코인) 은 손익에서 제외
+                realized = (funds - fee) * (matched / volume if volume else 0.0) - basis
+                position, cost = position - matched, cost - basis
+            books[market] = (position, cost)
+
+            if start and row['day'] < start:
+                continue
+            summary = report.setdefault(market, {'buys': 0, 'sells': 0, 'volume': 0.0, 'fees': 0.0,
+                                                 'realized': 0.0})
+            summary['buys' if row['side'] == 'bid' else 'sells'] += 1
+            summary['volume'] += funds
+            summary['fees'] += fee
+            summary['realized'] += realized
+
+        for market, summary in report.items():
+            position, cost = books[market]
+            summary['position'] = position
+            summary['avg_price'] = cost / position if position > 0 else 0.0
+        return report
+
+
+def format_report(report):
+    """마켓별 리포트 요약 문자열 (CLI 출력용)"""
+    if not report:
+        return "📒 기록된 체결 없음"
+    lines = [f"{'마켓':10}{'매수':>6}{'매도':>6}{'거래대금':>16}{'수수료':>12}{'실현 손익':>14}{'보유 수량':>16}"]
+    for market, s in sorted(report.items()):
+        lines.append(f"{market:10}{s['buys']:6}{s['sells']:6}{s['volume']:16,.0f}{s['fees']:12,.0f}"
+                     f"{s['realized']:+14,.0f}{s['position']:16.8f}")
+    total = {key: sum(s[key] for s in report.values()) for key in ('volume', 'fees', 'realized')}
+    lines.append(f"합계: 거래대금 {total['volume']:,.0f}원, 수수료 {total['fees']:,.0f}원, "
+                 f"실현 손익 {total['realized']:+,.0f}원")
+    return '\n'.join(lines)
+
+
+_default_journal = Journal(enabled=os.getenv('BITHUMB_JOURNAL', '') not in ('', '0'))
+
+
+def get_journal():
+    """기본 거래 기록 저장소"""
+    return _default_journal
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="거래 기록 리포트 (마켓별 거래대금 / 실현 손익)")
+    parser.add_argument('--start', help="시작 날짜 (KST, 예: 2026-10-01)")
+    parser.add_argument('--end', help="끝 날짜 (KST)")
+    parser.add_argument('--db', default=JOURNAL_PATH, help="기록 파일")
+    args = parser.parse_args()
+
+    print(format_report(Journal(args.db).report(args.start, args.end)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+지정가 분할 주문 (사다리 / 그리드)
+가격 구간을 N 단계로 나눠 호가 단위에 맞추고 (NumPy 벡터 연산), 최소 주문 금액을 채우는 수량으로
+주문 목록을 만든 뒤 asyncio 클라이언트로 한꺼번에 전송함
+"""
+import asyncio
+
+import numpy as np
+
+from async_client import AsyncBithumbClient, run_with_client
+from service import MIN_ORDER_AMOUNT
+
+# 빗썸 KRW 마켓 호가 단위: (가격 하한, 호가 단위)
+KRW_TICK_BANDS = (
+    (0, 0.0001),
+    (1, 0.001),
+    (10, 0.01),
+    (100, 0.1),
+    (1000, 1),
+    (5000, 5),
+    (10000, 10),
+    (50000, 50),
+    (100000, 100),
+    (500000, 500),
+    (1000000, 1000),
+)
+_BAND_FLOORS = np.array([floor for floor, _ in KRW_TICK_BANDS], dtype=np.float64)
+_BAND_TICKS = np.array([tick for _, tick in KRW_TICK_BANDS], dtype=np.float64)
+
+# 수량 소수점 자리수
+VOLUME_DECIMALS = 8
+
+
+def tick_size(prices):
+    """
+    가격별 호가 단위
+
+    Args:
+        prices (array-like): 가격 배열
+
+    Returns:
+        np.ndarray: 호가 단위 배열
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    return _BAND_TICKS[np.searchsorted(_BAND_FLOORS, prices, side='right') - 1]
+
+
+def snap_prices(prices, side):
+    """
+    가격을 호가 단위에 맞춤 - 매수는 내림, 매도는 올림 (원래 가격보다 불리해지지 않게)
+
+    Args:
+        prices (array-like): 가격 배열
+        side (str): 'bid' / 'ask'
+
+    Returns:
+        np.ndarray: 호가 단위로 맞춘 가격 배열
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    ticks = tick_size(prices)
+    # 부동소수점 오차 (예: 0.3 / 0.1 = 2.9999...) 를 먼저 정리한 뒤 내림 / 올림
+    steps = np.round(prices / ticks, 6)
+    steps = np.floor(steps) if side == 'bid' else np.ceil(steps)
+    snapped = steps * ticks
+    # 올림 / 내림으로 구간 경계를 넘으면 새 구간의 호가 단위로 한 번 더 맞춤
+    ticks = tick_size(snapped)
+    steps = np.round(snapped / ticks, 6)
+    steps = np.floor(steps) if side == 'bid' else np.ceil(steps)
+    return np.round(steps * ticks, 4)
+
+
+def ladder_prices(low, high, levels, spacing='linear'):
+    """
+    구간 [low, high] 를 levels 단계로 나눈 가격 배열
+
+    Args:
+        spacing (str): 'linear' (등간격) / 'geometric' (등비)
+    """
+    if levels < 1 or low <= 0 or high < low:
+        raise ValueError("가격 구간 / 단계 수가 올바르지 않습니다.")
+    if spacing == 'geometric':
+        return np.geomspace(low, high, levels)
+    return np.linspace(low, high, levels)
+
+
+def size_volumes(prices, amount=None, volume=None, min_amount=MIN_ORDER_AMOUNT):
+    """
+    단계별 주문 수량 - 주문 금액이 최소 주문 금액 이상이 되도록 올림
+
+    Args:
+        prices (np.ndarray): 단계별 가격
+        amount (float, optional): 단계별 주문 금액 (KRW)
+        volume (float, optional): 단계별 주문 수량 (amount 대신)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    scale = 10 ** VOLUME_DECIMALS
+    if volume is not None:
+        volumes = np.full(prices.shape, float(volume))
+    elif amount is not None:
+        volumes = float(amount) / prices
+    else:
+        raise ValueError("amount 또는 volume 중 하나는 지정해야 합니다.")
+    minimum = np.ceil(min_amount / prices * scale) / scale
+    return np.maximum(np.floor(np.round(volumes * scale, 2)) / scale, minimum)
+
+
+def _price_strings(prices):
+    decimals = np.maximum(0, -np.floor(np.log10(tick_size(prices)))).astype(int)
+    return [f'{p:.{d}f}' for p, d in zip(prices.tolist(), decimals.tolist())]
+
+
+def build_ladder(market, side, low, high, levels, amount=None, volume=None, spacing='linear'):
+    """
+    한쪽 방향 사다리 주문 목록
+
+    Args:
+        market (str): 마켓 ID (예: 'KRW-XRP')
+        side (str): 'bid' / 'ask'
+        low (float): 최저 가격
+        high (float): 최고 가격
+        levels (int): 단계 수 (호가 단위에 맞춘 뒤 겹치는 가격은 하나로 합침)
+        amount (float, optional): 단계별 주문 금액 (KRW)
+        volume (float, optional): 단계별 주문 수량
+        spacing (str): 'linear' / 'geometric'
+
+    Returns:
+        list: [{'market', 'side', 'price', 'volume'}, ...] - price / volume 은 주문에 그대로 쓰는 문자열
+    """
+    prices = np.unique(snap_prices(ladder_prices(low, high, levels, spacing), side))
+    prices = prices[prices > 0]
+    volumes = size_volumes(prices, amount, volume)
+    if side == 'bid':
+        prices, volumes = prices[::-1], volumes[::-1]  # 현재가에 가까운 주문부터
+
+    return [
+        {'market': market, 'side': side, 'price': price, 'volume': f'{vol:.{VOLUME_DECIMALS}f}'}
+        for price, vol in zip(_price_strings(prices), volumes.tolist())
+    ]
+
+
+def build_grid(market, center, width, levels, amount=None, volume=None, spacing='linear'):
+    """
+    현재가 기준 양방향 그리드 (아래쪽 매수 + 위쪽 매도)
+
+    Args:
+        center (float): 기준 가격 (보통 현재가)
+        width (float): 기준 가격 대비 위아래 폭 (비율, 예: 0.05 = ±5%)
+        levels (int): 한쪽 단계 수
+
+    Returns:
+        list: build_ladder 형식 주문 목록 (매수 → 매도 순)
+    """
+    tick = float(tick_size([center])[0])
+    bids = build_ladder(market, 'bid', center * (1 - width), center - tick, levels, amount, volume, spacing)
+    asks = build_ladder(market, 'ask', center + tick, center * (1 + width), levels, amount, volume, spacing)
+    return bids + asks
+
+
+def ladder_total(orders):
+    """주문 목록의 총 주문 금액 (KRW)"""
+    return sum(float(o['price']) * float(o['volume']) for o in orders)
+
+
+async def submit_orders_async(orders, client=None):
+    """
+    주문 목록 동시 전송
+
+    Args:
+        orders (list): build_ladder / build_grid 결과
+        client (AsyncBithumbClient, optional): 없으면 새로 만들고 끝나면 닫음
+
+    Returns:
+        list: 주문 순서대로 API 응답 (실패한 주문은 {'error': ...})
+    """
+    owned = client is None
+    client = client or AsyncBithumbClient()
+    try:
+        return await asyncio.gather(*(
+            client.limit_order(o['market'], o['side'], o['volume'], o['price']) for o in orders
+        ))
+    finally:
+        if owned:
+            await client.close()
+
+
+def submit_orders(orders, base_url=None):
+    """
+    주문 목록 동시 전송 (동기 호출용 - 워커 스레드 / CLI)
+
+    Args:
+        orders (list): build_ladder / build_grid 결과
+        base_url (str, optional): API 서버 주소 (없으면 기본 클라이언트와 같은 서버)
+
+    Returns:
+        list: 주문 순서대로 API 응답
+    """
+    return run_with_client(lambda client: submit_orders_async(orders, client),
+                           base_url, pool_size=16, concurrency=16)
@@ -1,16 +1,35 @@
 """
 빗썸 거래소 자동 매매 프로그램
+
+시작 시간 측정: python main.py --profile-startup (첫 화면 → 마켓 목록 → 첫 시세까지 측정 후 종료)
+스크립트용 명령: python main.py quote|balance|buy|sell|limit|batch ... (cli.py, 결과는 JSON)
 """
+import sys
+
+# --profile-startup 이면 이후 import 부터 측정 (다른 모듈보다 먼저 실행)
+import startup_profile
+startup_profile.start()
+
 import os
+from client import prewarm
 from service import (
     get_markets, 
     market_order, 
     limit_order, 
     get_current_price, 
-    get_my_balance
+    get_api_keys,
+    reload_api_keys,
+    MIN_ORDER_AMOUNT
 )
+from orderbook import fetch_orderbook, format_fill
+from metrics import get_metrics
+from order_tracker import get_tracker
+from balance_store import get_balance_store
+from journal import get_journal, format_report as format_journal
 from pprint import pprint
 
+# 자동 왕복 거래 / 보유 자산 평가 / 사다리 / 일괄 취소는 numpy, aiohttp 를 쓰므로 메뉴를 고를 때 import
+
 
 def setup_api_keys():
     """
@@ -41,6 +60,7 @@ SECRET_KEY={secret_key}
     try:
         with open('.env', 'w', encoding='utf-8') as f:
             f.write(env_content)
+        reload_api_keys()
         
         print("\n✅ API 키가 성공적으로 저장되었습니다!")
         print("💾 저장 위치: .env 파일\n")
@@ -63,11 +83,7 @@ def check_api_keys():
         return setup_api_keys()
     
     # 환경 변수 로드
-    from dotenv import load_dotenv
-    load_dotenv(override=True)
-    
-    access_key = os.getenv("ACCESS_KEY")
-    secret_key = os.getenv("SECRET_KEY")
+    access_key, secret_key = get_api_keys()
     
     # API 키 유효성 확인
     if not access_key or not secret_key:
@@ -80,11 +96,170 @@ def check_api_keys():
     return True
 
 
-def main():
-    """메인 실행 함수"""
+def print_expected_fill(market_code, ticker, side, amount=None, volume=None):
+    """
+    호가 기준 시장가 주문 예상 체결 출력
+    """
+    book = fetch_orderbook(market_code)
+    fill = book.estimate_fill(side, amount=amount, volume=volume) if book else None
+    print(f"📈 {format_fill(fill, ticker)}")
+
+
+def wait_for_order(result):
+    """
+    주문 체결 / 취소까지 대기하며 체결 알림 출력 (Ctrl+C 로 대기만 중단)
+    """
+    tracker = get_tracker()
+    
+    def on_event(event):
+        if event['uuid'] != result['uuid']:
+            return
+        if event['type'] == 'fill':
+            print(f"🔔 체결 {event['filled']:g} (누적 {event['executed_volume']})")
+        elif event['type'] == 'cancel':
+            print("⚠️ 주문이 취소되었습니다.")
+    
+    tracker.add_listener(on_event)
+    try:
+        print("⏳ 체결 대기 중... (Ctrl+C: 대기 중단, 주문은 유지됨)")
+        order = tracker.wait(tracker.track(result))
+        if order and order['status'] == 'done':
+            print("✅ 주문이 모두 체결되었습니다.")
+    except KeyboardInterrupt:
+        print("\n대기를 중단했습니다. 주문은 거래소에 남아 있습니다.")
+    finally:
+        tracker.remove_listener(on_event)
+
+
+def run_ladder(market_name, market_code, ticker):
+    """
+    가격 구간을 나눠 지정가 주문 여러 개를 한꺼번에 전송 (ladder.py)
+    """
+    from ladder import build_ladder, ladder_total, submit_orders
+    
+    side_choice = input("\n1. 매수 사다리  2. 매도 사다리 (1/2): ").strip()
+    side = 'bid' if side_choice == '1' else 'ask' if side_choice == '2' else None
+    if not side:
+        print("❌ 잘못된 선택입니다.")
+        return
+    
+    low = float(input("최저 가격을 입력하세요 (원): "))
+    high = float(input("최고 가격을 입력하세요 (원): "))
+    levels = int(input("주문 개수를 입력하세요: "))
+    amount = float(input("주문 1개당 금액을 입력하세요 (원): "))
+    
+    try:
+        orders = build_ladder(market_code, side, low, high, levels, amount=amount)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    
+    side_str = "매수" if side == 'bid' else "매도"
+    print(f"\n💰 {market_name} {side_str} {len(orders)}건: {orders[0]['price']}원 ~ {orders[-1]['price']}원")
+    print(f"💰 총 금액: {ladder_total(orders):,.0f}원 (호가 단위 / 최소 주문 금액 {MIN_ORDER_AMOUNT:,}원 반영)")
+    
+    confirm = input("주문을 실행하시겠습니까? (y/n): ").strip().lower()
+    if confirm != 'y':
+        return
+    
+    results = submit_orders(orders)
+    tracker = get_tracker()
+    for order, result in zip(orders, results):
+        if tracker.track(result):
+            print(f"✅ {order['price']}원 x {order['volume']} {ticker}")
+        else:
+            print(f"❌ {order['price']}원 x {order['volume']} {ticker}: {result.get('error')}")
+    print(f"\n📋 {sum(1 for r in results if r.get('uuid'))}/{len(orders)}건 주문 완료")
+
+
+def run_cancel(market_name, market_code):
+    """
+    마켓의 미체결 주문 전체 취소 (order_cancel.py)
+    """
+    from order_cancel import cancel_market, format_outcomes
+    
+    side_choice = input("\n1. 매수 주문만  2. 매도 주문만  3. 전체 (1/2/3): ").strip()
+    side = {'1': 'bid', '2': 'ask', '3': None}.get(side_choice, '')
+    if side == '':
+        print("❌ 잘못된 선택입니다.")
+        return
+    
+    confirm = input(f"{market_name} 미체결 주문을 취소하시겠습니까? (y/n): ").strip().lower()
+    if confirm != 'y':
+        return
+    
+    outcomes = cancel_market(market_code, side)
+    if not outcomes:
+        print("📋 취소할 미체결 주문이 없습니다.")
+        return
+    print(f"\n📋 주문 취소 결과\n{format_outcomes(outcomes)}")
+
+
+def run_volume_cycles(market_name, market_code):
+    """
+    목표 거래대금까지 시장가 왕복 거래 반복 (volume_engine.py)
+    """
+    from volume_engine import VolumeEngine, format_report
+    
+    target = float(input("\n목표 거래대금을 입력하세요 (원): "))
+    cycle_amount = float(input("1회 매수 금액을 입력하세요 (원): "))
+    max_loss = float(input("손실 한도를 입력하세요 (원): "))
+    
+    print(f"\n💰 {market_name} {cycle_amount:,.0f}원씩 매수 → 전량 매도, 목표 {target:,.0f}원 / 손실 한도 {max_loss:,.0f}원")
+    confirm = input("자동 거래를 시작하시겠습니까? (y/n): ").strip().lower()
+    if confirm != 'y':
+        return
+    
+    def on_cycle(cycle, report):
+        print(f"[{cycle['cycle']:4d}] 매수 {cycle['buy_price']:,.2f} → 매도 {cycle['sell_price']:,.2f} "
+              f"| 누적 {report['volume']:,.0f}원 ({report['progress'] * 100:.1f}%) | 손익 {report['pnl']:+,.0f}원")
+    
+    try:
+        engine = VolumeEngine(market_code, target, cycle_amount, max_loss=max_loss, on_cycle=on_cycle)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    
+    try:
+        report = engine.run()
+    except KeyboardInterrupt:
+        engine.stop_reason = 'interrupted'
+        report = engine.report()
+    
+    print("\n📋 왕복 거래 결과:")
+    print(format_report(report))
+
+
+def print_banner():
     print("=" * 60)
     print("빗썸 자동 거래 프로그램")
     print("=" * 60)
+
+
+def profile_startup():
+    """
+    --profile-startup: 첫 화면 → API 키 → 마켓 목록 → 첫 시세 까지 측정 (입력 없이 실행 후 종료)
+    """
+    prewarm()
+    print_banner()
+    startup_profile.mark('first paint')
+    
+    get_api_keys()
+    startup_profile.mark('api keys')
+    markets = get_markets('KRW')
+    startup_profile.mark('markets')
+    price = get_current_price('KRW-BTC')
+    startup_profile.mark('first quote')
+    
+    print(f"\n✅ 총 {len(markets)}개 코인, 비트코인 현재가: {price:,.0f}원" if price else "\n❌ 현재가 조회 실패")
+    startup_profile.finish()
+
+
+def main():
+    """메인 실행 함수"""
+    # 화면 출력 / API 키 확인과 겹쳐서 requests 로드 + 커넥션 연결
+    prewarm()
+    print_banner()
     
     # API 키 확인
     if not check_api_keys():
@@ -93,17 +268,35 @@ def main():
         return
     
     # 마켓 정보 로드
-    markets = get_markets()
+    markets = get_markets('KRW')
     if not markets:
         print("❌ 마켓 정보를 불러오는데 실패했습니다.")
         return
     
     print(f"\n✅ 총 {len(markets)}개 코인 거래 가능")
     
-    # 코인 선택
-    market_name = input("\n코인 이름을 입력하세요 (예: 비트코인): ").strip()
+    # 주문 / 체결 기록 (trade_journal.db)
+    journal = get_journal()
+    journal.enable()
+    get_tracker().add_listener(journal.on_order_event)
+    
+    # 코인 선택 ('잔고' 입력 시 보유 자산 평가, '기록' 입력 시 거래 기록 리포트 후 다시 입력)
+    market_name = input("\n코인 이름을 입력하세요 (예: 비트코인, 보유 자산 평가: 잔고, 거래 기록: 기록): ").strip()
+    while market_name in ('잔고', '기록'):
+        if market_name == '잔고':
+            from portfolio import value_portfolio, format_portfolio
+            print("\n📊 보유 자산 평가")
+            print(format_portfolio(value_portfolio(max_age=0)))
+        else:
+            print("\n📒 거래 기록")
+            print(format_journal(journal.report()))
+        market_name = input("\n코인 이름을 입력하세요 (예: 비트코인): ").strip()
     
     if market_name not in markets:
+        duplicates = [name for name in markets if name.startswith(f'{market_name} (')]
+        if duplicates:
+            print(f"❌ '{market_name}' 이름의 마켓이 여러 개입니다: {', '.join(duplicates)}")
+            return
         print(f"❌ '{market_name}'은(는) 거래 가능한 코인이 아닙니다.")
         print(f"💡 사용 가능한 코인 리스트: {', '.join(list(markets.keys())[:10])}...")
         return
@@ -125,8 +318,21 @@ def main():
     print("=" * 60)
     print("1. 매수 (bid)")
     print("2. 매도 (ask)")
+    print("3. 자동 왕복 거래 (시장가 매수 → 전량 매도 반복)")
+    print("4. 지정가 분할 주문 (사다리)")
+    print("5. 미체결 주문 취소")
+    
+    side_choice = input("\n선택 (1/2/3/4/5): ").strip()
+    if side_choice == '3':
+        run_volume_cycles(market_name, market_code)
+        return
+    if side_choice == '4':
+        run_ladder(market_name, market_code, ticker)
+        return
+    if side_choice == '5':
+        run_cancel(market_name, market_code)
+        return
     
-    side_choice = input("\n선택 (1/2): ").strip()
     side = 'bid' if side_choice == '1' else 'ask' if side_choice == '2' else None
     
     if not side:
@@ -151,6 +357,7 @@ def main():
         
         price = float(input("\n매수할 금액을 입력하세요 (원): "))
         print(f"\n💰 주문 정보: {market_name} {price:,.0f}원 시장가 매수")
+        print_expected_fill(market_code, ticker, side, amount=price)
         
         confirm = input("주문을 실행하시겠습니까? (y/n): ").strip().lower()
         if confirm == 'y':
@@ -164,21 +371,16 @@ def main():
             print("❌ 시장가 매도는 매도(ask)만 가능합니다.")
             return
         
-        # 잔고 조회
-        balances = get_my_balance()
-        volume = 0
-        
-        for asset in balances:
-            if asset.get('currency') == ticker:
-                volume = float(asset.get('balance', 0))
-                break
+        # 잔고 조회 (최근에 조회했으면 캐시 사용)
+        volume = get_balance_store().available(ticker)
         
         if volume == 0:
             print(f"❌ 보유한 {market_name}이(가) 없습니다.")
             return
         
         print(f"\n💰 보유 수량: {volume} {ticker}")
-        print(f"💰 예상 금액: {volume * current_price:,.0f}원")
+        print(f"💰 예상 금액: {float(volume) * current_price:,.0f}원")
+        print_expected_fill(market_code, ticker, side, volume=float(volume))
         
         confirm = input("전액 매도하시겠습니까? (y/n): ").strip().lower()
         if confirm == 'y':
@@ -203,6 +405,9 @@ def main():
             result = limit_order(market_code, side, volume, price)
             print("\n📋 주문 결과:")
             pprint(result)
+            
+            if result.get('uuid') and input("\n체결될 때까지 기다리시겠습니까? (y/n): ").strip().lower() == 'y':
+                wait_for_order(result)
     
     else:
         print("❌ 잘못된 선택입니다.")
@@ -214,9 +419,23 @@ def main():
 
 
 if __name__ == "__main__":
+    if startup_profile.get_profiler():
+        profile_startup()
+        sys.exit()
+    
+    # 인자가 있으면 대화형 메뉴 대신 스크립트용 명령 실행 (python main.py quote BTC, batch orders.txt 등)
+    if len(sys.argv) > 1:
+        import cli
+        sys.exit(cli.main(sys.argv[1:]))
+    
     try:
         main()
     except KeyboardInterrupt:
         print("\n\n프로그램을 종료합니다.")
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
+    finally:
+        # BITHUMB_METRICS=1 로 실행하면 API 호출 통계 출력
+        if get_metrics().enabled:
+            print("\n" + get_metrics().summary())
+        get_journal().close()
@@ -1,21 +1,45 @@
 """
 빗썸 거래 프로그램 - GUI 버전
+
+시작 시간 측정: python main_gui.py --profile-startup (첫 화면 → 마켓 목록 → 첫 시세까지 측정 후 종료)
 """
+# --profile-startup 이면 이후 import 부터 측정 (다른 모듈보다 먼저 실행)
+import startup_profile
+startup_profile.start()
+
 import os
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+from client import prewarm
 from service import (
     get_markets, 
     market_order, 
     limit_order, 
     get_current_price, 
-    get_my_balance
+    get_api_keys,
+    reload_api_keys
 )
+from gui_worker import BackgroundWorker
+from coin_search import CoinSearchIndex
+from market_catalog import get_catalog
+from market_stream import MarketStream, get_price_cache
+from orderbook import fetch_orderbook, format_fill
+from metrics import get_metrics
+from order_tracker import get_tracker
+from journal import get_journal, format_report as format_journal
+from balance_store import get_balance_store
 import json
 
+SEARCH_DEBOUNCE_MS = 120
+LIVE_PRICE_INTERVAL_MS = 500
+ORDER_EVENT_INTERVAL_MS = 500
+
 
 class TradingGUI:
     def __init__(self, root):
+        # 창을 그리는 동안 requests 로드 + 커넥션 연결
+        prewarm()
         self.root = root
         self.root.title("빗썸 쌀먹 프로그램")
         self.root.geometry("600x750")
@@ -27,19 +51,37 @@ class TradingGUI:
         
         self.markets = {}
         self.all_coins = []
+        self.search_index = CoinSearchIndex([])
+        self.shown_coins = []
+        self.search_after_id = None
+        self.selected_market = None
+        get_metrics().enable()  # '통계' 버튼용 API 호출 계측
+        get_journal().enable()  # 주문 / 체결 기록 (trade_journal.db)
         self.create_widgets()
+        
+        # 네트워크 요청은 워커 스레드에서 실행 (UI 멈춤 방지)
+        self.worker = BackgroundWorker(self.root, on_busy_changed=self.on_busy_changed)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.load_markets()
+        
+        # 선택한 코인의 실시간 시세 (WebSocket)
+        self.stream = MarketStream(channels=('ticker',)).start()
+        self.root.after(LIVE_PRICE_INTERVAL_MS, self.refresh_live_price)
+        
+        # 제출한 주문의 체결 알림 (조회 스레드 → 큐 → 메인 스레드)
+        self.order_events = queue.Queue()
+        self.tracker = get_tracker().start()
+        self.tracker.add_listener(self.order_events.put)
+        self.tracker.add_listener(get_balance_store().on_order_event)
+        self.tracker.add_listener(get_journal().on_order_event)
+        self.root.after(ORDER_EVENT_INTERVAL_MS, self.show_order_events)
     
     def check_api_keys(self):
         """API 키 확인"""
         if not os.path.exists('.env'):
             return False
         
-        from dotenv import load_dotenv
-        load_dotenv(override=True)
-        
-        access_key = os.getenv("ACCESS_KEY")
-        secret_key = os.getenv("SECRET_KEY")
+        access_key, secret_key = get_api_keys()
         
         return bool(access_key and secret_key)
     
@@ -75,8 +117,7 @@ class TradingGUI:
                     f.write(f"SECRET_KEY={secret_key}\n")
                 
                 # 환경 변수 즉시 재로드
-                from dotenv import load_dotenv
-                load_dotenv(override=True)
+                reload_api_keys()
                 
                 messagebox.showinfo("성공", "API 키가 저장되었습니다.\n프로그램 재시작 없이 바로 사용 가능합니다.")
                 dialog.destroy()
@@ -170,6 +211,14 @@ class TradingGUI:
                  bg='#2196F3', fg='white', font=('', 12, 'bold'), 
                  padx=30, pady=10).pack(side='left', padx=5)
         
+        tk.Button(button_frame, text="통계", command=self.show_stats, 
+                 bg='#607D8B', fg='white', font=('', 12, 'bold'), 
+                 padx=20, pady=10).pack(side='left', padx=5)
+        
+        # 진행 중인 요청 표시
+        self.status_label = tk.Label(main_frame, text="", font=('', 9), fg='#757575')
+        self.status_label.grid(row=10, column=1, columnspan=2, sticky='e')
+        
         # 결과 표시
         tk.Label(main_frame, text="결과", font=('', 11, 'bold')).grid(row=9, column=0, sticky='nw', pady=5)
         self.result_text = scrolledtext.ScrolledText(main_frame, height=8, width=50, font=('Consolas', 9))
@@ -202,35 +251,64 @@ class TradingGUI:
     def load_markets(self):
         """마켓 정보 로드"""
         self.log("마켓 정보 로딩중...")
-        try:
-            self.markets = get_markets()
-            if self.markets:
-                self.all_coins = sorted(list(self.markets.keys()))
-                self.update_coin_list(self.all_coins)
-                self.log(f"총 {len(self.markets)}개 코인 로드 완료")
-            else:
-                self.log("마켓 정보 로드 실패")
-        except Exception as e:
-            self.log(f"오류: {e}")
+        self.worker.submit(self.build_market_index, key='markets',
+                           on_done=self.on_markets_loaded,
+                           on_error=lambda e: self.log(f"오류: {e}"))
     
-    def on_search_changed(self, *args):
-        """검색어 변경 시 리스트 업데이트"""
-        search_term = self.search_var.get().lower()
-        
-        if not search_term:
-            # 검색어가 없으면 전체 표시
-            filtered = self.all_coins
+    @staticmethod
+    def build_market_index():
+        """마켓 목록 + 검색 인덱스 생성 (워커 스레드)"""
+        markets = get_markets('KRW')  # 원화 주문 화면이므로 KRW 마켓만
+        return markets, CoinSearchIndex.from_markets(markets, get_catalog())
+    
+    def on_markets_loaded(self, loaded):
+        """마켓 정보 로드 완료 (메인 스레드)"""
+        self.markets, self.search_index = loaded
+        if self.markets:
+            self.all_coins = self.search_index.sorted_names
+            self.apply_search()
+            self.log(f"총 {len(self.markets)}개 코인 로드 완료")
         else:
-            # 검색어로 필터링
-            filtered = [coin for coin in self.all_coins if search_term in coin.lower()]
+            self.log("마켓 정보 로드 실패")
         
-        self.update_coin_list(filtered)
+        startup_profile.mark('markets')
+        if startup_profile.get_profiler():
+            self.worker.submit(get_current_price, 'KRW-BTC', key='profile',
+                               on_done=self.on_profile_quote,
+                               on_error=lambda e: self.on_profile_quote(None))
+    
+    def on_profile_quote(self, price):
+        """--profile-startup: 첫 시세까지 측정하고 종료"""
+        startup_profile.mark('first quote')
+        print(f"비트코인 현재가: {price:,.0f}원" if price else "현재가 조회 실패")
+        startup_profile.finish()
+        self.on_close()
+    
+    def on_search_changed(self, *args):
+        """검색어 변경 시 리스트 업데이트 (입력이 멈춘 뒤 한 번만 검색)"""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+    
+    def apply_search(self):
+        """검색 실행 - 한글명 / 초성 / 티커 / 영문명"""
+        self.search_after_id = None
+        self.update_coin_list(self.search_index.search(self.search_var.get()))
     
     def update_coin_list(self, coins):
-        """코인 리스트 업데이트"""
-        self.coin_listbox.delete(0, tk.END)
-        for coin in coins:
-            self.coin_listbox.insert(tk.END, coin)
+        """코인 리스트 업데이트 (바뀐 부분만 다시 그림)"""
+        # 앞부분이 같은 항목은 그대로 두고 나머지만 교체
+        common = 0
+        for old, new in zip(self.shown_coins, coins):
+            if old != new:
+                break
+            common += 1
+        
+        if common < len(self.shown_coins):
+            self.coin_listbox.delete(common, tk.END)
+        if common < len(coins):
+            self.coin_listbox.insert(tk.END, *coins[common:])
+        self.shown_coins = list(coins)
     
     def on_coin_selected(self, event):
         """코인 선택 시 현재가 조회"""
@@ -243,15 +321,47 @@ class TradingGUI:
             return
         
         market_code = self.markets[coin_name]
-        try:
-            current_price = get_current_price(market_code)
-            if current_price:
+        self.selected_market = market_code
+        self.stream.subscribe([market_code])
+        self.price_label.config(text="조회중...")
+        self.worker.submit(get_current_price, market_code, key=('price', market_code),
+                           on_done=lambda price: self.on_price_loaded(coin_name, market_code, price),
+                           on_error=lambda e: self.log(f"현재가 조회 오류: {e}"))
+    
+    def on_price_loaded(self, coin_name, market_code, current_price):
+        """현재가 조회 완료 (메인 스레드)"""
+        # 응답이 오기 전에 다른 코인을 선택했으면 가격 표시는 건너뜀
+        is_selected = market_code == self.selected_market
+        if current_price:
+            if is_selected:
                 self.price_label.config(text=f"{current_price:,.0f}원")
-                self.log(f"{coin_name} 선택: {current_price:,.0f}원")
-            else:
-                self.price_label.config(text="조회 실패")
-        except Exception as e:
-            self.log(f"현재가 조회 오류: {e}")
+            self.log(f"{coin_name} 선택: {current_price:,.0f}원")
+        elif is_selected:
+            self.price_label.config(text="조회 실패")
+    
+    def refresh_live_price(self):
+        """WebSocket 시세 캐시로 현재가 표시 갱신"""
+        if self.selected_market:
+            ticker = get_price_cache().get('ticker', self.selected_market)
+            if ticker:
+                self.price_label.config(text=f"{ticker['trade_price']:,.0f}원")
+        self.root.after(LIVE_PRICE_INTERVAL_MS, self.refresh_live_price)
+    
+    def show_order_events(self):
+        """주문 체결 / 취소 이벤트를 결과창에 표시"""
+        while True:
+            try:
+                event = self.order_events.get_nowait()
+            except queue.Empty:
+                break
+            side_str = "매수" if event['side'] == 'bid' else "매도"
+            if event['type'] == 'fill':
+                self.log(f"🔔 {event['market']} {side_str} 체결 {event['filled']:g} (누적 {event['executed_volume']})")
+            elif event['type'] == 'done':
+                self.log(f"✅ {event['market']} {side_str} 주문 체결 완료")
+            elif event['type'] == 'cancel':
+                self.log(f"⚠️ {event['market']} {side_str} 주문 취소됨 (체결 {event['executed_volume']})")
+        self.root.after(ORDER_EVENT_INTERVAL_MS, self.show_order_events)
     
     def place_order(self):
         """주문 실행"""
@@ -269,59 +379,140 @@ class TradingGUI:
         try:
             if order_type == 'price':
                 price = float(self.amount_entry.get())
+                volume = None
                 self.log(f"시장가 매수: {price:,.0f}원")
-                result = market_order(market_code, side, 'price', price=price)
-                
             elif order_type == 'market':
-                # 잔고 조회
-                balances = get_my_balance()
-                ticker = market_code.split('-')[1]
-                volume = 0
-                for asset in balances:
-                    if asset.get('currency') == ticker:
-                        volume = float(asset.get('balance', 0))
-                        break
-                
-                if volume == 0:
-                    messagebox.showwarning("경고", f"{coin_name} 잔고가 없습니다")
-                    return
-                
-                self.log(f"시장가 매도: {volume} {ticker}")
-                result = market_order(market_code, side, 'market', volume=volume)
-                
+                price = volume = None
+                self.log(f"시장가 매도: {coin_name} 전액")
             else:  # limit
                 volume = float(self.amount_entry.get())
                 price = float(self.price_entry.get())
                 self.log(f"지정가 주문: {volume} @ {price:,.0f}원")
-                result = limit_order(market_code, side, volume, price)
-            
-            self.log(json.dumps(result, indent=2, ensure_ascii=False))
-            
-            if result.get('uuid'):
-                messagebox.showinfo("성공", "주문이 완료되었습니다")
-            else:
-                messagebox.showerror("실패", result.get('error', {}).get('message', '주문 실패'))
-                
         except ValueError:
             messagebox.showerror("오류", "금액/수량을 올바르게 입력하세요")
-        except Exception as e:
-            self.log(f"주문 오류: {e}")
-            messagebox.showerror("오류", str(e))
+            return
+        
+        if order_type == 'limit':
+            self.submit_order(coin_name, market_code, side, order_type, price, volume)
+            return
+        
+        # 시장가 주문은 예상 체결을 먼저 보여주고 확인 후 전송
+        submitted = self.worker.submit(self.preview_market_order, market_code, side, order_type, price,
+                                       key=('preview', market_code, side, order_type, price),
+                                       on_done=lambda preview: self.confirm_market_order(
+                                           coin_name, market_code, side, order_type, price, preview),
+                                       on_error=self.on_order_error)
+        if not submitted:
+            self.log("이미 처리 중인 주문입니다")
+    
+    @staticmethod
+    def preview_market_order(market_code, side, order_type, price):
+        """시장가 주문 예상 체결 계산 (워커 스레드)"""
+        volume = None
+        if order_type == 'market':
+            # 잔고 조회 (최근에 조회했으면 캐시 사용)
+            volume = get_balance_store().available(market_code.split('-')[1])
+            if volume == 0:
+                return {'volume': 0, 'fill': None}
+        
+        book = fetch_orderbook(market_code)
+        fill = book.estimate_fill(side, amount=price, volume=float(volume) if volume else None) if book else None
+        return {'volume': volume, 'fill': fill}
+    
+    def confirm_market_order(self, coin_name, market_code, side, order_type, price, preview):
+        """예상 체결 확인 후 주문 (메인 스레드)"""
+        if order_type == 'market' and not preview['volume']:
+            messagebox.showwarning("경고", f"{coin_name} 잔고가 없습니다")
+            return
+        
+        ticker = market_code.split('-')[1]
+        fill_text = format_fill(preview['fill'], ticker)
+        self.log(fill_text)
+        
+        if order_type == 'price':
+            summary = f"{coin_name} {price:,.0f}원 시장가 매수"
+        else:
+            summary = f"{coin_name} {preview['volume']} {ticker} 전액 시장가 매도"
+        if not messagebox.askyesno("주문 확인", f"{summary}\n\n{fill_text}\n\n주문을 실행하시겠습니까?"):
+            self.log("주문 취소")
+            return
+        
+        self.submit_order(coin_name, market_code, side, order_type, price, preview['volume'])
+    
+    def submit_order(self, coin_name, market_code, side, order_type, price, volume):
+        """주문 전송 요청 - 같은 주문이 처리 중이면 중복 클릭 무시"""
+        key = ('order', market_code, side, order_type, price, volume)
+        submitted = self.worker.submit(self.execute_order, market_code, side, order_type, price, volume,
+                                       key=key,
+                                       on_done=lambda result: self.on_order_done(coin_name, result),
+                                       on_error=self.on_order_error)
+        if not submitted:
+            self.log("이미 처리 중인 주문입니다")
+    
+    @staticmethod
+    def execute_order(market_code, side, order_type, price, volume):
+        """주문 전송 (워커 스레드)"""
+        if order_type == 'price':
+            return market_order(market_code, side, 'price', price=price)
+        if order_type == 'market':
+            return market_order(market_code, side, 'market', volume=volume)
+        return limit_order(market_code, side, volume, price)
+    
+    def on_order_done(self, coin_name, result):
+        """주문 결과 처리 (메인 스레드)"""
+        self.log(json.dumps(result, indent=2, ensure_ascii=False))
+        
+        if result.get('uuid'):
+            get_balance_store().invalidate(*result.get('market', '-').split('-'))
+            self.tracker.track(result)
+            messagebox.showinfo("성공", "주문이 완료되었습니다")
+        else:
+            error = result.get('error', {})
+            message = error.get('message', '주문 실패') if isinstance(error, dict) else str(error)
+            messagebox.showerror("실패", message)
+    
+    def on_order_error(self, e):
+        self.log(f"주문 오류: {e}")
+        messagebox.showerror("오류", str(e))
     
     def check_balance(self):
         """잔고 확인"""
+        # numpy 를 쓰므로 처음 누를 때 import
+        from portfolio import value_portfolio
+        self.worker.submit(lambda: value_portfolio(max_age=0), key='balance',
+                           on_done=self.on_balance_loaded,
+                           on_error=lambda e: self.log(f"잔고 조회 오류: {e}"))
+    
+    def on_balance_loaded(self, portfolio):
+        """잔고 평가 완료 (메인 스레드)"""
         try:
-            balances = get_my_balance()
             self.result_text.delete('1.0', tk.END)
-            self.log("=== 잔고 ===")
-            for asset in balances:
-                balance = float(asset.get('balance', 0))
-                if balance > 0:
-                    currency = asset.get('currency')
-                    self.log(f"{currency}: {balance}")
+            from portfolio import format_portfolio
+            self.log("=== 잔고 평가 ===")
+            self.log(format_portfolio(portfolio))
         except Exception as e:
             self.log(f"잔고 조회 오류: {e}")
     
+    def show_stats(self):
+        """API 호출 통계 (엔드포인트별 지연 / 상태 코드 / 오류)"""
+        self.result_text.delete('1.0', tk.END)
+        self.log(get_metrics().summary())
+        # 거래 기록 리포트는 flush + SQLite 조회라 백그라운드에서 실행
+        self.worker.submit(lambda: format_journal(get_journal().report()), key='journal',
+                           on_done=lambda text: self.log("\n📒 거래 기록\n" + text),
+                           on_error=lambda e: self.log(f"거래 기록 조회 오류: {e}"))
+    
+    def on_busy_changed(self, count):
+        """진행 중인 요청 수 표시"""
+        self.status_label.config(text=f"⏳ 요청 처리중 {count}건" if count else "")
+    
+    def on_close(self):
+        self.stream.stop(timeout=0)
+        self.tracker.stop(timeout=0)
+        self.worker.shutdown()
+        get_journal().close()
+        self.root.destroy()
+    
     def log(self, message):
         """로그 출력"""
         self.result_text.insert(tk.END, message + '\n')
@@ -331,5 +522,7 @@ class TradingGUI:
 if __name__ == "__main__":
     root = tk.Tk()
     app = TradingGUI(root)
+    root.update()
+    startup_profile.mark('first paint')
     root.mainloop()
 
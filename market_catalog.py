@@ -0,0 +1,253 @@
+"""
+마켓 목록 캐시
+/v1/market/all 결과를 파일에 저장해두고 TTL이 지났을 때만 백그라운드에서 갱신
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from client import get_client
+
+CACHE_PATH = '.markets_cache.json'
+CACHE_TTL = 6 * 60 * 60  # 6시간
+
+
+class MarketCatalog:
+    """
+    마켓 목록 + 검색용 인덱스 (마켓코드 / 한글명 / 영문명 / 티커)
+
+    같은 한글명의 KRW-, BTC-, USDT- 마켓을 모두 보관함
+    """
+
+    def __init__(self, items, fetched_at=0.0):
+        """
+        Args:
+            items (list): /v1/market/all 응답 리스트
+            fetched_at (float): 다운로드 시각 (time.time())
+        """
+        self.items = list(items)
+        self.fetched_at = fetched_at
+        self.by_code = {}
+        self.by_korean = defaultdict(list)
+        self.by_english = defaultdict(list)
+        self.by_ticker = defaultdict(list)
+
+        for item in self.items:
+            code = item['market']
+            self.by_code[code] = item
+            self.by_korean[item.get('korean_name', '')].append(item)
+            self.by_english[item.get('english_name', '').lower()].append(item)
+            self.by_ticker[code.split('-')[1]].append(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, code):
+        return code in self.by_code
+
+    def get(self, code):
+        """마켓코드로 조회 (없으면 None)"""
+        return self.by_code.get(code)
+
+    def lookup(self, key, quote=None):
+        """
+        마켓코드 / 한글명 / 영문명 / 티커 중 일치하는 마켓 검색
+
+        Args:
+            key (str): 검색어 (예: 'KRW-BTC', '비트코인', 'Bitcoin', 'btc')
+            quote (str, optional): 기준 통화 필터 (예: 'KRW')
+
+        Returns:
+            list: 일치하는 마켓 정보 리스트
+        """
+        key = key.strip()
+        if key.upper() in self.by_code:
+            found = [self.by_code[key.upper()]]
+        else:
+            found = (self.by_korean.get(key)
+                     or self.by_english.get(key.lower())
+                     or self.by_ticker.get(key.upper())
+                     or [])
+        return _filter_quote(found, quote)
+
+    def markets(self, quote=None):
+        """기준 통화로 필터링한 마켓 리스트"""
+        return _filter_quote(self.items, quote)
+
+    def quotes(self):
+        """기준 통화 목록 (예: ['KRW', 'BTC', 'USDT'])"""
+        return list(dict.fromkeys(code.split('-')[0] for code in self.by_code))
+
+    def codes_by_name(self, quote=None):
+        """{한글명: [마켓코드, ...]} 딕셔너리 (같은 한글명의 마켓을 모두 포함)"""
+        codes = {}
+        for item in self.markets(quote):
+            codes.setdefault(item['korean_name'], []).append(item['market'])
+        return codes
+
+    def korean_names(self, quote=None):
+        """
+        {한글명: 마켓코드} 딕셔너리 (service.get_markets 형식)
+        같은 한글명의 마켓이 여러 개면 버리지 않고 '한글명 (마켓코드)' 로 각각 넣음
+        """
+        names = {}
+        for name, codes in self.codes_by_name(quote).items():
+            if len(codes) == 1:
+                names[name] = codes[0]
+            else:
+                for code in codes:
+                    names[f'{name} ({code})'] = code
+        return names
+
+    def is_stale(self, ttl=CACHE_TTL):
+        return time.time() - self.fetched_at > ttl
+
+    @classmethod
+    def load(cls, path=CACHE_PATH):
+        """
+        캐시 파일 읽기
+
+        Returns:
+            MarketCatalog: 캐시가 없거나 손상되었으면 None
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(data['items'], data.get('fetched_at', 0.0))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path=CACHE_PATH):
+        """캐시 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': self.fetched_at, 'items': self.items}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def _filter_quote(items, quote):
+    if not quote:
+        return list(items)
+    prefix = quote.upper() + '-'
+    return [item for item in items if item['market'].startswith(prefix)]
+
+
+def fetch_catalog():
+    """
+    /v1/market/all 다운로드
+
+    Returns:
+        MarketCatalog: 실패 시 None
+    """
+    headers = {"accept": "application/json"}
+
+    try:
+        response = get_client().get('/v1/market/all', headers=headers)
+        items = response.json()
+        if not isinstance(items, list) or not items:
+            return None
+        return MarketCatalog(items, time.time())
+    except Exception as e:
+        return None
+
+
+class CatalogCache:
+    """
+    파일 캐시 + 메모리 캐시
+
+    - 캐시가 신선하면 네트워크 요청 없이 바로 반환
+    - 캐시가 오래되었으면 기존 캐시를 바로 반환하고 백그라운드에서 갱신
+    - 캐시가 없으면 동기적으로 다운로드
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, fetch=fetch_catalog):
+        """
+        Args:
+            path (str): 캐시 파일 경로
+            ttl (float): 캐시 유효 시간 (초)
+            fetch (callable): 카탈로그 다운로드 함수
+        """
+        self.path = path
+        self.ttl = ttl
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._catalog = None
+        self._refreshing = None
+
+    def get(self, background=True):
+        """
+        카탈로그 반환
+
+        Args:
+            background (bool): 오래된 캐시일 때 백그라운드 갱신 여부
+                (False면 갱신이 끝날 때까지 기다림)
+
+        Returns:
+            MarketCatalog: 다운로드도 캐시도 없으면 빈 카탈로그
+        """
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._catalog = MarketCatalog.load(self.path)
+                catalog = self._catalog
+
+        if catalog is None or not catalog.items:
+            return self.refresh() or MarketCatalog([])
+
+        if catalog.is_stale(self.ttl):
+            if background:
+                self.refresh_in_background()
+            else:
+                return self.refresh() or catalog
+
+        return catalog
+
+    def refresh(self):
+        """
+        즉시 다운로드 후 캐시 갱신
+
+        Returns:
+            MarketCatalog: 실패 시 None (기존 캐시 유지)
+        """
+        catalog = self.fetch()
+        if catalog is None:
+            return None
+
+        with self._lock:
+            self._catalog = catalog
+            try:
+                catalog.save(self.path)
+            except OSError:
+                pass
+        return catalog
+
+    def refresh_in_background(self):
+        """
+        백그라운드 스레드에서 갱신 (이미 갱신 중이면 그 스레드를 반환)
+
+        Returns:
+            threading.Thread: 갱신 스레드
+        """
+        with self._lock:
+            if self._refreshing is None or not self._refreshing.is_alive():
+                self._refreshing = threading.Thread(target=self.refresh, daemon=True)
+                self._refreshing.start()
+            return self._refreshing
+
+
+_default_cache = CatalogCache()
+
+
+def get_catalog(background=True):
+    """기본 캐시에서 마켓 카탈로그 반환"""
+    return _default_cache.get(background)
+
+
+def set_catalog_cache(cache):
+    """기본 캐시 교체 (이전 값 반환)"""
+    global _default_cache
+    previous, _default_cache = _default_cache, cache
+    return previous
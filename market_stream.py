@@ -0,0 +1,233 @@
+"""
+빗썸 WebSocket 실시간 시세
+ticker / trade / orderbook 채널을 구독해 마켓별 최신 값을 메모리에 보관
+연결이 끊기면 자동으로 재연결 + 재구독
+"""
+import json
+import threading
+import time
+import uuid
+
+WS_URL = "wss://ws-api.bithumb.com/websocket/v1"
+CHANNELS = ('ticker', 'trade', 'orderbook')
+
+
+class PriceCache:
+    """
+    마켓별 최신 시세 (스레드 안전)
+
+    {(채널, 마켓코드): (메시지, 수신 시각)}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def put(self, channel, market, message):
+        with self._lock:
+            self._data[(channel, market)] = (message, time.monotonic())
+
+    def get(self, channel, market, max_age=None):
+        """
+        최신 값 조회
+
+        Args:
+            channel (str): 'ticker', 'trade', 'orderbook'
+            market (str): 마켓코드
+            max_age (float, optional): 허용할 최대 경과 시간 (초)
+
+        Returns:
+            dict: 메시지 (없거나 오래되었으면 None)
+        """
+        entry = self._data.get((channel, market))
+        if entry is None:
+            return None
+        message, received_at = entry
+        if max_age is not None and time.monotonic() - received_at > max_age:
+            return None
+        return message
+
+    def clear(self, markets=None):
+        """
+        값 폐기 (연결이 끊겨 더 이상 최신이 아닐 때)
+
+        Args:
+            markets (iterable, optional): 폐기할 마켓코드 (없으면 전체)
+        """
+        with self._lock:
+            if markets is None:
+                self._data.clear()
+                return
+            markets = set(markets)
+            for key in [k for k in self._data if k[1] in markets]:
+                del self._data[key]
+
+
+class MarketStream:
+    """
+    백그라운드 스레드에서 WebSocket 을 유지하며 PriceCache 를 갱신
+
+    사용 예:
+        stream = MarketStream(['KRW-BTC']).start()
+        get_price_cache().get('ticker', 'KRW-BTC')
+    """
+
+    def __init__(self, markets=(), channels=CHANNELS, url=WS_URL, cache=None,
+                 ping_interval=30, reconnect_delay=1.0, max_reconnect_delay=30.0,
+                 on_message=None):
+        """
+        Args:
+            markets (iterable): 구독할 마켓코드
+            channels (tuple): 구독할 채널
+            url (str): WebSocket 주소
+            cache (PriceCache): 저장할 캐시 (없으면 기본 캐시)
+            ping_interval (float): 수신이 없을 때 ping 전송 주기 (초)
+            reconnect_delay (float): 첫 재연결 대기 시간 (초, 실패할 때마다 2배)
+            max_reconnect_delay (float): 최대 재연결 대기 시간 (초)
+            on_message (callable): 메시지 수신 시 호출 (message) - 수신 스레드에서 실행됨
+        """
+        self.markets = list(dict.fromkeys(markets))
+        self.channels = tuple(channels)
+        self.url = url
+        self.cache = cache if cache is not None else get_price_cache()
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.on_message = on_message
+        self.connected = threading.Event()
+        self.reconnects = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ws = None
+        self._thread = None
+
+    def start(self):
+        """수신 스레드 시작"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='market-stream', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """연결 종료 후 스레드 정리"""
+        self._stop.set()
+        with self._lock:
+            ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def subscribe(self, markets):
+        """
+        구독 마켓 추가 (연결 중이면 즉시 재구독)
+
+        Args:
+            markets (iterable): 추가할 마켓코드
+        """
+        with self._lock:
+            added = [m for m in markets if m not in self.markets]
+            if not added:
+                return
+            self.markets.extend(added)
+            ws = self._ws
+        if ws is not None:
+            try:
+                self._send_subscription(ws)
+            except Exception:
+                pass  # 수신 루프가 재연결하면서 다시 구독함
+
+    def _subscription(self):
+        request = [{'ticket': str(uuid.uuid4())}]
+        for channel in self.channels:
+            request.append({'type': channel, 'codes': list(self.markets)})
+        request.append({'format': 'DEFAULT'})
+        return json.dumps(request)
+
+    def _send_subscription(self, ws):
+        if self.markets:
+            ws.send(self._subscription())
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                self._connect_and_receive()
+                delay = self.reconnect_delay
+            except Exception:
+                pass
+            finally:
+                self.connected.clear()
+                self.cache.clear(self.markets)
+                with self._lock:
+                    self._ws = None
+
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self.reconnects += 1
+
+    def _connect_and_receive(self):
+        import websocket
+
+        ws = websocket.create_connection(self.url, timeout=self.ping_interval)
+        with self._lock:
+            self._ws = ws
+        try:
+            self._send_subscription(ws)
+            self.connected.set()
+
+            while not self._stop.is_set():
+                try:
+                    raw = ws.recv()
+                except websocket.WebSocketTimeoutException:
+                    ws.ping()
+                    continue
+                if not raw:
+                    break  # 서버가 연결을 닫음
+                self._handle(raw)
+        finally:
+            ws.close()
+
+    def _handle(self, raw):
+        # 깨진 메시지 하나 때문에 연결을 끊고 캐시를 비우지 않도록 건너뜀
+        try:
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf-8')
+            message = json.loads(raw)
+        except (ValueError, TypeError):
+            return
+        if not isinstance(message, dict):
+            return
+        channel = message.get('type')
+        market = message.get('code')
+        if channel in self.channels and market:
+            message.setdefault('market', market)  # REST 응답과 같은 키
+            self.cache.put(channel, market, message)
+            if self.on_message is not None:
+                self.on_message(message)
+
+
+def orderbook_from_stream(message):
+    """
+    orderbook 채널 메시지를 REST /v1/orderbook 항목 형식으로 변환
+    """
+    return {
+        'market': message['code'],
+        'timestamp': message.get('timestamp'),
+        'total_ask_size': message.get('total_ask_size'),
+        'total_bid_size': message.get('total_bid_size'),
+        'orderbook_units': message.get('orderbook_units', []),
+    }
+
+
+_default_cache = PriceCache()
+
+
+def get_price_cache():
+    """service.py 가 읽는 기본 시세 캐시"""
+    return _default_cache
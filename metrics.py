@@ -0,0 +1,224 @@
+"""
+API 호출 계측
+엔드포인트별 지연 히스토그램, 상태 코드 / 오류 종류별 횟수, 송수신 바이트, JWT 서명 시간을 기록
+꺼져 있으면 (기본값) 호출부에서 enabled 플래그만 확인하므로 오버헤드가 거의 없음
+
+켜기: metrics.get_metrics().enable()  또는  환경 변수 BITHUMB_METRICS=1
+"""
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+# 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIGN_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus 형식)"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'max')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """구간 상한으로 근사한 분위수 (관측된 최댓값을 넘지 않음)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'buckets': {str(b): c for b, c in zip(list(self.bounds) + ['+Inf'], self.counts)},
+            'sum': self.sum,
+            'count': self.count,
+            'max': self.max,
+            'mean': self.sum / self.count if self.count else 0.0,
+        }
+
+
+class Metrics:
+    """계측 저장소 (스레드 안전)"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.latency = {}
+            self.statuses = defaultdict(int)
+            self.errors = defaultdict(int)
+            self.bytes_out = defaultdict(int)
+            self.bytes_in = defaultdict(int)
+            self.sign = Histogram(SIGN_BUCKETS)
+
+    def record_request(self, endpoint, status, seconds, bytes_out=0, bytes_in=0, error=None):
+        """
+        요청 한 건 기록
+
+        Args:
+            endpoint (str): API 경로 (예: '/v1/ticker')
+            status (int): 응답 코드 (응답이 없으면 None)
+            seconds (float): 소요 시간
+            bytes_out (int): 요청 바디 크기
+            bytes_in (int): 응답 바디 크기
+            error (str, optional): 오류 종류 (예외 클래스 이름 또는 API 오류 name)
+        """
+        with self._lock:
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+            self.statuses[(endpoint, status if status is not None else 'none')] += 1
+            if error:
+                self.errors[(endpoint, error)] += 1
+            self.bytes_out[endpoint] += bytes_out
+            self.bytes_in[endpoint] += bytes_in
+
+    def record_sign(self, seconds):
+        """JWT 서명 시간 기록"""
+        with self._lock:
+            self.sign.observe(seconds)
+
+    def snapshot(self):
+        """
+        현재 값 복사본
+
+        Returns:
+            dict: {'endpoints': {경로: {...}}, 'jwt_sign': {...}}
+        """
+        with self._lock:
+            endpoints = {}
+            for endpoint, histogram in self.latency.items():
+                endpoints[endpoint] = {
+                    'latency': histogram.to_dict(),
+                    'p50': histogram.quantile(0.5),
+                    'p95': histogram.quantile(0.95),
+                    'p99': histogram.quantile(0.99),
+                    'statuses': {str(s): n for (e, s), n in self.statuses.items() if e == endpoint},
+                    'errors': {err: n for (e, err), n in self.errors.items() if e == endpoint},
+                    'bytes_out': self.bytes_out[endpoint],
+                    'bytes_in': self.bytes_in[endpoint],
+                }
+            return {'endpoints': endpoints, 'jwt_sign': self.sign.to_dict()}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식"""
+        snap = self.snapshot()
+        lines = [
+            '# HELP bithumb_request_duration_seconds Bithumb API request latency',
+            '# TYPE bithumb_request_duration_seconds histogram',
+        ]
+        for endpoint, data in snap['endpoints'].items():
+            lines += _histogram_lines('bithumb_request_duration_seconds', data['latency'], f'endpoint="{endpoint}"')
+
+        lines += ['# HELP bithumb_requests_total Bithumb API requests by status code',
+                  '# TYPE bithumb_requests_total counter']
+        for endpoint, data in snap['endpoints'].items():
+            for status, n in data['statuses'].items():
+                lines.append(f'bithumb_requests_total{{endpoint="{endpoint}",status="{status}"}} {n}')
+
+        lines += ['# HELP bithumb_request_errors_total Bithumb API errors by type',
+                  '# TYPE bithumb_request_errors_total counter']
+        for endpoint, data in snap['endpoints'].items():
+            for error, n in data['errors'].items():
+                lines.append(f'bithumb_request_errors_total{{endpoint="{endpoint}",error="{error}"}} {n}')
+
+        lines += ['# HELP bithumb_request_bytes_total Bithumb API body bytes',
+                  '# TYPE bithumb_request_bytes_total counter']
+        for endpoint, data in snap['endpoints'].items():
+            lines.append(f'bithumb_request_bytes_total{{endpoint="{endpoint}",direction="out"}} {data["bytes_out"]}')
+            lines.append(f'bithumb_request_bytes_total{{endpoint="{endpoint}",direction="in"}} {data["bytes_in"]}')
+
+        lines += ['# HELP bithumb_jwt_sign_seconds JWT signing time',
+                  '# TYPE bithumb_jwt_sign_seconds histogram']
+        lines += _histogram_lines('bithumb_jwt_sign_seconds', snap['jwt_sign'], '')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """
+        사람이 읽는 요약 (CLI / GUI 결과창 출력용)
+
+        Returns:
+            str: 여러 줄 문자열
+        """
+        snap = self.snapshot()
+        if not snap['endpoints']:
+            return "📊 API 통계: 기록된 요청 없음" + ("" if self.enabled else " (계측 꺼짐)")
+
+        lines = ["📊 API 통계", f"{'endpoint':16}{'count':>7}{'p50':>9}{'p95':>9}{'max':>9}  status"]
+        for endpoint, data in sorted(snap['endpoints'].items()):
+            latency = data['latency']
+            statuses = ' '.join(f'{s}:{n}' for s, n in sorted(data['statuses'].items()))
+            lines.append(f"{endpoint:16}{latency['count']:7d}{data['p50'] * 1000:7.0f}ms"
+                         f"{data['p95'] * 1000:7.0f}ms{latency['max'] * 1000:7.0f}ms  {statuses}")
+            for error, n in data['errors'].items():
+                lines.append(f"{'':16}  ⚠️ {error}: {n}")
+        sign = snap['jwt_sign']
+        if sign['count']:
+            lines.append(f"JWT 서명: {sign['count']}회, 평균 {sign['mean'] * 1e6:.1f}us")
+        return '\n'.join(lines)
+
+
+def api_error_name(payload, status):
+    """오류 응답 → 오류 종류 (빗썸 {'error': {'name': ...}} 형식이 아니면 'http_<status>')"""
+    if isinstance(payload, dict) and isinstance(payload.get('error'), dict):
+        name = payload['error'].get('name')
+        if name:
+            return str(name)
+    return f'http_{status}'
+
+
+def _histogram_lines(name, data, labels):
+    sep = ',' if labels else ''
+    lines = [f'{name}_bucket{{{labels}{sep}le="{le}"}} {n}' for le, n in _cumulative(data['buckets'])]
+    suffix = f'{{{labels}}}' if labels else ''
+    lines.append(f'{name}_sum{suffix} {data["sum"]}')
+    lines.append(f'{name}_count{suffix} {data["count"]}')
+    return lines
+
+
+def _cumulative(buckets):
+    total = 0
+    for le, n in buckets.items():
+        total += n
+        yield le, total
+
+
+_default_metrics = Metrics(enabled=os.getenv('BITHUMB_METRICS', '') not in ('', '0'))
+
+
+def get_metrics():
+    """기본 계측 저장소"""
+    return _default_metrics
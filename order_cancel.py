@@ -0,0 +1,146 @@
+"""
+주문 일괄 취소 / 정정 (cancel-replace)
+여러 주문의 취소를 asyncio 클라이언트로 동시에 보내고, 정정은 취소가 확인되는 즉시 새 지정가 주문을 보냄
+모든 함수는 주문별 결과를 돌려줌 (일부가 실패해도 나머지는 계속 진행)
+"""
+import asyncio
+
+from async_client import run_with_client
+from ladder import snap_prices, _price_strings
+from service import get_open_orders
+
+
+def _outcome(uuid, result):
+    if not isinstance(result, dict) or 'error' in result:
+        error = result.get('error') if isinstance(result, dict) else result
+        if isinstance(error, dict):
+            error = error.get('message') or error.get('name')
+        return {'uuid': uuid, 'ok': False, 'error': str(error), 'result': result}
+    return {'uuid': uuid, 'ok': True, 'error': None, 'result': result}
+
+
+async def cancel_orders_async(client, uuids):
+    """
+    여러 주문 동시 취소
+
+    Args:
+        client (AsyncBithumbClient): 비동기 클라이언트
+        uuids (list): 취소할 주문 UUID 리스트
+
+    Returns:
+        list: uuids 순서대로 [{'uuid', 'ok', 'error', 'result'}, ...]
+    """
+    results = await asyncio.gather(*(client.cancel_order(uuid) for uuid in uuids))
+    return [_outcome(uuid, result) for uuid, result in zip(uuids, results)]
+
+
+def cancel_orders(uuids, base_url=None):
+    """여러 주문 동시 취소 (동기 호출용, 결과는 cancel_orders_async 와 같음)"""
+    uuids = list(dict.fromkeys(uuids))
+    if not uuids:
+        return []
+    return run_with_client(lambda client: cancel_orders_async(client, uuids),
+                           base_url, pool_size=16, concurrency=16)
+
+
+def cancel_market(market, side=None, base_url=None):
+    """
+    마켓의 미체결 주문 전체 취소
+
+    Args:
+        market (str): 마켓 ID (예: 'KRW-XRP')
+        side (str, optional): 'bid' / 'ask' 만 취소
+
+    Returns:
+        list: 주문별 결과 (미체결 주문 조회에 실패하면 [{'uuid': None, 'ok': False, 'error': ...}])
+    """
+    orders = get_open_orders(market, side)
+    if orders and 'error' in orders[0]:
+        return [_outcome(None, orders[0])]
+    return cancel_orders([o['uuid'] for o in orders], base_url)
+
+
+def _replacement_price(replacement):
+    """
+    정정 가격을 호가 단위에 맞춤 (ladder.snap_prices - 매수는 내림, 매도는 올림)
+    side 를 모르면 어느 쪽으로 맞출지 알 수 없으므로 호가 단위에 맞는 가격인지만 확인
+
+    Returns:
+        tuple: (주문에 쓰는 가격 문자열, None) 또는 (None, 오류 메시지)
+    """
+    try:
+        price = float(replacement['price'])
+    except (TypeError, ValueError):
+        return None, f"잘못된 가격: {replacement['price']}"
+    if not price > 0:
+        return None, f"가격은 0보다 커야 합니다: {replacement['price']}"
+
+    side = replacement.get('side')
+    if side in ('bid', 'ask'):
+        snapped = snap_prices([price], side)
+    else:
+        snapped = snap_prices([price], 'bid')
+        if snapped[0] != snap_prices([price], 'ask')[0]:
+            return None, f"호가 단위에 맞지 않는 가격: {replacement['price']} (side 를 지정하면 자동으로 맞춤)"
+    return _price_strings(snapped)[0], None
+
+
+async def _cancel_replace_one(client, replacement):
+    uuid = replacement['uuid']
+    # 새 주문이 호가 단위 오류로 거부되면 취소만 된 채로 남으므로 가격은 취소 전에 확인
+    price, error = _replacement_price(replacement)
+    if error is not None:
+        return {'uuid': uuid, 'ok': False, 'error': error, 'cancel': None, 'order': None, 'new_uuid': None}
+
+    canceled = _outcome(uuid, await client.cancel_order(uuid))
+    outcome = {'uuid': uuid, 'ok': False, 'error': canceled['error'],
+               'cancel': canceled['result'], 'order': None, 'new_uuid': None}
+    if not canceled['ok']:
+        return outcome
+
+    # 취소가 접수되면 바로 새 주문 (수량을 지정하지 않으면 취소된 주문의 남은 수량)
+    cancel = canceled['result']
+    market = replacement.get('market') or cancel.get('market')
+    side = replacement.get('side') or cancel.get('side')
+    volume = replacement.get('volume') or cancel.get('remaining_volume')
+    placed = _outcome(uuid, await client.limit_order(market, side, volume, price))
+
+    outcome.update(ok=placed['ok'], error=placed['error'], order=placed['result'],
+                   new_uuid=placed['result'].get('uuid') if placed['ok'] else None)
+    return outcome
+
+
+async def cancel_replace_async(client, replacements):
+    """
+    여러 주문 동시 정정 (주문마다 취소 → 새 주문 순서는 지키고, 주문끼리는 동시에 진행)
+
+    Args:
+        client (AsyncBithumbClient): 비동기 클라이언트
+        replacements (list): [{'uuid', 'price', 'volume' (선택), 'market' (선택), 'side' (선택)}, ...]
+            - price 는 취소 전에 호가 단위에 맞춤 (side 가 없으면 호가 단위에 맞지 않는 가격은 취소하지 않고 실패)
+
+    Returns:
+        list: replacements 순서대로
+            [{'uuid', 'ok', 'error', 'cancel', 'order', 'new_uuid'}, ...]
+            - 취소에 실패하면 새 주문을 보내지 않음 (이미 체결된 주문 등)
+            - 가격이 잘못되면 취소도 보내지 않음 (cancel 은 None)
+    """
+    return await asyncio.gather(*(_cancel_replace_one(client, r) for r in replacements))
+
+
+def cancel_replace(replacements, base_url=None):
+    """여러 주문 동시 정정 (동기 호출용, 결과는 cancel_replace_async 와 같음)"""
+    if not replacements:
+        return []
+    return run_with_client(lambda client: cancel_replace_async(client, replacements),
+                           base_url, pool_size=16, concurrency=16)
+
+
+def format_outcomes(outcomes):
+    """주문별 결과 요약 문자열 (CLI / GUI 결과창 출력용)"""
+    ok = sum(1 for o in outcomes if o['ok'])
+    lines = [f"성공 {ok}건 / 실패 {len(outcomes) - ok}건"]
+    for o in outcomes:
+        if not o['ok']:
+            lines.append(f"❌ {o['uuid']}: {o['error']}")
+    return '\n'.join(lines)
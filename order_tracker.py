@@ -0,0 +1,315 @@
+"""
+주문 상태 추적
+제출한 주문을 등록해두면 끝나지 않은 주문들을 묶어서 한 번에 조회하고 (요청당 최대 100개)
+체결 / 부분 체결 / 취소 이벤트를 발생시킴
+
+여러 스레드가 각자 주문 하나씩 sleep-polling 하지 않고, 한 번의 일괄 조회 결과를 같이 기다림
+"""
+import threading
+import time
+from collections import deque
+
+from service import get_orders
+
+# 주문 상태 (로컬 테이블 기준)
+OPEN = 'open'         # 미체결
+PARTIAL = 'partial'   # 부분 체결
+DONE = 'done'         # 전량 체결
+CANCEL = 'cancel'     # 취소 (부분 체결 후 취소 포함)
+FINISHED = (DONE, CANCEL)
+
+
+def order_status(order):
+    """API 주문 정보 → 로컬 상태 (OPEN / PARTIAL / DONE / CANCEL)"""
+    state = order.get('state')
+    if state == 'done':
+        return DONE
+    if state == 'cancel':
+        return CANCEL
+    return PARTIAL if float(order.get('executed_volume') or 0) > 0 else OPEN
+
+
+class OrderTracker:
+    """
+    주문 테이블 + 일괄 상태 조회
+
+    사용 예:
+        tracker = get_tracker().start()
+        tracker.add_listener(lambda event: print(event['type'], event['uuid']))
+        uuid = tracker.track(limit_order('KRW-BTC', 'bid', 0.001, 90000000))
+        order = tracker.wait(uuid, timeout=60)
+    """
+
+    def __init__(self, fetch=get_orders, min_interval=0.2, max_interval=3.0, max_finished=1000):
+        """
+        Args:
+            fetch (callable): uuid 리스트 → {uuid: 주문 정보} (기본값 service.get_orders)
+            min_interval (float): 최소 조회 간격 (초) - 상태가 바뀌거나 새 주문이 등록되면 이 값으로 돌아감
+            max_interval (float): 최대 조회 간격 (초) - 변화가 없으면 점점 늘림
+            max_finished (int): 테이블에 남겨둘 끝난 주문 수 (오래된 것부터 삭제)
+        """
+        self.fetch = fetch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_finished = max_finished
+        self.interval = min_interval
+        self.polls = 0
+
+        self._orders = {}
+        self._open = set()
+        self._finished = deque()
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ==================== 등록 / 조회 ====================
+
+    def track(self, order, market=None, side=None):
+        """
+        주문 등록
+
+        Args:
+            order (dict | str): 주문 API 응답 또는 uuid
+            market (str, optional): uuid 만 줄 때 마켓 ID
+            side (str, optional): uuid 만 줄 때 'bid' / 'ask'
+
+        Returns:
+            str: 주문 uuid (오류 응답이면 None)
+        """
+        if isinstance(order, str):
+            order = {'uuid': order, 'market': market, 'side': side, 'state': 'wait'}
+        if not isinstance(order, dict) or 'uuid' not in order:
+            return None
+
+        events = []
+        with self._cond:
+            uuid = order['uuid']
+            if uuid not in self._orders:
+                self._orders[uuid] = dict(order, status=OPEN, executed_volume='0')
+                self._open.add(uuid)
+            events = self._apply(order)
+            self.interval = self.min_interval
+        self._wake.set()
+        self._emit(events)
+        return uuid
+
+    def get(self, uuid):
+        """로컬 테이블의 주문 정보 (없으면 None)"""
+        with self._cond:
+            order = self._orders.get(uuid)
+            return dict(order) if order else None
+
+    def orders(self, status=None):
+        """
+        로컬 테이블 조회
+
+        Args:
+            status (str | tuple, optional): OPEN / PARTIAL / DONE / CANCEL 중 하나 또는 여러 개
+        """
+        if isinstance(status, str):
+            status = (status,)
+        with self._cond:
+            return [dict(o) for o in self._orders.values() if status is None or o['status'] in status]
+
+    def open_orders(self):
+        """미체결 + 부분 체결 주문"""
+        return self.orders((OPEN, PARTIAL))
+
+    # ==================== 이벤트 ====================
+
+    def add_listener(self, listener):
+        """
+        이벤트 수신 함수 등록 - listener(event) 는 조회한 스레드에서 호출됨
+
+        event: {'type': 'fill' / 'done' / 'cancel', 'uuid', 'market', 'side', 'status',
+                'executed_volume', 'filled' (이번에 새로 체결된 수량), 'order'}
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, events):
+        for event in events:
+            for listener in list(self._listeners):
+                try:
+                    listener(event)
+                except Exception:
+                    pass
+
+    # ==================== 일괄 조회 ====================
+
+    def poll(self):
+        """
+        끝나지 않은 주문 전체를 한 번에 조회
+
+        Returns:
+            int: 상태가 바뀐 주문 수
+        """
+        with self._poll_lock:
+            with self._cond:
+                uuids = list(self._open)
+            if not uuids:
+                return 0
+
+            fetched = self.fetch(uuids)
+            events = []
+            with self._cond:
+                self.polls += 1
+                for order in fetched.values():
+                    events += self._apply(order)
+                self.interval = (self.min_interval if events
+                                 else min(self.interval * 1.5, self.max_interval))
+                self._cond.notify_all()
+
+        self._emit(events)
+        return len(events)
+
+    def _apply(self, order):
+        # self._cond 를 잡은 상태에서 호출
+        uuid = order.get('uuid')
+        current = self._orders.get(uuid)
+        if current is None or current['status'] in FINISHED:
+            return []
+
+        status = order_status(order)
+        before = float(current.get('executed_volume') or 0)
+        current.update(order, status=status)
+        filled = float(current.get('executed_volume') or 0) - before
+
+        events = []
+        if filled > 0:
+            events.append(self._event('fill', current, filled))
+        if status in FINISHED:
+            events.append(self._event(status, current, 0.0))
+            self._open.discard(uuid)
+            self._finished.append(uuid)
+            while len(self._finished) > self.max_finished:
+                self._orders.pop(self._finished.popleft(), None)
+        return events
+
+    @staticmethod
+    def _event(kind, order, filled):
+        return {
+            'type': kind,
+            'uuid': order['uuid'],
+            'market': order.get('market'),
+            'side': order.get('side'),
+            'status': order['status'],
+            'executed_volume': order.get('executed_volume'),
+            'filled': filled,
+            'order': dict(order),
+        }
+
+    # ==================== 대기 ====================
+
+    def wait(self, uuid, timeout=None, statuses=FINISHED):
+        """
+        주문이 지정한 상태가 될 때까지 대기
+
+        백그라운드 조회 스레드가 돌고 있으면 그 결과를 기다리고,
+        아니면 대기 중인 스레드 하나만 일괄 조회를 보내고 나머지는 결과를 공유함
+
+        Args:
+            uuid (str): track() 으로 등록한 주문 uuid
+            timeout (float, optional): 최대 대기 시간 (초)
+            statuses (tuple): 기다릴 상태 (기본값: 체결 완료 또는 취소)
+
+        Returns:
+            dict: 주문 정보 (시간 초과면 None)
+
+        Raises:
+            KeyError: 등록되지 않았거나 테이블에서 삭제된 주문 (max_finished 초과)
+        """
+        result = self.wait_all([uuid], timeout, statuses)
+        return result.get(uuid)
+
+    def wait_all(self, uuids, timeout=None, statuses=FINISHED):
+        """
+        여러 주문이 모두 지정한 상태가 될 때까지 대기
+
+        Returns:
+            dict: {uuid: 주문 정보} - 시간 초과 시 조건을 만족한 주문만 포함
+
+        Raises:
+            KeyError: 등록되지 않았거나 테이블에서 삭제된 주문이 있을 때 (영원히 기다리지 않도록)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def ready():
+            return {u: dict(self._orders[u]) for u in uuids
+                    if u in self._orders and self._orders[u]['status'] in statuses}
+
+        while True:
+            with self._cond:
+                missing = [u for u in uuids if u not in self._orders]
+                if missing:
+                    raise KeyError(f"추적 중인 주문이 아닙니다: {', '.join(missing)}")
+                done = ready()
+                if len(done) == len(uuids):
+                    return done
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return done
+                wait = self.interval if remaining is None else min(self.interval, remaining)
+                if self.is_running() or self._poll_lock.locked():
+                    self._cond.wait(wait)
+                    continue
+
+            # 직접 조회 (다른 스레드가 조회 중이면 poll() 이 끝날 때까지 기다렸다가 결과 사용)
+            if not self.poll():
+                time.sleep(wait)
+
+    # ==================== 백그라운드 조회 ====================
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """백그라운드 조회 스레드 시작 (이미 실행 중이면 무시)"""
+        if not self.is_running():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._cond:
+                idle = not self._open
+            if idle:
+                # 추적할 주문이 없으면 새 주문이 등록될 때까지 대기
+                self._wake.wait(self.max_interval)
+                self._wake.clear()
+                continue
+            try:
+                self.poll()
+            except Exception:
+                self.interval = self.max_interval
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+_default_tracker = None
+_default_lock = threading.Lock()
+
+
+def get_tracker():
+    """기본 OrderTracker (지연 생성, 조회 스레드는 start() 호출 시 시작)"""
+    global _default_tracker
+    if _default_tracker is None:
+        with _default_lock:
+            if _default_tracker is None:
+                _default_tracker = OrderTracker()
+    return _default_tracker
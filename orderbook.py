@@ -0,0 +1,218 @@
+"""
+로컬 호가창
+매수/매도 호가를 array 기반 병렬 배열로 보관하고 시장가 주문의 예상 체결가/슬리피지를 계산
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+from service import get_orderbook
+
+
+class OrderBook:
+    """
+    호가창 (가격/수량 병렬 배열)
+
+    - 매도 호가(ask): 가격 오름차순 → [0] 이 최우선 매도호가
+    - 매수 호가(bid): 가격 내림차순 → [0] 이 최우선 매수호가
+    """
+
+    def __init__(self, market=None):
+        self.market = market
+        self.timestamp = None
+        self.ask_prices = array('d')
+        self.ask_sizes = array('d')
+        self.bid_prices = array('d')
+        self.bid_sizes = array('d')
+
+    @classmethod
+    def from_rest(cls, item):
+        """
+        /v1/orderbook 응답 항목 (또는 WebSocket orderbook 메시지)으로 생성
+
+        Args:
+            item (dict): {'market': ..., 'orderbook_units': [...], ...}
+        """
+        book = cls(item.get('market') or item.get('code'))
+        book.apply_snapshot(item.get('orderbook_units', []), item.get('timestamp'))
+        return book
+
+    def apply_snapshot(self, units, timestamp=None):
+        """
+        전체 호가로 교체 (배열은 재사용)
+
+        Args:
+            units (list): [{'ask_price', 'ask_size', 'bid_price', 'bid_size'}, ...]
+            timestamp (int, optional): 호가 시각 (ms)
+        """
+        asks = sorted((float(u['ask_price']), float(u['ask_size'])) for u in units if float(u['ask_size']) > 0)
+        bids = sorted(((float(u['bid_price']), float(u['bid_size'])) for u in units if float(u['bid_size']) > 0),
+                      reverse=True)
+
+        for prices, sizes, levels in ((self.ask_prices, self.ask_sizes, asks),
+                                      (self.bid_prices, self.bid_sizes, bids)):
+            del prices[:]
+            del sizes[:]
+            prices.extend(p for p, _ in levels)
+            sizes.extend(s for _, s in levels)
+        self.timestamp = timestamp
+
+    def update(self, side, price, size):
+        """
+        호가 한 단계 증분 갱신 (size 0 이면 삭제)
+
+        Args:
+            side (str): 'ask' 또는 'bid'
+            price (float): 호가
+            size (float): 해당 호가의 새 잔량
+        """
+        price = float(price)
+        size = float(size)
+        if side == 'ask':
+            prices, sizes = self.ask_prices, self.ask_sizes
+            i = bisect_left(prices, price)
+        else:
+            prices, sizes = self.bid_prices, self.bid_sizes
+            i = bisect_left(prices, -price, key=lambda p: -p)
+
+        exists = i < len(prices) and prices[i] == price
+        if size <= 0:
+            if exists:
+                del prices[i]
+                del sizes[i]
+        elif exists:
+            sizes[i] = size
+        else:
+            prices.insert(i, price)
+            sizes.insert(i, size)
+
+    def best_ask(self):
+        return self.ask_prices[0] if self.ask_prices else None
+
+    def best_bid(self):
+        return self.bid_prices[0] if self.bid_prices else None
+
+    def spread(self):
+        """최우선 매도호가 - 최우선 매수호가"""
+        if not self.ask_prices or not self.bid_prices:
+            return None
+        return self.ask_prices[0] - self.bid_prices[0]
+
+    def mid(self):
+        if not self.ask_prices or not self.bid_prices:
+            return None
+        return (self.ask_prices[0] + self.bid_prices[0]) / 2
+
+    def depth(self, pct):
+        """
+        중간가 기준 ±pct% 이내 호가 잔량
+
+        Args:
+            pct (float): 범위 (%, 예: 1 → ±1%)
+
+        Returns:
+            dict: {'bid_volume', 'bid_amount', 'ask_volume', 'ask_amount'} (amount 는 원화 환산)
+        """
+        mid = self.mid()
+        result = {'bid_volume': 0.0, 'bid_amount': 0.0, 'ask_volume': 0.0, 'ask_amount': 0.0}
+        if mid is None:
+            return result
+
+        # 정렬되어 있으므로 범위 경계만 이진 탐색
+        ask_end = bisect_right(self.ask_prices, mid * (1 + pct / 100))
+        bid_end = bisect_right(self.bid_prices, -mid * (1 - pct / 100), key=lambda p: -p)
+
+        for side, prices, sizes, end in (('ask', self.ask_prices, self.ask_sizes, ask_end),
+                                         ('bid', self.bid_prices, self.bid_sizes, bid_end)):
+            for i in range(end):
+                result[f'{side}_volume'] += sizes[i]
+                result[f'{side}_amount'] += prices[i] * sizes[i]
+        return result
+
+    def estimate_fill(self, side, amount=None, volume=None):
+        """
+        시장가 주문 예상 체결 (호가를 순서대로 소진)
+
+        Args:
+            side (str): 'bid' (매수 - 매도호가 소진) 또는 'ask' (매도 - 매수호가 소진)
+            amount (float, optional): 매수할 원화 금액 (시장가 매수)
+            volume (float, optional): 주문 수량 (시장가 매도)
+
+        Returns:
+            dict: {
+                'volume': 체결 수량,
+                'amount': 체결 금액 (원화),
+                'vwap': 평균 체결가,
+                'best_price': 최우선 호가,
+                'slippage': 최우선 호가 대비 불리한 비율 (0.001 = 0.1%),
+                'levels': 소진한 호가 단계 수,
+                'complete': 호가 잔량으로 전량 체결 가능 여부,
+            }
+            호가가 없으면 None
+
+        Raises:
+            ValueError: amount / volume 이 둘 다 없을 때
+        """
+        if amount is None and volume is None:
+            raise ValueError("amount 또는 volume 중 하나는 지정해야 합니다.")
+        if side == 'bid':
+            prices, sizes = self.ask_prices, self.ask_sizes
+        else:
+            prices, sizes = self.bid_prices, self.bid_sizes
+        if not prices:
+            return None
+
+        remaining_amount = float(amount) if amount is not None else None
+        remaining_volume = float(volume) if volume is not None else None
+        filled_volume = filled_amount = 0.0
+        levels = 0
+
+        for i in range(len(prices)):
+            price, size = prices[i], sizes[i]
+            if remaining_amount is not None:
+                take = min(size, remaining_amount / price)
+                remaining_amount -= take * price
+            else:
+                take = min(size, remaining_volume)
+                remaining_volume -= take
+            filled_volume += take
+            filled_amount += take * price
+            levels += 1
+            if (remaining_amount if remaining_amount is not None else remaining_volume) <= 1e-12:
+                break
+
+        best = prices[0]
+        vwap = filled_amount / filled_volume if filled_volume else best
+        left = remaining_amount if remaining_amount is not None else remaining_volume
+        return {
+            'volume': filled_volume,
+            'amount': filled_amount,
+            'vwap': vwap,
+            'best_price': best,
+            'slippage': abs(vwap - best) / best,
+            'levels': levels,
+            'complete': left <= 1e-12,
+        }
+
+
+def fetch_orderbook(market):
+    """
+    호가 조회 후 OrderBook 으로 변환
+
+    Returns:
+        OrderBook: 실패 시 None
+    """
+    result = get_orderbook(market)
+    if isinstance(result, list) and result:
+        return OrderBook.from_rest(result[0])
+    return None
+
+
+def format_fill(fill, ticker):
+    """예상 체결 정보를 한 줄 문자열로 (CLI / GUI 공용)"""
+    if fill is None:
+        return "예상 체결: 호가 정보 없음"
+    text = (f"예상 체결: {fill['volume']:.8f} {ticker} @ 평균 {fill['vwap']:,.2f}원 "
+            f"(총 {fill['amount']:,.0f}원, 슬리피지 {fill['slippage'] * 100:.3f}%, {fill['levels']}호가)")
+    if not fill['complete']:
+        text += " ⚠️ 호가 잔량 부족"
+    return text
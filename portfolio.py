@@ -0,0 +1,115 @@
+"""
+보유 자산 평가 (mark-to-market)
+잔고 전체를 /v1/ticker 한 번 (일괄 조회) 으로 평가하고, 평가금액 / 손익 / 비중은 NumPy 배열 연산으로 계산
+"""
+import numpy as np
+
+from balance_store import get_balance_store
+from service import get_current_prices
+
+
+def value_portfolio(balances=None, quote='KRW', max_age=None):
+    """
+    보유 자산 평가
+
+    Args:
+        balances (dict, optional): {통화: 잔고 정보} (BalanceStore.all() 형식, 없으면 기본 BalanceStore 사용)
+        quote (str): 평가 기준 통화
+        max_age (float, optional): 잔고 캐시 유효 시간 (초, 0이면 항상 새로 조회)
+
+    Returns:
+        dict: {
+            'holdings': [{'currency', 'market', 'volume', 'price', 'value', 'avg_buy_price',
+                          'cost', 'pnl', 'pnl_rate', 'weight'}, ...]  (평가금액 큰 순),
+            'cash': 기준 통화 잔고 (주문 중 포함),
+            'total': 총 평가금액 (현금 포함),
+            'cost': 매수 원금 합계,
+            'pnl': 평가 손익 합계,
+            'pnl_rate': 평가 손익률,
+            'unpriced': 시세를 찾지 못한 통화 리스트,
+        }
+    """
+    if balances is None:
+        balances = get_balance_store().all(max_age)
+
+    cash = 0.0
+    currencies = []
+    volumes = []
+    avg_prices = []
+    for currency, asset in balances.items():
+        amount = float(asset['balance'] + asset['locked'])
+        if currency == quote:
+            cash = amount
+        elif amount > 0:
+            currencies.append(currency)
+            volumes.append(amount)
+            avg_prices.append(float(asset['avg_buy_price']))
+
+    markets = [f'{quote}-{currency}' for currency in currencies]
+    tickers = get_current_prices(markets) if markets else {}
+
+    volume = np.array(volumes, dtype=np.float64)
+    avg_price = np.array(avg_prices, dtype=np.float64)
+    price = np.array([tickers[m]['trade_price'] if m in tickers else np.nan for m in markets],
+                     dtype=np.float64)
+    priced = ~np.isnan(price)
+
+    # 평균 매수가를 모르는 코인 (입금 등) 은 손익 계산에서 제외
+    known = priced & (avg_price > 0)
+    value = np.where(priced, volume * price, 0.0)
+    cost = np.where(known, volume * avg_price, 0.0)
+    pnl = np.where(known, value - cost, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pnl_rate = np.where(cost > 0, pnl / cost, np.nan)
+
+    total = cash + value.sum()
+    weight = value / total if total > 0 else np.zeros_like(value)
+    total_cost = cost.sum()
+    total_pnl = pnl.sum()
+
+    order = np.argsort(-value, kind='stable')
+    holdings = [
+        {
+            'currency': currencies[i],
+            'market': markets[i],
+            'volume': volume[i],
+            'price': None if not priced[i] else price[i],
+            'value': value[i],
+            'avg_buy_price': avg_price[i],
+            'cost': cost[i],
+            'pnl': pnl[i],
+            'pnl_rate': None if np.isnan(pnl_rate[i]) else pnl_rate[i],
+            'weight': weight[i],
+        }
+        for i in order.tolist()
+    ]
+
+    return {
+        'holdings': holdings,
+        'cash': cash,
+        'total': float(total),
+        'cost': float(total_cost),
+        'pnl': float(total_pnl),
+        'pnl_rate': float(total_pnl / total_cost) if total_cost > 0 else None,
+        'unpriced': [currencies[i] for i in np.flatnonzero(~priced).tolist()],
+    }
+
+
+def format_portfolio(portfolio):
+    """평가 결과 요약 문자열 (CLI / GUI 결과창 출력용)"""
+    lines = [f"{'코인':8}{'평가금액':>14}{'손익':>12}{'수익률':>9}{'비중':>7}"]
+    for h in portfolio['holdings']:
+        if h['price'] is None:
+            continue
+        rate = f"{h['pnl_rate'] * 100:+.2f}%" if h['pnl_rate'] is not None else '-'
+        lines.append(f"{h['currency']:8}{h['value']:14,.0f}{h['pnl']:+12,.0f}{rate:>9}{h['weight'] * 100:6.1f}%")
+
+    rate = f" ({portfolio['pnl_rate'] * 100:+.2f}%)" if portfolio['pnl_rate'] is not None else ''
+    lines += [
+        f"현금: {portfolio['cash']:,.0f}원",
+        f"총 평가금액: {portfolio['total']:,.0f}원",
+        f"평가 손익: {portfolio['pnl']:+,.0f}원{rate}",
+    ]
+    if portfolio['unpriced']:
+        lines.append(f"시세 없음: {', '.join(portfolio['unpriced'])}")
+    return '\n'.join(lines)
@@ -0,0 +1,195 @@
+"""
+클라이언트 측 요청 속도 제한 + 재시도
+토큰 버킷으로 public / private 요청 예산을 따로 관리하고,
+429 / 5xx 응답은 지터를 준 지수 백오프로 재시도 (안전한 요청만)
+"""
+import random
+import threading
+import time
+
+# 빗썸 API 요청 수 제한 (초당)
+PUBLIC_RATE = 150
+PRIVATE_RATE = 140
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class TokenBucket:
+    """
+    토큰 버킷 (스레드 / asyncio 공용)
+
+    토큰을 먼저 예약하고 필요한 대기 시간만 돌려주므로
+    락은 아주 잠깐만 잡고, 실제 대기는 time.sleep / asyncio.sleep 으로 처리함
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate (float): 초당 충전되는 토큰 수
+            capacity (float, optional): 최대 토큰 수 (순간 허용량, 기본값 rate)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self, tokens=1):
+        """
+        토큰 예약
+
+        Returns:
+            float: 예약한 토큰을 쓸 수 있을 때까지 기다려야 하는 시간 (초)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            self.calls += 1
+            if wait > 0:
+                self.waited += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self, tokens=1):
+        """토큰 확보 (필요하면 현재 스레드 대기)"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens=1):
+        """토큰 확보 (필요하면 코루틴 대기)"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            import asyncio
+            await asyncio.sleep(wait)
+        return wait
+
+    def metrics(self):
+        return {
+            'rate': self.rate,
+            'calls': self.calls,
+            'waited': self.waited,
+            'total_wait': self.total_wait,
+            'max_wait': self.max_wait,
+            'avg_wait': self.total_wait / self.calls if self.calls else 0.0,
+        }
+
+
+class RetryPolicy:
+    """
+    재시도 정책 - 지수 백오프 + Full Jitter
+
+    - 429: 서버가 요청을 처리하지 않았으므로 모든 요청 재시도
+    - 5xx / 연결 오류: 조회(GET) 처럼 다시 보내도 안전한 요청만 재시도
+      (주문 POST 는 실제로 체결되었을 수 있으므로 재시도하지 않음)
+    """
+
+    def __init__(self, max_retries=3, base_delay=0.2, max_delay=5.0, statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = statuses
+
+    def should_retry(self, method, attempt, status=None):
+        """
+        Args:
+            method (str): HTTP 메서드
+            attempt (int): 지금까지 재시도한 횟수
+            status (int, optional): 응답 코드 (None 이면 연결 오류)
+        """
+        if attempt >= self.max_retries:
+            return False
+        if status == 429:
+            return True
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        return status is None or status in self.statuses
+
+    def delay(self, attempt, retry_after=None):
+        """
+        재시도 전 대기 시간 (초)
+
+        Args:
+            attempt (int): 지금까지 재시도한 횟수
+            retry_after (str, optional): 응답의 Retry-After 헤더
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class RateLimiter:
+    """요청 그룹(public / private)별 토큰 버킷 모음 + 재시도 통계"""
+
+    def __init__(self, public_rate=PUBLIC_RATE, private_rate=PRIVATE_RATE, retry=None):
+        self.buckets = {
+            'public': TokenBucket(public_rate),
+            'private': TokenBucket(private_rate),
+        }
+        self.retry = retry or RetryPolicy()
+        self.retries = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, group):
+        return self.buckets[group]
+
+    def acquire(self, group):
+        return self.buckets[group].acquire()
+
+    async def acquire_async(self, group):
+        return await self.buckets[group].acquire_async()
+
+    def record_retry(self, group, status):
+        """재시도 횟수 기록 (status 가 None 이면 연결 오류)"""
+        with self._lock:
+            key = (group, status or 'error')
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    def metrics(self):
+        """
+        대기 / 재시도 통계
+
+        Returns:
+            dict: {'public': {...}, 'private': {...}, 'retries': {'public:429': 3, ...}}
+        """
+        result = {group: bucket.metrics() for group, bucket in self.buckets.items()}
+        with self._lock:
+            result['retries'] = {f'{group}:{status}': count for (group, status), count in self.retries.items()}
+        return result
+
+
+def endpoint_group(path):
+    """API 경로 → 요청 그룹 ('public' / 'private')"""
+    # /v1/orderbook 은 공개 API 이므로 /v1/order 는 정확히 일치할 때만 private
+    if path == '/v1/order' or path.startswith(('/v1/orders', '/v1/accounts')):
+        return 'private'
+    return 'public'
+
+
+_default_limiter = RateLimiter()
+
+
+def get_limiter():
+    """동기 / 비동기 클라이언트가 공유하는 기본 RateLimiter"""
+    return _default_limiter
+
+
+def set_limiter(limiter):
+    """기본 RateLimiter 교체 (이전 값 반환)"""
+    global _default_limiter
+    previous, _default_limiter = _default_limiter, limiter
+    return previous
@@ -1,20 +1,50 @@
-from dotenv import load_dotenv
-import os
-from utils import get_param_jwt
-import requests
+from utils import JWTAuth
+from client import API_URL, get_client
+from credentials import get_provider
+from market_catalog import MarketCatalog, get_catalog
+from market_stream import get_price_cache, orderbook_from_stream
+from journal import get_journal
 import json
-from collections import defaultdict
+import time
+from decimal import Decimal
 
-API_URL = "https://api.bithumb.com"
+API_KEY_MISSING = 'API 키가 설정되지 않았습니다. 설정에서 API 키를 입력하세요.'
+
+# 일괄 조회 시 markets 파라미터(URL 인코딩 후) 최대 길이
+MAX_MARKETS_QUERY_LENGTH = 1800
+
+# 빗썸 최소 주문 금액 (KRW)
+MIN_ORDER_AMOUNT = 5000
+
+# 주문 일괄 조회 시 요청당 최대 UUID 수
+MAX_ORDER_UUIDS = 100
+
+# WebSocket 시세 캐시를 REST 대신 사용할 최대 경과 시간 (초)
+STREAM_MAX_AGE = 30
+
+# 캔들 간격: (API 경로, 캔들 길이(초))
+CANDLE_INTERVALS = {
+    **{f'{unit}m': (f'/v1/candles/minutes/{unit}', unit * 60) for unit in (1, 3, 5, 10, 15, 30, 60, 240)},
+    '1d': ('/v1/candles/days', 86400),
+}
+
+# 캔들 조회 시 요청당 최대 개수
+MAX_CANDLES = 200
 
 
 def get_api_keys():
     """
     API 키를 동적으로 로드
-    .env 파일이 변경되어도 재시작 없이 바로 반영됨
+    .env 파일이 변경되어도 재시작 없이 바로 반영됨 (변경 시에만 다시 파싱)
+    """
+    return get_provider().get()
+
+
+def reload_api_keys():
     """
-    load_dotenv(override=True)  # 매번 최신 값으로 로드
-    return os.getenv("ACCESS_KEY"), os.getenv("SECRET_KEY")
+    .env 파일을 즉시 다시 읽음 (키 저장 직후 호출)
+    """
+    return get_provider().reload()
 
 
 # ==================== 주문 API ====================
@@ -33,26 +63,37 @@ def market_order(market, side, ord_type, price=None, volume=None):
     Returns:
         dict: API 응답 결과
     """
+    request_body = _market_order_body(market, side, ord_type, price, volume)
+    if request_body is None:
+        return {'error': f'잘못된 ord_type: {ord_type}'}
+    
+    return _send_order(request_body)
+
+
+def _market_order_body(market, side, ord_type, price=None, volume=None):
+    """
+    시장가 주문 요청 바디 생성 (내부 함수)
+    
+    Returns:
+        dict: 주문 요청 바디 (잘못된 ord_type이면 None)
+    """
     # 시장가 매수: ord_type='price', price만 전송
     if ord_type == 'price':
-        request_body = {
+        return {
             'market': market,
             'side': side,
-            'price': str(price),
+            'price': _number(price),
             'ord_type': 'price'
         }
     # 시장가 매도: ord_type='market', volume만 전송
-    elif ord_type == 'market':
-        request_body = {
+    if ord_type == 'market':
+        return {
             'market': market,
             'side': side,
-            'volume': str(volume),
+            'volume': _number(volume),
             'ord_type': 'market'
         }
-    else:
-        return {'error': f'잘못된 ord_type: {ord_type}'}
-    
-    return _send_order(request_body)
+    return None
 
 
 def limit_order(market, side, volume, price):
@@ -68,15 +109,23 @@ def limit_order(market, side, volume, price):
     Returns:
         dict: API 응답 결과
     """
-    request_body = {
+    return _send_order(_limit_order_body(market, side, volume, price))
+
+
+def _limit_order_body(market, side, volume, price):
+    """지정가 주문 요청 바디 생성 (내부 함수)"""
+    return {
         'market': market,
         'side': side,
-        'volume': str(volume),
-        'price': str(price),
+        'volume': _number(volume),
+        'price': _number(price),
         'ord_type': 'limit'
     }
-    
-    return _send_order(request_body)
+
+
+def _number(value):
+    """주문 수량 / 가격 문자열 (Decimal 은 지수 표기 없이 그대로)"""
+    return format(value, 'f') if isinstance(value, Decimal) else str(value)
 
 
 def _send_order(request_body):
@@ -93,25 +142,60 @@ def _send_order(request_body):
     access_key, secret_key = get_api_keys()
     
     if not access_key or not secret_key:
-        return {'error': 'API 키가 설정되지 않았습니다. 설정에서 API 키를 입력하세요.'}
-    
-    # JWT 토큰 생성
-    authorization_token = get_param_jwt(access_key, secret_key, request_body)
+        return {'error': API_KEY_MISSING}
     
+    # JWT 토큰은 전송 시점에 생성 (429 재시도 시 새 nonce)
     headers = {
-        'Authorization': authorization_token,
         'Content-Type': 'application/json'
     }
     
+    started = time.perf_counter()
     try:
-        response = requests.post(
-            API_URL + '/v1/orders',
+        response = get_client().post(
+            '/v1/orders',
             data=json.dumps(request_body),
-            headers=headers
+            headers=headers,
+            auth=JWTAuth(access_key, secret_key, request_body)
         )
-        return response.json()
+        result = response.json()
     except Exception as e:
-        return {'error': str(e)}
+        result = {'error': str(e)}
+    
+    journal = get_journal()
+    if journal.enabled:
+        journal.record_order('order', request_body, result, time.perf_counter() - started)
+    return result
+
+
+def cancel_order(uuid):
+    """
+    주문 취소
+
+    Args:
+        uuid (str): 취소할 주문 UUID
+
+    Returns:
+        dict: API 응답 결과 (취소 요청이 접수된 주문 정보)
+    """
+    access_key, secret_key = get_api_keys()
+
+    if not access_key or not secret_key:
+        return {'error': API_KEY_MISSING}
+
+    params = {'uuid': uuid}
+
+    started = time.perf_counter()
+    try:
+        response = get_client().delete('/v1/order', params=params,
+                                       auth=JWTAuth(access_key, secret_key, params))
+        result = response.json()
+    except Exception as e:
+        result = {'error': str(e)}
+
+    journal = get_journal()
+    if journal.enabled:
+        journal.record_order('cancel', params, result, time.perf_counter() - started)
+    return result
 
 
 # ==================== 조회 API ====================
@@ -134,22 +218,124 @@ def get_my_balance():
     access_key, secret_key = get_api_keys()
     
     if not access_key or not secret_key:
-        return [{'error': 'API 키가 설정되지 않았습니다. 설정에서 API 키를 입력하세요.'}]
-    
-    authorization_token = get_param_jwt(access_key, secret_key, {})
+        return [{'error': API_KEY_MISSING}]
     
     headers = {
-        'Authorization': authorization_token,
         'Content-Type': 'application/json'
     }
     
     try:
-        response = requests.get(f'{API_URL}/v1/accounts', headers=headers)
+        response = get_client().get('/v1/accounts', headers=headers,
+                                    auth=JWTAuth(access_key, secret_key, {}))
         return response.json()
     except Exception as e:
         return {'error': str(e)}
 
 
+def get_order(uuid):
+    """
+    개별 주문 조회 (체결 내역 포함)
+
+    Args:
+        uuid (str): 주문 UUID
+
+    Returns:
+        dict: 주문 정보
+            {
+                'uuid': '...',
+                'state': 'done',          # wait / watch / done / cancel
+                'executed_volume': '0.001',
+                'paid_fee': '40',
+                'trades': [{'price': '...', 'volume': '...', 'funds': '...'}, ...],
+                ...
+            }
+    """
+    access_key, secret_key = get_api_keys()
+
+    if not access_key or not secret_key:
+        return {'error': API_KEY_MISSING}
+
+    params = {'uuid': uuid}
+
+    try:
+        response = get_client().get('/v1/order', params=params,
+                                    auth=JWTAuth(access_key, secret_key, params))
+        return response.json()
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def get_orders(uuids):
+    """
+    여러 주문 상태 일괄 조회 (요청당 최대 MAX_ORDER_UUIDS 개씩 묶어서 조회)
+
+    Args:
+        uuids (list): 주문 UUID 리스트
+
+    Returns:
+        dict: {uuid: 주문 정보} - 조회에 실패한 주문은 포함되지 않음 (체결 내역 trades 는 없음)
+    """
+    access_key, secret_key = get_api_keys()
+
+    if not access_key or not secret_key:
+        return {}
+
+    orders = {}
+    uuids = list(dict.fromkeys(uuids))
+    for start in range(0, len(uuids), MAX_ORDER_UUIDS):
+        # 배열 파라미터는 인코딩하지 않은 uuids[]=a&uuids[]=b 형식으로 보내고 같은 문자열로 query_hash 계산
+        chunk = uuids[start:start + MAX_ORDER_UUIDS]
+        params = f'limit={len(chunk)}&' + '&'.join(f'uuids[]={uuid}' for uuid in chunk)
+        try:
+            response = get_client().get('/v1/orders', params=params,
+                                        auth=JWTAuth(access_key, secret_key, params))
+            items = response.json()
+        except Exception as e:
+            continue
+        if isinstance(items, list):
+            for item in items:
+                orders[item['uuid']] = item
+
+    return orders
+
+
+def get_open_orders(market, side=None):
+    """
+    마켓의 미체결 주문 전체 조회 (페이지 단위로 끝까지)
+
+    Args:
+        market (str): 마켓 ID (예: 'KRW-BTC')
+        side (str, optional): 'bid' / 'ask' 만 조회
+
+    Returns:
+        list: 미체결 주문 리스트 (조회 실패 시 [{'error': ...}])
+    """
+    access_key, secret_key = get_api_keys()
+
+    if not access_key or not secret_key:
+        return [{'error': API_KEY_MISSING}]
+
+    orders = []
+    page = 1
+    while True:
+        params = {'market': market, 'state': 'wait', 'page': page, 'limit': MAX_ORDER_UUIDS}
+        try:
+            response = get_client().get('/v1/orders', params=params,
+                                        auth=JWTAuth(access_key, secret_key, params))
+            items = response.json()
+        except Exception as e:
+            return [{'error': str(e)}]
+        if not isinstance(items, list):
+            return [{'error': items.get('error', items) if isinstance(items, dict) else items}]
+
+        orders += items
+        if len(items) < MAX_ORDER_UUIDS:
+            break
+        page += 1
+
+    return [o for o in orders if side is None or o.get('side') == side]
+
+
 def get_current_price(market):
     """
     현재가 조회
@@ -160,17 +346,111 @@ def get_current_price(market):
     Returns:
         float: 현재 거래가
     """
+    ticker = get_current_prices([market]).get(market)
+    return ticker['trade_price'] if ticker else None
+
+
+def get_current_prices(markets):
+    """
+    여러 마켓 현재가 일괄 조회
+    WebSocket 시세 캐시(market_stream.py)에 최신 값이 있으면 그대로 사용하고,
+    나머지만 /v1/ticker 로 조회함 - markets 목록은 URL 길이 한도 안에서 최대한 묶어서 요청
+    
+    Args:
+        markets (list): 마켓 ID 리스트 (예: ['KRW-BTC', 'KRW-ETH'])
+    
+    Returns:
+        dict: {마켓코드: 티커 정보} - 조회에 실패한 마켓은 포함되지 않음
+            {'KRW-BTC': {'market': 'KRW-BTC', 'trade_price': 100000000, ...}, ...}
+    """
     headers = {"accept": "application/json"}
+    tickers, missing = _cached_tickers(markets)
+    
+    for chunk in _chunk_markets(missing):
+        try:
+            response = get_client().get(
+                '/v1/ticker',
+                headers=headers,
+                params={'markets': ','.join(chunk)}
+            )
+            for item in response.json():
+                tickers[item['market']] = item
+        except Exception as e:
+            continue
+    
+    return tickers
+
+
+def _cached_tickers(markets):
+    """
+    WebSocket 시세 캐시에서 최신 티커 찾기 (동기 / asyncio 클라이언트 공용, 내부 함수)
+
+    Returns:
+        tuple: ({마켓코드: 티커 정보}, 캐시에 없어 조회해야 할 마켓 리스트)
+    """
+    tickers = {}
+    missing = []
+    cache = get_price_cache()
+    for market in markets:
+        ticker = cache.get('ticker', market, max_age=STREAM_MAX_AGE)
+        if ticker is not None:
+            tickers[market] = ticker
+        else:
+            missing.append(market)
+    return tickers, missing
+
+
+def _chunk_markets(markets, max_length=MAX_MARKETS_QUERY_LENGTH):
+    """
+    마켓 목록을 URL 인코딩 후 길이가 max_length 이하가 되도록 분할 (내부 함수)
+    중복 마켓은 제거하고 순서는 유지함
+    """
+    chunk = []
+    length = 0
+    
+    for market in dict.fromkeys(markets):
+        # 쉼표는 %2C (3자) 로 인코딩됨
+        size = len(market) + (3 if chunk else 0)
+        if chunk and length + size > max_length:
+            yield chunk
+            chunk, length = [], 0
+            size = len(market)
+        chunk.append(market)
+        length += size
+    
+    if chunk:
+        yield chunk
+
+
+def get_candles(market, interval='1m', to=None, count=MAX_CANDLES):
+    """
+    캔들 조회 (최신 캔들부터)
+    
+    Args:
+        market (str): 마켓 ID (예: 'KRW-BTC')
+        interval (str): 캔들 간격 ('1m', '3m', ..., '240m', '1d')
+        to (str, optional): 이 시각 이전 캔들만 (UTC, 'yyyy-MM-ddTHH:mm:ssZ', 없으면 현재)
+        count (int): 최대 개수 (최대 200)
+    
+    Returns:
+        list: 캔들 리스트 (오류 시 {'error': ...})
+    """
+    if interval not in CANDLE_INTERVALS:
+        return {'error': f'잘못된 캔들 간격: {interval}'}
+    
+    params = {'market': market, 'count': count}
+    if to:
+        params['to'] = to
     
     try:
-        response = requests.get(
-            f'{API_URL}/v1/ticker',
-            headers=headers,
-            params={'markets': market}
+        response = get_client().get(
+            CANDLE_INTERVALS[interval][0],
+            headers={"accept": "application/json"},
+            params=params
         )
-        return response.json()[0]['trade_price']
+        return response.json()
     except Exception as e:
-        return None
+        return {'error': str(e)}
 
 
 def get_orderbook(market):
@@ -183,11 +463,15 @@ def get_orderbook(market):
     Returns:
         dict: 호가 정보
     """
+    cached = get_price_cache().get('orderbook', market, max_age=STREAM_MAX_AGE)
+    if cached is not None:
+        return [orderbook_from_stream(cached)]
+    
     headers = {"accept": "application/json"}
     
     try:
-        response = requests.get(
-            f'{API_URL}/v1/orderbook',
+        response = get_client().get(
+            '/v1/orderbook',
             headers=headers,
             params={'markets': market}
         )
@@ -196,25 +480,29 @@ def get_orderbook(market):
         return {'error': str(e)}
 
 
-def get_markets():
+def get_markets(quote=None):
     """
     전체 마켓 코드 조회
+    마켓 목록은 파일에 캐시되며 TTL이 지나면 백그라운드에서 갱신됨 (market_catalog.py)
+    
+    Args:
+        quote (str, optional): 기준 통화 필터 (예: 'KRW')
     
     Returns:
         dict: {한글명: 마켓코드} 형태의 딕셔너리
             {'비트코인': 'KRW-BTC', '이더리움': 'KRW-ETH', ...}
+            같은 한글명의 마켓이 여러 개면 '비트코인 (BTC-XXX)' 처럼 마켓코드를 붙여 모두 포함
+            (원화 주문 화면은 quote='KRW' 로 호출)
     """
-    headers = {"accept": "application/json"}
-    
     try:
-        response = requests.get(f'{API_URL}/v1/market/all', headers=headers)
-        markets = defaultdict(str)
-        
-        for item in response.json():
-            # 중복된 한글명이 있으면 첫 번째만 사용
-            if not markets.get(item['korean_name']):
-                markets[item['korean_name']] = item['market']
-        
-        return dict(markets)
+        return get_catalog().korean_names(quote)
     except Exception as e:
         return {}
+
+
+def _parse_markets(items, quote=None):
+    """
+    /v1/market/all 응답을 {한글명: 마켓코드} 로 변환 (내부 함수)
+    같은 한글명의 마켓이 여러 개면 '한글명 (마켓코드)' 로 모두 포함 (MarketCatalog.korean_names)
+    """
+    return MarketCatalog(items).korean_names(quote)
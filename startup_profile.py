@@ -0,0 +1,106 @@
+"""
+시작 시간 측정 (--profile-startup)
+패키지별 import 시간과 첫 화면 / 마켓 목록 / 첫 시세까지 걸린 시간을 출력함
+
+PyInstaller EXE 에서는 python -X importtime 을 쓸 수 없으므로 __import__ 를 감싸서 직접 측정함
+다른 모듈보다 먼저 import 해서 start() 를 호출해야 함 (측정하지 않을 때는 mark() 만 남고 비용 없음)
+"""
+import builtins
+import sys
+import threading
+import time
+
+PROFILE_FLAG = '--profile-startup'
+
+_profiler = None
+
+
+class StartupProfiler:
+    """import 시간 / 단계별 경과 시간 기록"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = []
+        self.imports = {}  # 최상위 패키지 → 자체 import 시간 (하위 import 제외)
+        self._original = None
+        self._local = threading.local()  # 스레드별 import 중첩 (백그라운드 스레드 import 도 측정)
+        self._lock = threading.Lock()
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # 이미 로드된 모듈 / 상대 import 는 측정하지 않음
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            package = name.partition('.')[0]
+            with self._lock:
+                self.imports[package] = self.imports.get(package, 0.0) + elapsed - children
+
+    def mark(self, name):
+        """단계 기록 (시작 후 경과 시간)"""
+        self.marks.append((name, time.perf_counter() - self.started))
+
+    def report(self, top=15):
+        """측정 결과 문자열"""
+        total = sum(self.imports.values())
+        lines = ["⏱️ 시작 시간 (--profile-startup)", f"{'단계':24}{'경과(ms)':>10}"]
+        lines += [f"{name:24}{elapsed * 1000:10.1f}" for name, elapsed in self.marks]
+        lines += ["", f"import 합계 {total * 1000:.1f}ms (모든 스레드) - 패키지별 (하위 패키지 import 제외)"]
+        ranked = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+        lines += [f"  {package:22}{seconds * 1000:10.1f}" for package, seconds in ranked[:top]]
+        return '\n'.join(lines)
+
+
+def start(argv=None):
+    """
+    argv 에 --profile-startup 이 있으면 측정 시작 (플래그는 argv 에서 제거)
+
+    Returns:
+        StartupProfiler: 측정 중이면 프로파일러, 아니면 None
+    """
+    global _profiler
+    argv = sys.argv if argv is None else argv
+    if PROFILE_FLAG in argv and _profiler is None:
+        argv.remove(PROFILE_FLAG)
+        _profiler = StartupProfiler()
+        _profiler.install()
+    return _profiler
+
+
+def get_profiler():
+    """측정 중인 프로파일러 (없으면 None)"""
+    return _profiler
+
+
+def mark(name):
+    """측정 중이면 단계 기록"""
+    if _profiler is not None:
+        _profiler.mark(name)
+
+
+def finish(top=15):
+    """측정 종료 후 결과 출력"""
+    if _profiler is None:
+        return
+    _profiler.uninstall()
+    print(_profiler.report(top), flush=True)
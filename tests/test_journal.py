@@ -0,0 +1,52 @@
+"""journal.Journal - 시장가 체결 재조회 / report() 전 flush"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal import Journal
+
+
+def market_sell(uuid):
+    return {'uuid': uuid, 'market': 'KRW-XRP', 'side': 'ask', 'ord_type': 'market', 'state': 'done',
+            'executed_volume': '10', 'paid_fee': '2'}
+
+
+def done_event(order):
+    return {'type': 'done', 'uuid': order['uuid'], 'executed_volume': order['executed_volume'], 'order': order}
+
+
+def test_market_order_lookup_runs_off_writer_thread(tmp_path):
+    threads = []
+
+    def fetch(uuid):
+        threads.append(threading.current_thread().name)
+        return dict(market_sell(uuid), trades=[{'funds': '6500'}])
+
+    journal = Journal(str(tmp_path / 'journal.db'), enabled=True, fetch_order=fetch)
+    try:
+        journal.on_order_event(done_event(market_sell('u1')))
+        # flush 없이 report() 만 불러도 방금 넣은 체결이 보여야 함
+        report = journal.report()
+    finally:
+        journal.close()
+
+    assert threads == ['journal-lookup']
+    assert report['KRW-XRP']['sells'] == 1
+    assert report['KRW-XRP']['volume'] == 6500
+
+
+def test_limit_order_skips_lookup(tmp_path):
+    def fetch(uuid):
+        raise AssertionError("지정가 주문은 재조회하지 않음")
+
+    journal = Journal(str(tmp_path / 'journal.db'), enabled=True, fetch_order=fetch)
+    order = dict(market_sell('u2'), ord_type='limit', price='650')
+    try:
+        journal.on_order_event(done_event(order))
+        journal.flush()
+        fills = journal.fills()
+    finally:
+        journal.close()
+    assert [f['funds'] for f in fills] == [6500.0]
@@ -0,0 +1,72 @@
+"""market_stream.MarketStream - 대역 WebSocket 서버로 깨진 프레임 / 연결 끊김 / 재연결"""
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import pytest
+
+pytest.importorskip('websocket')
+
+from market_stream import MarketStream, PriceCache
+from mock_ws_server import MockWebSocketServer
+
+
+def ticker(price):
+    return {'type': 'ticker', 'code': 'KRW-BTC', 'trade_price': price}
+
+
+class RecordingCache(PriceCache):
+    """clear() 호출을 알려주는 캐시"""
+
+    def __init__(self):
+        super().__init__()
+        self.cleared = threading.Event()
+
+    def clear(self, markets=None):
+        super().clear(markets)
+        self.cleared.set()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_bad_frame_disconnect_and_resubscribe():
+    # 연결마다 메시지 3개 (가운데는 깨진 JSON) 를 보낸 뒤 서버가 끊음
+    messages = [ticker(100.0), '{"type": "ticker", "code": ', ticker(101.0)]
+    received = []
+    cache = RecordingCache()
+
+    with MockWebSocketServer(messages, drop_after=len(messages)) as server:
+        stream = MarketStream(['KRW-BTC'], channels=('ticker',), url=server.url, cache=cache,
+                              reconnect_delay=0.5, on_message=lambda m: received.append(
+                                  (server.connections, m['trade_price'])))
+        stream.start()
+        try:
+            # 깨진 프레임은 건너뛰고 같은 연결에서 다음 메시지를 받음
+            assert wait_until(lambda: len(received) >= 2)
+            assert received[:2] == [(1, 100.0), (1, 101.0)]
+
+            # 서버가 끊으면 더 이상 최신이 아닌 값을 버림 (재연결 대기 중에는 비어 있음)
+            assert cache.cleared.wait(5)
+            assert cache.get('ticker', 'KRW-BTC') is None
+
+            # 재연결 후 같은 마켓을 다시 구독하고 시세를 다시 받음
+            assert wait_until(lambda: len(received) >= 4)
+            assert received[2:4] == [(2, 100.0), (2, 101.0)]
+            assert stream.reconnects >= 1
+            assert len(server.subscriptions) >= 2
+            assert all({'type': 'ticker', 'codes': ['KRW-BTC']} in request
+                       for request in server.subscriptions)
+        finally:
+            stream.stop(timeout=1)
@@ -0,0 +1,44 @@
+"""order_cancel.cancel_replace_async - 정정 가격은 취소 전에 호가 단위에 맞춤"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from order_cancel import cancel_replace_async
+
+
+class FakeClient:
+    """취소 / 지정가 주문 요청만 기록"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def cancel_order(self, uuid):
+        self.calls.append(('cancel', uuid))
+        return {'uuid': uuid, 'market': 'KRW-XRP', 'side': 'bid', 'remaining_volume': '10'}
+
+    async def limit_order(self, market, side, volume, price):
+        self.calls.append(('limit', market, side, volume, price))
+        return {'uuid': 'new-' + price}
+
+
+@pytest.mark.parametrize('side, expected', [('bid', '2951'), ('ask', '2952')])
+def test_price_snapped_before_order(side, expected):
+    client = FakeClient()
+    [outcome] = asyncio.run(cancel_replace_async(client, [{'uuid': 'a', 'side': side, 'price': '2951.3'}]))
+    assert outcome['ok']
+    assert client.calls == [('cancel', 'a'), ('limit', 'KRW-XRP', side, '10', expected)]
+
+
+def test_off_tick_price_without_side_is_not_cancelled():
+    client = FakeClient()
+    outcomes = asyncio.run(cancel_replace_async(client, [{'uuid': 'a', 'price': '2951.3'},
+                                                         {'uuid': 'b', 'price': '2950'}]))
+    assert [o['ok'] for o in outcomes] == [False, True]
+    assert outcomes[0]['cancel'] is None
+    assert ('cancel', 'a') not in client.calls
@@ -0,0 +1,34 @@
+"""order_tracker.OrderTracker.wait / wait_all - 추적하지 않는 주문"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from order_tracker import OrderTracker
+
+
+def fetch_done(uuids):
+    return {u: {'uuid': u, 'state': 'done', 'executed_volume': '1'} for u in uuids}
+
+
+def test_wait_returns_finished_order():
+    tracker = OrderTracker(fetch=fetch_done, min_interval=0.01)
+    uuid = tracker.track('a', market='KRW-BTC', side='bid')
+    assert tracker.wait(uuid, timeout=1)['status'] == 'done'
+
+
+def test_wait_unknown_uuid_raises():
+    # timeout=None 이어도 영원히 기다리지 않음
+    tracker = OrderTracker(fetch=fetch_done, min_interval=0.01)
+    with pytest.raises(KeyError):
+        tracker.wait('missing')
+
+
+def test_wait_all_evicted_uuid_raises():
+    tracker = OrderTracker(fetch=fetch_done, min_interval=0.01, max_finished=1)
+    first = tracker.track({'uuid': 'a', 'state': 'done', 'executed_volume': '1'})
+    tracker.track({'uuid': 'b', 'state': 'done', 'executed_volume': '1'})
+    with pytest.raises(KeyError):
+        tracker.wait_all([first, 'b'])
@@ -0,0 +1,20 @@
+"""rate_limit.endpoint_group - 요청 그룹 분류"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from rate_limit import endpoint_group
+
+
+@pytest.mark.parametrize('path', ['/v1/order', '/v1/orders', '/v1/orders/chance', '/v1/accounts'])
+def test_private_endpoints(path):
+    assert endpoint_group(path) == 'private'
+
+
+@pytest.mark.parametrize('path', ['/v1/orderbook', '/v1/ticker', '/v1/market/all', '/v1/candles/minutes/1'])
+def test_public_endpoints(path):
+    # /v1/orderbook 이 주문 토큰 버킷을 쓰면 실제 주문 / 취소가 느려짐
+    assert endpoint_group(path) == 'public'
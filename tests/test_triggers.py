@@ -0,0 +1,75 @@
+"""triggers.TriggerEngine - 녹화 시세 재생으로 발동 순서 / OCO 취소 확인"""
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from triggers import CANCELLED, FIRED, TriggerEngine, dry_run_order, load_ticks, replay
+
+RECORDED = os.path.join(ROOT, 'benchmarks', 'data', 'ws_replay.jsonl')
+
+
+def make_engine():
+    engine = TriggerEngine(send=dry_run_order, background=False)
+    events = []
+    engine.add_listener(events.append)
+    return engine, events
+
+
+def write_ticks(path, ticks):
+    with open(path, 'w', encoding='utf-8') as f:
+        for ts, (market, price) in enumerate(ticks, 1):
+            f.write(json.dumps({'type': 'ticker', 'code': market, 'trade_price': price, 'timestamp': ts}) + '\n')
+    return path
+
+
+def test_replay_firing_order_and_oco_cancel(tmp_path):
+    engine, events = make_engine()
+    stop = engine.stop_loss('KRW-XRP', 660, 10)
+    oco_stop, oco_take = engine.oco('KRW-XRP', stop_price=600, take_price=750, volume=5)
+    take_high = engine.take_profit('KRW-XRP', 800, 1)
+    take_low = engine.take_profit('KRW-XRP', 780, 2)
+    btc = engine.stop_loss('KRW-BTC', 90_000_000, 0.001)
+
+    path = write_ticks(tmp_path / 'ticks.jsonl', [
+        ('KRW-XRP', 700), ('KRW-BTC', 95_000_000),
+        ('KRW-XRP', 650),                   # 손절 660
+        ('KRW-XRP', 760),                   # OCO 익절 750 → 같은 묶음의 손절 600 취소
+        ('KRW-XRP', 590),                   # 취소된 OCO 손절은 발동하지 않음
+        ('KRW-XRP', 820),                   # 한 시세에 둘 - 기준이 낮은 780 먼저
+    ])
+    fired = replay(engine, load_ticks(path))
+
+    assert [t['id'] for t in fired] == [stop, oco_take, take_low, take_high]
+    assert [t['fired_ts'] for t in fired] == [3, 4, 6, 6]
+    assert engine.get(oco_take)['status'] == FIRED
+    assert engine.get(oco_stop)['status'] == CANCELLED
+    assert [t['id'] for t in engine.triggers()] == [btc]
+
+    # OCO 익절 시세: 발동 → 나머지 취소 → 주문 순서로 이벤트
+    oco_events = [(e['type'], e['trigger']['id']) for e in events if e['trigger']['id'] in (oco_stop, oco_take)]
+    assert oco_events == [('fire', oco_take), ('cancel', oco_stop), ('order', oco_take)]
+    orders = [e['result'] for e in events if e['type'] == 'order']
+    assert [o['volume'] for o in orders] == [10, 5, 2, 1]
+    assert all(o['dry_run'] and o['side'] == 'ask' for o in orders)
+
+
+def test_recorded_stream_fires_first_crossed_side():
+    ticks = list(load_ticks(RECORDED))
+    prices = [t['trade_price'] for t in ticks if t['code'] == 'KRW-XRP']
+    stop_price = (prices[0] + min(prices)) / 2
+    take_price = (prices[0] + max(prices)) / 2
+    first_cross = next(p for p in prices if p <= stop_price or p >= take_price)
+
+    engine, events = make_engine()
+    stop, take = engine.oco('KRW-XRP', stop_price=stop_price, take_price=take_price, volume=1)
+    fired = replay(engine, ticks)
+
+    expected, sibling = (stop, take) if first_cross <= stop_price else (take, stop)
+    assert [t['id'] for t in fired] == [expected]
+    assert fired[0]['fired_price'] == first_cross
+    assert engine.get(sibling)['status'] == CANCELLED
+    assert len(engine) == 0
+    assert [e['type'] for e in events] == ['fire', 'cancel', 'order']
@@ -0,0 +1,34 @@
+"""volume_engine - 체결 대기 시간 초과 시 보유 수량"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import volume_engine
+from volume_engine import OrderFailed, VolumeEngine
+
+
+def test_partial_bid_timeout_keeps_holding(monkeypatch):
+    # 일부만 체결된 채 끝나지 않는 시장가 매수
+    order = {'uuid': 'u1', 'side': 'bid', 'ord_type': 'price', 'state': 'wait', 'executed_volume': '0.5'}
+    monkeypatch.setattr(volume_engine, 'market_order', lambda *args, **kwargs: {'uuid': 'u1'})
+    monkeypatch.setattr(volume_engine, 'get_order', lambda uuid: dict(order))
+    monkeypatch.setattr(volume_engine, 'get_current_price', lambda market: 1000.0)
+
+    engine = VolumeEngine('KRW-XRP', target_volume=100_000, cycle_amount=10_000, fill_timeout=0.05)
+    with pytest.raises(OrderFailed) as e:
+        engine.run_cycle()
+    assert e.value.order['executed_volume'] == '0.5'
+    assert engine.holding == '0.5'
+
+
+def test_reference_price_fetched_once_per_run(monkeypatch):
+    calls = []
+    monkeypatch.setattr(volume_engine, 'get_current_price', lambda market: calls.append(market) or 1000.0)
+    engine = VolumeEngine('KRW-XRP', target_volume=100_000, cycle_amount=10_000)
+    assert engine._reference_price() == 1000.0
+    engine._last_price = 1010.0  # 직전 매도 평균가
+    assert engine._reference_price() == 1010.0
+    assert calls == ['KRW-XRP']
@@ -0,0 +1,572 @@
+"""
+조건부 주문 (손절 / 익절 / OCO)
+가격이 기준에 닿으면 미리 정해둔 시장가 / 지정가 주문을 바로 보냄
+
+마켓마다 '이상' 조건은 최소 힙, '이하' 조건은 최대 힙에 보관해서
+시세 하나가 들어올 때 힙 꼭대기만 확인함 (발동하지 않으면 O(1), 발동한 조건마다 O(log n))
+취소된 조건은 힙에서 바로 빼지 않고 꺼낼 때 건너뜀 (많이 쌓이면 힙을 다시 만듦)
+
+시세 공급: REST 폴링 (start_polling), WebSocket (start_stream), 녹화 데이터 재생 (replay)
+"""
+import heapq
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from service import get_current_prices, limit_order, market_order
+
+# 조건
+ABOVE = 'above'   # 가격 >= 기준 (익절 매도, 돌파 매수)
+BELOW = 'below'   # 가격 <= 기준 (손절 매도, 눌림 매수)
+CONDITIONS = (ABOVE, BELOW)
+
+# 조건 상태
+ACTIVE = 'active'
+FIRED = 'fired'
+CANCELLED = 'cancelled'
+
+# 힙 항목 중 취소된 것이 이 수 이상이고 절반을 넘으면 힙을 다시 만듦
+COMPACT_MIN = 64
+
+
+def send_order(market, order):
+    """
+    조건 발동 시 주문 전송 (기본값)
+
+    Args:
+        market (str): 마켓 ID
+        order (dict): {'side', 'ord_type': 'price' / 'market' / 'limit', 'price', 'volume'}
+
+    Returns:
+        dict: API 응답 결과
+    """
+    if order['ord_type'] == 'limit':
+        return limit_order(market, order['side'], order['volume'], order['price'])
+    return market_order(market, order['side'], order['ord_type'],
+                        price=order.get('price'), volume=order.get('volume'))
+
+
+def dry_run_order(market, order):
+    """주문을 보내지 않고 보낼 내용만 돌려줌 (재생 / 테스트용)"""
+    return dict(order, market=market, dry_run=True)
+
+
+def sell_order(volume, limit_price=None):
+    """매도 주문 내용 (limit_price 가 없으면 시장가)"""
+    if limit_price is None:
+        return {'side': 'ask', 'ord_type': 'market', 'volume': volume}
+    return {'side': 'ask', 'ord_type': 'limit', 'volume': volume, 'price': limit_price}
+
+
+def buy_order(amount=None, volume=None, limit_price=None):
+    """매수 주문 내용 (limit_price 가 없으면 amount 원어치 시장가, 있으면 volume 지정가)"""
+    if limit_price is None:
+        return {'side': 'bid', 'ord_type': 'price', 'price': amount}
+    return {'side': 'bid', 'ord_type': 'limit', 'volume': volume, 'price': limit_price}
+
+
+def _validate_order(order):
+    ord_type = order.get('ord_type')
+    if order.get('side') not in ('bid', 'ask'):
+        raise ValueError(f"잘못된 주문 방향: {order.get('side')}")
+    required = {'price': ('price',), 'market': ('volume',), 'limit': ('volume', 'price')}.get(ord_type)
+    if required is None:
+        raise ValueError(f"잘못된 ord_type: {ord_type}")
+    missing = [key for key in required if order.get(key) in (None, '')]
+    if missing:
+        raise ValueError(f"{ord_type} 주문에 {', '.join(missing)} 가 필요합니다.")
+
+
+class _Book:
+    """마켓 하나의 조건 힙"""
+
+    __slots__ = ('above', 'below', 'dead')
+
+    def __init__(self):
+        self.above = []   # (기준, 순번, id) - 최소 힙
+        self.below = []   # (-기준, 순번, id) - 최대 힙
+        self.dead = 0     # 힙에 남아 있는 취소된 항목 수
+
+    def __len__(self):
+        return len(self.above) + len(self.below) - self.dead
+
+
+class TriggerEngine:
+    """
+    마켓별 가격 조건 → 주문
+
+    한 번 발동한 조건은 사라지고 (one-shot), 같은 group 의 나머지 조건은 함께 취소됨 (OCO)
+
+    사용 예:
+        engine = TriggerEngine()
+        engine.add_listener(lambda event: print(event['type'], event['trigger']['id']))
+        engine.oco('KRW-XRP', stop_price=600, take_price=800, volume=100)
+        engine.start_polling(1.0)      # 또는 engine.start_stream()
+    """
+
+    def __init__(self, send=send_order, background=True, max_workers=4, max_finished=1000):
+        """
+        Args:
+            send (callable): (market, order) → API 응답 (기본값 send_order, 재생할 때는 dry_run_order)
+            background (bool): True면 주문을 워커 스레드에서 보냄 (시세 처리가 주문 응답을 기다리지 않음)
+                               False면 on_price 안에서 바로 보냄 (재생 결과를 순서대로 확인할 때)
+            max_workers (int): 주문 전송 워커 수
+            max_finished (int): 보관할 발동 / 취소된 조건 수 (오래된 것부터 삭제)
+        """
+        self.send = send
+        self.background = background
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self.ticks = 0
+
+        self._books = {}
+        self._active = {}     # id → 조건
+        self._groups = {}     # group → {id, ...}
+        self._finished = deque(maxlen=max_finished)
+        self._last_price = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._executor = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._stream = None
+
+    # ==================== 조건 등록 / 취소 ====================
+
+    def add(self, market, condition, price, order, group=None, tag=None):
+        """
+        조건 등록
+
+        Args:
+            market (str): 마켓 ID (예: 'KRW-BTC')
+            condition (str): ABOVE (가격 >= price) / BELOW (가격 <= price)
+            price (float): 기준 가격
+            order (dict): 발동 시 보낼 주문 (sell_order / buy_order 참고)
+            group (hashable, optional): OCO 묶음 - 하나가 발동하면 나머지는 취소
+            tag (any, optional): 호출한 쪽에서 쓰는 표시 (이벤트에 그대로 전달)
+
+        Returns:
+            int: 조건 id
+
+        Raises:
+            ValueError: 조건 / 가격 / 주문 내용이 올바르지 않을 때
+        """
+        trigger = self._new_trigger(market, condition, price, order, group, tag)
+        with self._lock:
+            self._add_locked(trigger)
+            stream = self._stream
+        if stream is not None:
+            stream.subscribe([market])
+        return trigger['id']
+
+    def _new_trigger(self, market, condition, price, order, group=None, tag=None):
+        if condition not in CONDITIONS:
+            raise ValueError(f"잘못된 조건: {condition} ({ABOVE} / {BELOW})")
+        level = float(price)
+        if not level > 0:
+            raise ValueError(f"기준 가격은 0보다 커야 합니다: {price}")
+        _validate_order(order)
+        return {
+            'id': next(self._ids), 'market': market, 'condition': condition, 'price': level,
+            'order': dict(order), 'group': group, 'tag': tag, 'status': ACTIVE,
+            'created': time.time(),
+        }
+
+    def _add_locked(self, trigger):
+        book = self._books.get(trigger['market'])
+        if book is None:
+            book = self._books[trigger['market']] = _Book()
+        if trigger['condition'] == ABOVE:
+            heapq.heappush(book.above, (trigger['price'], next(self._seq), trigger['id']))
+        else:
+            heapq.heappush(book.below, (-trigger['price'], next(self._seq), trigger['id']))
+        self._active[trigger['id']] = trigger
+        if trigger['group'] is not None:
+            self._groups.setdefault(trigger['group'], set()).add(trigger['id'])
+
+    def stop_loss(self, market, price, volume, limit_price=None):
+        """가격이 price 이하로 내려오면 volume 매도"""
+        return self.add(market, BELOW, price, sell_order(volume, limit_price))
+
+    def take_profit(self, market, price, volume, limit_price=None):
+        """가격이 price 이상으로 올라가면 volume 매도"""
+        return self.add(market, ABOVE, price, sell_order(volume, limit_price))
+
+    def oco(self, market, stop_price, take_price, volume, stop_limit=None, take_limit=None):
+        """
+        손절 + 익절 한 쌍 (먼저 닿은 쪽만 주문하고 다른 쪽은 취소)
+
+        Returns:
+            tuple: (손절 id, 익절 id)
+        """
+        if not stop_price < take_price:
+            raise ValueError("손절 가격은 익절 가격보다 낮아야 합니다.")
+        group = ('oco', next(self._seq))
+        stop = self._new_trigger(market, BELOW, stop_price, sell_order(volume, stop_limit), group)
+        take = self._new_trigger(market, ABOVE, take_price, sell_order(volume, take_limit), group)
+        # 한 쪽만 등록된 상태로 시세가 처리되지 않도록 같이 등록
+        with self._lock:
+            self._add_locked(stop)
+            self._add_locked(take)
+            stream = self._stream
+        if stream is not None:
+            stream.subscribe([market])
+        return stop['id'], take['id']
+
+    def cancel(self, trigger_id):
+        """
+        조건 취소 (OCO 묶음이면 같은 묶음도 함께 취소)
+
+        Returns:
+            bool: 취소 여부 (이미 발동했거나 없으면 False)
+        """
+        with self._lock:
+            trigger = self._active.get(trigger_id)
+            if trigger is None:
+                return False
+            group = trigger['group']
+            others = list(self._groups.get(group, ())) if group is not None else []
+            events = self._cancel_locked(trigger_id)
+            for other in others:
+                events += self._cancel_locked(other)
+        self._emit(events)
+        return True
+
+    def cancel_market(self, market):
+        """
+        마켓의 조건 전체 취소
+
+        Returns:
+            int: 취소한 조건 수
+        """
+        with self._lock:
+            ids = [i for i, t in self._active.items() if t['market'] == market]
+            events = []
+            for trigger_id in ids:
+                events += self._cancel_locked(trigger_id)
+        self._emit(events)
+        return len(ids)
+
+    def _cancel_locked(self, trigger_id):
+        trigger = self._active.pop(trigger_id, None)
+        if trigger is None:
+            return []
+        trigger['status'] = CANCELLED
+        self._finished.append(trigger)
+        members = self._groups.get(trigger['group']) if trigger['group'] is not None else None
+        if members is not None:
+            members.discard(trigger_id)
+            if not members:
+                del self._groups[trigger['group']]
+        book = self._books[trigger['market']]
+        book.dead += 1
+        self._compact_locked(trigger['market'], book)
+        return [{'type': 'cancel', 'trigger': dict(trigger), 'price': None, 'result': None}]
+
+    def _compact_locked(self, market, book):
+        if book.dead < COMPACT_MIN or book.dead * 2 < len(book.above) + len(book.below):
+            return
+        if not len(book):
+            del self._books[market]
+            return
+        book.above = [entry for entry in book.above if entry[2] in self._active]
+        book.below = [entry for entry in book.below if entry[2] in self._active]
+        heapq.heapify(book.above)
+        heapq.heapify(book.below)
+        book.dead = 0
+
+    # ==================== 조회 ====================
+
+    def get(self, trigger_id):
+        """조건 정보 (등록 중이거나 최근에 끝난 것, 없으면 None)"""
+        with self._lock:
+            trigger = self._active.get(trigger_id)
+            if trigger is None:
+                trigger = next((t for t in self._finished if t['id'] == trigger_id), None)
+            return dict(trigger) if trigger else None
+
+    def triggers(self, market=None):
+        """등록 중인 조건 목록"""
+        with self._lock:
+            return [dict(t) for t in self._active.values() if market is None or t['market'] == market]
+
+    def finished(self):
+        """최근에 발동 / 취소된 조건 (오래된 순)"""
+        with self._lock:
+            return [dict(t) for t in self._finished]
+
+    def markets(self):
+        """조건이 남아 있는 마켓"""
+        with self._lock:
+            return [market for market, book in self._books.items() if len(book)]
+
+    def last_price(self, market):
+        """마지막으로 받은 가격 (없으면 None)"""
+        return self._last_price.get(market)
+
+    def __len__(self):
+        return len(self._active)
+
+    # ==================== 시세 처리 ====================
+
+    def on_price(self, market, price, ts=None):
+        """
+        시세 하나 처리 - 조건에 닿은 주문을 보냄
+
+        Args:
+            market (str): 마켓 ID
+            price (float): 체결 가격
+            ts (float, optional): 시세 시각 (이벤트에 그대로 전달)
+
+        Returns:
+            list: 이번에 발동한 조건
+        """
+        price = float(price)
+        self._last_price[market] = price
+        if market not in self._books:
+            return []
+
+        fired = []
+        events = []
+        with self._lock:
+            self.ticks += 1
+            book = self._books.get(market)
+            if book is None:
+                return []
+            # OCO 취소로 힙이 다시 만들어질 수 있으므로 매번 book 에서 읽음
+            while book.above and book.above[0][0] <= price:
+                self._fire_locked(heapq.heappop(book.above)[2], book, price, ts, fired, events)
+            while book.below and -book.below[0][0] >= price:
+                self._fire_locked(heapq.heappop(book.below)[2], book, price, ts, fired, events)
+            if fired and not len(book) and self._books.get(market) is book:
+                del self._books[market]
+
+        if events:
+            self._emit(events)
+        for trigger in fired:
+            self._dispatch(trigger)
+        return fired
+
+    def _fire_locked(self, trigger_id, book, price, ts, fired, events):
+        trigger = self._active.pop(trigger_id, None)
+        if trigger is None:
+            book.dead -= 1  # 취소된 항목
+            return
+        trigger['status'] = FIRED
+        trigger['fired_price'] = price
+        trigger['fired_ts'] = ts
+        trigger['fired_at'] = time.time()
+        self._finished.append(trigger)
+        fired.append(trigger)
+        events.append({'type': 'fire', 'trigger': dict(trigger), 'price': price, 'result': None})
+
+        group = trigger['group']
+        if group is not None:
+            for other in self._groups.pop(group, ()):
+                if other != trigger_id:
+                    events += self._cancel_locked(other)
+
+    def on_message(self, message):
+        """
+        WebSocket ticker / trade 메시지 처리 (MarketStream on_message 로 연결)
+        """
+        price = message.get('trade_price')
+        market = message.get('market') or message.get('code')
+        if price is not None and market:
+            self.on_price(market, price, message.get('trade_timestamp') or message.get('timestamp'))
+
+    def poll(self):
+        """
+        조건이 있는 마켓 현재가를 한 번에 조회해서 처리 (REST)
+
+        Returns:
+            int: 조회한 마켓 수
+        """
+        markets = self.markets()
+        if not markets:
+            return 0
+        tickers = get_current_prices(markets)
+        for market, ticker in tickers.items():
+            if ticker.get('trade_price') is not None:
+                self.on_price(market, ticker['trade_price'], ticker.get('timestamp'))
+        return len(tickers)
+
+    # ==================== 주문 전송 ====================
+
+    def _dispatch(self, trigger):
+        if not self.background:
+            self._send(trigger)
+            return
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='trigger-order')
+        self._executor.submit(self._send, trigger)
+
+    def _send(self, trigger):
+        try:
+            result = self.send(trigger['market'], trigger['order'])
+        except Exception as e:
+            result = {'error': str(e)}
+        with self._lock:
+            trigger['result'] = result
+        failed = not isinstance(result, dict) or 'error' in result
+        self._emit([{'type': 'error' if failed else 'order', 'trigger': dict(trigger),
+                     'price': trigger['fired_price'], 'result': result}])
+
+    # ==================== 이벤트 ====================
+
+    def add_listener(self, listener):
+        """
+        이벤트 수신 함수 등록 - listener(event) 는 시세를 처리한 스레드 또는 주문 워커에서 호출됨
+
+        event: {'type': 'fire' / 'order' / 'error' / 'cancel', 'trigger', 'price', 'result' (주문 API 응답)}
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, events):
+        for event in events:
+            for listener in list(self._listeners):
+                try:
+                    listener(event)
+                except Exception:
+                    pass
+
+    # ==================== 시세 공급 ====================
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start_polling(self, interval=1.0):
+        """REST 폴링 스레드 시작 (WebSocket 캐시가 신선하면 get_current_prices 가 그 값을 씀)"""
+        if not self.is_running():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,),
+                                            name='trigger-poll', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll()
+            except Exception:
+                pass
+            self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def start_stream(self, stream=None, **kwargs):
+        """
+        WebSocket 체결 스트림으로 시세 받기 (조건을 추가하면 그 마켓도 구독)
+
+        Args:
+            stream (MarketStream, optional): 직접 만든 스트림 (on_message 는 이 엔진으로 바뀜)
+            **kwargs: 새로 만들 때 MarketStream 인자 (url 등)
+        """
+        from market_stream import MarketStream
+
+        if stream is None:
+            kwargs.setdefault('channels', ('trade',))
+            stream = MarketStream(self.markets(), on_message=self.on_message, **kwargs)
+        else:
+            stream.on_message = self.on_message
+            stream.subscribe(self.markets())
+        with self._lock:
+            self._stream = stream
+        stream.start()
+        return stream
+
+    def stop(self, timeout=1.0):
+        """폴링 / 스트림 중지 후 보내는 중인 주문을 기다림"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# ==================== 재생 ====================
+
+def replay(engine, ticks):
+    """
+    녹화된 시세를 순서대로 넣어봄
+
+    Args:
+        engine (TriggerEngine): 대상 엔진 (보통 send=dry_run_order, background=False)
+        ticks (iterable): (market, price) / (market, price, ts) 또는 WebSocket 메시지 dict
+
+    Returns:
+        list: 발동한 조건 (발동 순서)
+    """
+    fired = []
+    for tick in ticks:
+        if isinstance(tick, dict):
+            price = tick.get('trade_price')
+            market = tick.get('market') or tick.get('code')
+            if price is None or not market:
+                continue
+            fired += engine.on_price(market, price, tick.get('trade_timestamp') or tick.get('timestamp'))
+        else:
+            fired += engine.on_price(*tick)
+    return fired
+
+
+def load_ticks(path):
+    """녹화 파일 (JSONL, 한 줄에 WebSocket 메시지 하나) 에서 시세 메시지만 읽기"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                message = json.loads(line)
+                if message.get('trade_price') is not None:
+                    yield message
+
+
+def candle_ticks(candles, market):
+    """
+    저장한 캔들 → 시세 순서 (시가 → 저가/고가 → 종가)
+    양봉은 저가를 먼저, 음봉은 고가를 먼저 지난 것으로 봄
+
+    Args:
+        candles (dict): CandleStore.read 결과 (ts / open / high / low / close 컬럼)
+        market (str): 마켓 ID
+
+    Yields:
+        tuple: (market, price, ts)
+    """
+    for ts, o, h, l, c in zip(candles['ts'].tolist(), candles['open'].tolist(), candles['high'].tolist(),
+                              candles['low'].tolist(), candles['close'].tolist()):
+        first, second = (l, h) if c >= o else (h, l)
+        yield market, o, ts
+        yield market, first, ts
+        yield market, second, ts
+        yield market, c, ts
+
+
+_default_engine = None
+_default_lock = threading.Lock()
+
+
+def get_engine():
+    """기본 TriggerEngine (지연 생성, 시세 공급은 start_polling / start_stream 호출 시 시작)"""
+    global _default_engine
+    if _default_engine is None:
+        with _default_lock:
+            if _default_engine is None:
+                _default_engine = TriggerEngine()
+    return _default_engine
@@ -0,0 +1,298 @@
+"""
+자동 왕복 거래 (쌀먹 이벤트 거래대금 채우기)
+시장가 매수 → 체결 확인 → 매수한 수량 전량 시장가 매도 를 목표 거래대금 / 손실 한도까지 반복
+
+요청 속도는 client.py 의 공용 RateLimiter 가 맞춰주므로 사이클 사이에 별도 대기 없이 바로 다음 주문을 보냄
+"""
+import threading
+import time
+
+from balance_store import get_balance_store
+from journal import get_journal
+from service import MIN_ORDER_AMOUNT, get_current_price, get_order, market_order, _cached_tickers
+
+# 체결이 끝난 주문 상태 (시장가 매수는 남은 금액이 취소되어 'cancel' 로 끝날 수 있음)
+FINISHED_STATES = ('done', 'cancel')
+
+
+class OrderFailed(Exception):
+    """주문 실패 / 체결 확인 실패 (order: 마지막으로 조회한 주문 정보, 없으면 None)"""
+
+    def __init__(self, message, order=None):
+        super().__init__(message)
+        self.order = order
+
+
+def order_fill(order):
+    """
+    주문 조회 결과에서 체결 내역 요약
+
+    Args:
+        order (dict): service.get_order 응답
+
+    Returns:
+        dict: {'volume', 'funds', 'fee', 'avg_price'} - volume 은 API 문자열 그대로 (전량 매도에 사용)
+
+    Raises:
+        OrderFailed: 체결 내역이 없어 체결 금액을 알 수 없을 때
+    """
+    trades = order.get('trades') or []
+    volume = order.get('executed_volume') or '0'
+    executed = float(volume)
+    ord_type = order.get('ord_type')
+    if trades:
+        funds = sum(float(t['funds']) for t in trades)
+    elif not executed:
+        funds = 0.0
+    elif ord_type == 'limit' and order.get('price'):
+        funds = executed * float(order['price'])
+    elif ord_type == 'price' and order.get('state') == 'done' and order.get('price'):
+        # 시장가 매수의 price 는 1개당 가격이 아니라 주문 금액 (전량 체결이면 그대로 체결 금액)
+        funds = float(order['price'])
+    else:
+        # 시장가 매도 / 일부만 체결된 시장가 매수는 체결 내역 없이 금액을 알 수 없음
+        raise OrderFailed(f"체결 내역이 없어 체결 금액을 계산할 수 없습니다: {order.get('uuid')}", order=order)
+    return {
+        'volume': volume,
+        'funds': funds,
+        'fee': float(order.get('paid_fee') or 0),
+        'avg_price': funds / executed if executed else 0.0,
+    }
+
+
+def wait_for_fill(uuid, timeout=10.0, poll_interval=0.05, max_poll_interval=0.5):
+    """
+    주문이 체결될 때까지 대기
+
+    첫 조회는 바로 보내고 (시장가 주문은 대부분 즉시 체결됨), 이후 간격을 두 배씩 늘림
+
+    Args:
+        uuid (str): 주문 UUID
+        timeout (float): 최대 대기 시간 (초)
+        poll_interval (float): 두 번째 조회까지의 간격 (초)
+        max_poll_interval (float): 최대 조회 간격 (초)
+
+    Returns:
+        dict: 체결이 끝난 주문 정보
+
+    Raises:
+        OrderFailed: 조회 오류 / 체결 없이 취소 / 시간 초과 (시간 초과 시 e.order 에 마지막 조회 결과)
+    """
+    deadline = time.monotonic() + timeout
+    interval = poll_interval
+
+    while True:
+        order = get_order(uuid)
+        if 'error' in order:
+            raise OrderFailed(f"주문 조회 실패: {order['error']}")
+        if order.get('state') in FINISHED_STATES:
+            if float(order.get('executed_volume') or 0) <= 0:
+                raise OrderFailed(f"체결 없이 종료된 주문: {uuid}")
+            return order
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise OrderFailed(f"체결 대기 시간 초과: {uuid}", order=order)
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_poll_interval)
+
+
+class VolumeEngine:
+    """
+    시장가 왕복 거래 반복 실행기
+
+    사용 예:
+        engine = VolumeEngine('KRW-XRP', target_volume=10_000_000, cycle_amount=100_000, max_loss=20_000)
+        report = engine.run()
+    """
+
+    def __init__(self, market, target_volume, cycle_amount, max_loss=None, max_cycles=None,
+                 fill_timeout=10.0, on_cycle=None):
+        """
+        Args:
+            market (str): 마켓 ID (예: 'KRW-XRP')
+            target_volume (float): 목표 거래대금 (매수 + 매도 체결 금액 합계, KRW)
+            cycle_amount (float): 사이클당 매수 금액 (KRW)
+            max_loss (float, optional): 손실 한도 (수수료 포함 누적 손실이 이 값 이상이면 중지)
+            max_cycles (int, optional): 최대 사이클 수
+            fill_timeout (float): 주문별 체결 대기 시간 (초)
+            on_cycle (callable, optional): 사이클마다 호출 - on_cycle(cycle_dict, report_dict)
+        """
+        if cycle_amount < MIN_ORDER_AMOUNT:
+            raise ValueError(f"사이클 금액은 최소 {MIN_ORDER_AMOUNT:,}원 이상이어야 합니다.")
+
+        self.market = market
+        self.target_volume = target_volume
+        self.cycle_amount = cycle_amount
+        self.max_loss = max_loss
+        self.max_cycles = max_cycles
+        self.fill_timeout = fill_timeout
+        self.on_cycle = on_cycle
+        self._stop = threading.Event()
+
+        self.cycles = 0
+        self.volume = 0.0
+        self.fees = 0.0
+        self.pnl = 0.0
+        self.slippage = 0.0
+        self.started_at = None
+        self.finished_at = None
+        self.stop_reason = None
+        self.holding = None  # 매도하지 못한 수량 (오류로 중단된 경우)
+        self._last_price = None  # 직전 사이클 매도 평균가 (슬리피지 기준가)
+
+    def stop(self):
+        """현재 사이클을 마친 뒤 중지 (다른 스레드에서 호출 가능)"""
+        self._stop.set()
+
+    def _next_stop_reason(self):
+        if self._stop.is_set():
+            return 'stopped'
+        if self.volume >= self.target_volume:
+            return 'target'
+        if self.max_loss is not None and -self.pnl >= self.max_loss:
+            return 'loss_limit'
+        if self.max_cycles is not None and self.cycles >= self.max_cycles:
+            return 'max_cycles'
+        return None
+
+    def run(self):
+        """
+        중지 조건까지 사이클 반복
+
+        Returns:
+            dict: 최종 결과 (report() 와 동일)
+        """
+        self.started_at = time.monotonic()
+        self._last_price = None
+        self._stop.clear()
+        try:
+            while True:
+                self.stop_reason = self._next_stop_reason()
+                if self.stop_reason:
+                    break
+                try:
+                    cycle = self.run_cycle()
+                except OrderFailed as e:
+                    self.stop_reason = f'error: {e}'
+                    break
+                if self.on_cycle:
+                    self.on_cycle(cycle, self.report())
+        finally:
+            self.finished_at = time.monotonic()
+        return self.report()
+
+    def run_cycle(self):
+        """
+        매수 1회 + 전량 매도 1회
+
+        Returns:
+            dict: 이번 사이클 결과
+
+        Raises:
+            OrderFailed: 주문 / 체결 확인 실패 (매수 후 매도 실패 시 self.holding 에 수량 기록)
+        """
+        reference = self._reference_price()
+
+        balances = get_balance_store()
+        buy = self._execute(market_order(self.market, 'bid', 'price', price=self.cycle_amount))
+        balances.apply_fill(self.market, 'bid', buy['volume'], buy['funds'], buy['fee'])
+        self.holding = buy['volume']
+
+        sell = self._execute(market_order(self.market, 'ask', 'market', volume=buy['volume']))
+        balances.apply_fill(self.market, 'ask', sell['volume'], sell['funds'], sell['fee'])
+        self.holding = None
+        self._last_price = sell['avg_price'] or self._last_price
+
+        sold = float(sell['volume'])
+        reference = reference or buy['avg_price']
+        cost = buy['funds'] + buy['fee']
+        proceeds = sell['funds'] - sell['fee']
+        slippage = ((buy['avg_price'] - reference) * float(buy['volume'])
+                    + (reference - sell['avg_price']) * sold)
+
+        self.cycles += 1
+        self.volume += buy['funds'] + sell['funds']
+        self.fees += buy['fee'] + sell['fee']
+        self.pnl += proceeds - cost
+        self.slippage += slippage
+
+        return {
+            'cycle': self.cycles,
+            'reference_price': reference,
+            'buy_price': buy['avg_price'],
+            'sell_price': sell['avg_price'],
+            'volume': buy['funds'] + sell['funds'],
+            'fee': buy['fee'] + sell['fee'],
+            'pnl': proceeds - cost,
+            'slippage': slippage,
+        }
+
+    def _reference_price(self):
+        """
+        슬리피지 기준가
+        WebSocket 시세 캐시에 최신 값이 있으면 사용하고, 없으면 실행당 한 번만 현재가를 조회한 뒤
+        이후 사이클은 직전 매도 평균가를 사용 (사이클마다 시세 요청을 보내지 않음)
+        """
+        tickers, _ = _cached_tickers([self.market])
+        if self.market in tickers:
+            return tickers[self.market]['trade_price']
+        if self._last_price is None:
+            self._last_price = get_current_price(self.market)
+        return self._last_price
+
+    def _execute(self, result):
+        if 'error' in result or 'uuid' not in result:
+            raise OrderFailed(f"주문 실패: {result.get('error', result)}")
+        try:
+            order = wait_for_fill(result['uuid'], timeout=self.fill_timeout)
+            fill = order_fill(order)
+        except OrderFailed as e:
+            order = e.order or {}
+            if order.get('side') == 'bid' and float(order.get('executed_volume') or 0) > 0:
+                self.holding = order.get('executed_volume')  # 체결은 됐으므로 보유 수량은 남김
+            raise
+        journal = get_journal()
+        if journal.enabled:
+            journal.record_fill(order['uuid'], self.market, order['side'], fill['volume'], fill['funds'], fill['fee'])
+        return fill
+
+    def report(self):
+        """
+        누적 결과
+
+        Returns:
+            dict: {'cycles', 'volume', 'fees', 'pnl', 'slippage', 'progress', 'elapsed',
+                   'cycles_per_minute', 'stop_reason', 'holding'}
+        """
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        elapsed = end - self.started_at if self.started_at is not None else 0.0
+        return {
+            'market': self.market,
+            'cycles': self.cycles,
+            'volume': self.volume,
+            'fees': self.fees,
+            'pnl': self.pnl,
+            'slippage': self.slippage,
+            'progress': min(self.volume / self.target_volume, 1.0) if self.target_volume else 1.0,
+            'elapsed': elapsed,
+            'cycles_per_minute': self.cycles / elapsed * 60 if elapsed else 0.0,
+            'stop_reason': self.stop_reason,
+            'holding': self.holding,
+        }
+
+
+def format_report(report):
+    """결과 요약 문자열 (CLI 출력용)"""
+    lines = [
+        f"사이클: {report['cycles']}회 ({report['cycles_per_minute']:.1f}회/분, {report['elapsed']:.1f}초)",
+        f"거래대금: {report['volume']:,.0f}원 ({report['progress'] * 100:.1f}%)",
+        f"수수료: {report['fees']:,.0f}원",
+        f"슬리피지: {report['slippage']:,.0f}원",
+        f"손익: {report['pnl']:+,.0f}원",
+    ]
+    if report['stop_reason']:
+        lines.append(f"종료 사유: {report['stop_reason']}")
+    if report['holding']:
+        lines.append(f"⚠️ 매도하지 못한 수량: {report['holding']} ({report['market']})")
+    return '\n'.join(lines)